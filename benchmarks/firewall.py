@@ -0,0 +1,40 @@
+"""Latency of FlagFirewall checks with thousands of live flags.
+
+Run with `python -m benchmarks.firewall`.
+"""
+from time import perf_counter
+from uuid import uuid4
+
+from benchmarks.flag_scanner import traffic
+from src.firewall import FlagFirewall
+from src.game import Gameserver
+from src.scanner import FlagScanner
+
+
+def main(flags: int = 5000, window: int = 5, count: int = 5000):
+    resps = traffic(count, flag_ratio = 0.05)
+    firewalls = {"format + set": FlagFirewall(FlagScanner(Gameserver.flag_regex), mode = "alert", window = window),
+                 "aho-corasick": FlagFirewall(FlagScanner(r"(?!)x"), mode = "alert", window = window)} # no flag matches the format
+    for tick in range(window):
+        batch = [f"flag{{{uuid4().hex}}}" for _ in range(flags // window)]
+        for firewall in firewalls.values():
+            firewall.rotate()
+            for flag in batch: firewall.add(flag)
+    leaking = [resp + batch[n % len(batch)] if n % 20 == 0 else resp for n, resp in enumerate(resps)]
+
+    print(f"{flags} live flags, {count} responses of ~{sum(map(len, resps)) // count} chars, 5% leaking")
+    for name, firewall in firewalls.items():
+        firewall.leaks("") # builds the automaton
+        start = perf_counter()
+        leaked = sum(bool(firewall.leaks(resp)) for resp in leaking)
+        elapsed = perf_counter() - start
+        start = perf_counter()
+        firewall.rotate()
+        for flag in batch: firewall.add(flag)
+        firewall.leaks("")
+        rotation = perf_counter() - start
+        print(f"{name:<14} {elapsed / count * 1e6:8.2f} us/response  {leaked} leaks found  rotation {rotation * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
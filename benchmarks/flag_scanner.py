@@ -0,0 +1,51 @@
+"""Compares FlagScanner against the plain re.findall path ShieldMAN used before.
+
+Run with `python -m benchmarks.flag_scanner`.
+"""
+from random import choice, random, seed
+from re import findall
+from timeit import timeit
+from uuid import uuid4
+
+from src.game import Gameserver
+from src.scanner import FlagScanner
+
+FORMATS = [Gameserver.flag_regex, r"FAUST_[A-Za-z0-9]{32}", r"ENO[A-Za-z0-9+/=]{48}"]
+FILLER = "Your login cookie is: ", "Successfully posted ", "Hello on this server!", "User is not registered!"
+
+
+def traffic(count: int, flag_ratio: float = 0.05, size: int = 200) -> list[str]:
+    seed(1)
+    resps = []
+    for _ in range(count):
+        body = "".join(choice(FILLER) + uuid4().hex for _ in range(size // 50))
+        if random() < flag_ratio: body += f"flag{{{uuid4().hex}}}"
+        resps.append(body)
+    return resps
+
+
+def main(count: int = 5000, repeat: int = 20):
+    resps = traffic(count)
+    big = "".join(resps)
+    scanner = FlagScanner(*FORMATS)
+    single = FlagScanner(FORMATS[0])
+    pattern = "|".join(f"(?:{p})" for p in FORMATS)
+
+    assert sum(map(len, scanner.scan_many(resps))) == len(findall(pattern, big))
+    assert list(scanner.scan_stream(big[i:i+1000] for i in range(0, len(big), 1000))) == findall(pattern, big)
+
+    results = {
+        "findall, 1 format": timeit(lambda: [findall(FORMATS[0], r) for r in resps], number=repeat),
+        "scan, 1 format": timeit(lambda: [single.scan(r) for r in resps], number=repeat),
+        "scan_many, 1 format": timeit(lambda: single.scan_many(resps), number=repeat),
+        f"findall, {len(FORMATS)} formats": timeit(lambda: [findall(p, r) for r in resps for p in FORMATS], number=repeat),
+        f"scan_many, {len(FORMATS)} formats": timeit(lambda: scanner.scan_many(resps), number=repeat),
+        f"scan_stream, {len(FORMATS)} formats, 64k chunks": timeit(lambda: list(scanner.scan_stream(big[i:i+65536] for i in range(0, len(big), 65536))), number=repeat),
+    }
+    print(f"{count} responses, {repeat} rounds")
+    for name, seconds in results.items():
+        print(f"{name:<45} {seconds / repeat * 1e3:8.2f} ms/round  {count * repeat / seconds:12.0f} resp/s")
+
+
+if __name__ == "__main__":
+    main()
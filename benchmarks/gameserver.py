@@ -0,0 +1,148 @@
+"""Flag storage and validation of the Gameserver with many teams and ticks.
+
+The former storage, a dict of (username, flag) strings per tick, is rebuilt from the store to
+compare memory and lookups.
+
+Run with `python -m benchmarks.gameserver`.
+"""
+from os import urandom
+from random import Random
+from sys import getsizeof
+from time import perf_counter, sleep
+from uuid import uuid4
+
+from src.flags import FLAG_SIZE
+from src.game import Gameserver
+from src.man import MAN, Team
+from src.server import Server
+
+Legacy = list[dict[tuple[str, str], tuple[str, str]]]
+
+
+def legacy_flags(game: Gameserver) -> Legacy:
+    names = game.store.names
+    return [{(atk, dev): (tick.username(a * tick.teams + d), game.store.flag(atk, dev, n))
+             for a, atk in enumerate(names) for d, dev in enumerate(names)} for n, tick in enumerate(game.store)]
+
+
+def legacy_memory(flags: Legacy) -> int:
+    return sum(getsizeof(tick) + sum(getsizeof(value) + getsizeof(value[0]) + getsizeof(value[1]) for value in tick.values())
+               + sum(getsizeof(key) for key in tick) for tick in flags) # names in the keys are shared
+
+
+def legacy_check_flag(flags: Legacy, attacker: Team, defender: Team, flag: str) -> bool:
+    return flag in [d[(attacker.name, defender.name)][1] for d in flags]
+
+
+def legacy_usernames(flags: Legacy, attacker: Team, defender: Team) -> list[str]:
+    return [d[(attacker.name, defender.name)][0] for d in flags]
+
+
+def game(teams: int, ticks: int, window: int) -> Gameserver:
+    game = Gameserver(flag_window = window)
+    for n in range(teams):
+        game.add_team(Team(f"team{n}", server := Server(), MAN(server)))
+    for _ in range(ticks):
+        game.generate_flags()
+    return game
+
+
+def submissions(game: Gameserver, count: int, valid: float = 0.5, seed: int = 0) -> list[tuple[Team, Team, str]]:
+    rng, teams = Random(seed), list(game.teams.values())
+    subs = []
+    for _ in range(count):
+        attacker, defender = rng.sample(teams, 2)
+        flag = game.flag(attacker, defender, rng.randrange(len(game.store))) if rng.random() < valid else f"flag{{{rng.getrandbits(128):032x}}}"
+        subs.append((attacker, defender, flag))
+    return subs
+
+
+def timed(func, items) -> tuple[list, float]:
+    start = perf_counter()
+    results = [func(*item) for item in items]
+    return results, (perf_counter() - start) / len(items)
+
+
+class SlowMAN(MAN):
+    """Service that needs `delay` seconds to store a flag"""
+
+    def __init__(self, server: Server, delay: float):
+        super().__init__(server)
+        self.delay = delay
+
+    def place_flag(self, username: str, flag: str):
+        if self.delay: sleep(self.delay)
+        super().place_flag(username, flag)
+
+
+def legacy_generate_flags(game: Gameserver):
+    flags = {(atk, dev): (uuid4().hex, f"flag{{{uuid4().hex}}}") for atk in game.teams for dev in game.teams}
+    for team in game.teams.values():
+        team.manServer.new_tick()
+    for (_, dev), (username, flag) in flags.items():
+        game.teams[dev].manServer.place_flag(username, flag)
+
+
+def placement(teams: int = 40, ticks: int = 5, slow: float = 0.002, timeout: float = 1.0):
+    """Every 4th team needs `slow` seconds per flag, one team hangs"""
+    g = Gameserver(place_timeout = timeout)
+    for n in range(teams):
+        server = Server()
+        g.add_team(Team(f"team{n}", server, SlowMAN(server, 30.0 if n == 0 else slow if n % 4 == 1 else 0.0)))
+    hanging = g.teams.pop("team0") # the legacy loop would wait for it forever
+    start = perf_counter()
+    legacy_generate_flags(g)
+    legacy = perf_counter() - start
+    g.teams = {hanging.name: hanging, **g.teams}
+    durations, latencies, timeouts = [], [], 0
+    for _ in range(ticks):
+        start = perf_counter()
+        placements = g.generate_flags()
+        durations.append(perf_counter() - start)
+        latencies += [p.latency for p in placements.values() if not p.timed_out]
+        timeouts += sum(p.timed_out for p in placements.values())
+    latencies.sort()
+    print(f"placing {teams} teams, every 4th {slow * 1e3:.0f} ms per flag, one hanging")
+    print(f"legacy serial tick {legacy:.2f}s without the hanging team, concurrent tick {sum(durations) / ticks:.2f}s with it, "
+          f"team latency p50 {latencies[len(latencies) // 2] * 1e3:.1f} ms  max {latencies[-1] * 1e3:.1f} ms, {timeouts} timeouts")
+
+    start = perf_counter()
+    for _ in range(200): urandom(2 * FLAG_SIZE * teams * teams)
+    bulk = (perf_counter() - start) / 200
+    start = perf_counter()
+    for _ in range(200): [(uuid4().hex, uuid4().hex) for _ in range(teams * teams)]
+    g.close() # the hanging team does not keep the benchmark from exiting
+    print(f"randomness per tick: uuid4 {(perf_counter() - start) / 200 * 1e3:.2f} ms  bulk urandom {bulk * 1e3:.3f} ms")
+
+
+def main(teams: int = 40, ticks: int = 300, count: int = 2000, window: int = 5):
+    start = perf_counter()
+    g = game(teams, ticks, ticks) # all ticks stay valid, like the legacy storage
+    print(f"{teams} teams, {ticks} ticks, {ticks * teams * teams} flags generated in {perf_counter() - start:.2f}s")
+    legacy, subs = legacy_flags(g), submissions(g, count)
+    print(f"memory      legacy {legacy_memory(legacy) / 1e6:7.1f} MB  store {g.store.memory() / 1e6:6.1f} MB")
+
+    expected, legacy_time = timed(lambda *sub: legacy_check_flag(legacy, *sub), subs)
+    results, store_time = timed(g.check_flag, subs)
+    assert expected == results
+    print(f"check_flag  legacy {legacy_time * 1e6:7.2f} us  store {store_time * 1e6:6.2f} us  x{legacy_time / store_time:.0f}")
+    attacker = subs[0][0]
+    bulk = [flag for atk, _, flag in subs if atk is attacker] * (count // 10)
+    _, bulk_time = timed(lambda *flags: g.check_flags(attacker, flags), [bulk])
+    print(f"check_flags {bulk_time / len(bulk) * 1e6:6.2f} us per flag in a burst of {len(bulk)}")
+    pairs = [sub[:2] for sub in subs[:200]]
+    _, legacy_time = timed(lambda *pair: legacy_usernames(legacy, *pair), pairs)
+    _, store_time = timed(g.usernames, pairs)
+    print(f"usernames   legacy {legacy_time * 1e6:7.2f} us  store {store_time * 1e6:6.2f} us")
+    g.close()
+
+    g = game(teams, window, window)
+    start = perf_counter()
+    for _ in range(ticks - window): g.store.add_tick(urandom(16 * teams * teams), urandom(16 * teams * teams))
+    print(f"window of {window} ticks: {g.store.memory() / 1e6:.2f} MB, {(perf_counter() - start) / (ticks - window) * 1e3:.2f} ms to add a tick and expire one")
+    g.close()
+    placement(teams)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""MessageBoardImpl in a thread pool against the async AsyncMessageBoardImpl over gRPC.
+
+Each servicer runs in its own process. Clients log in and write to a few shared boards and stream
+back the latest ten messages of a board every ten writes, with many calls in flight at once.
+Afterwards the number of messages on every board is compared with the writes that succeeded.
+
+Build the protos first, run with `python -m benchmarks.message_board`.
+"""
+import asyncio
+from multiprocessing import Process
+import os
+import sys
+from time import perf_counter, sleep
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")) # imports of the message board are relative to src
+
+import grpc
+
+from message_board.MessageBoardClient import MessageBoardClient
+from message_board.MessageBoardImpl import AsyncMessageBoardImpl, MessageBoardImpl, serve
+
+SERVICERS = {"thread pool": (MessageBoardImpl, 50061), "async": (AsyncMessageBoardImpl, 50062)}
+
+
+def server(name: str):
+    servicer, port = SERVICERS[name]
+    asyncio.run(serve(servicer = servicer(), address = f"127.0.0.1:{port}"))
+
+
+async def client(channel, n: int, boards: list[str], writes: int, latencies: list[float]) -> int:
+    user, written = MessageBoardClient(channel), 0
+    await user.register(f"user{n}", "1234")
+    await user.login(f"user{n}", "1234")
+    for i in range(writes):
+        boardid = boards[(n + i) % len(boards)]
+        start = perf_counter()
+        await user.write(boardid, f"user{n} message {i}")
+        latencies.append(perf_counter() - start)
+        written += 1
+        if i % 10 == 9: # read the latest ten messages of the board
+            start = perf_counter()
+            count = await user.get_count(boardid)
+            async for _ in user.read(boardid, max(0, count - 10), 10): pass
+            latencies.append(perf_counter() - start)
+    return written
+
+
+async def load(port: int, clients: int, writes: int, boards: int) -> dict:
+    async with grpc.aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+        owner = MessageBoardClient(channel)
+        await owner.register("owner", "1234")
+        await owner.login("owner", "1234")
+        names = [f"board{n}" for n in range(boards)]
+        for boardid in names:
+            await owner.create(boardid, boardid)
+            for n in range(clients):
+                await owner.add_owner(boardid, f"user{n}") # only owners may write
+        latencies = []
+        start = perf_counter()
+        written = sum(await asyncio.gather(*(client(channel, n, names, writes, latencies) for n in range(clients))))
+        elapsed = perf_counter() - start
+        stored = sum([await owner.get_count(boardid) for boardid in names])
+    latencies.sort()
+    return {"calls": len(latencies) / elapsed, "p50": latencies[len(latencies) // 2], "p99": latencies[int(len(latencies) * 0.99)],
+            "written": written, "stored": stored}
+
+
+def main(clients: int = 200, writes: int = 50, boards: int = 4):
+    for name, (_, port) in SERVICERS.items():
+        process = Process(target = server, args = (name,), daemon = True)
+        process.start()
+        sleep(1.0)
+        try:
+            r = asyncio.run(load(port, clients, writes, boards))
+        finally:
+            process.terminate()
+            process.join()
+        print(f"{name:12} {r['calls']:8.0f} calls/s  p50 {r['p50'] * 1e3:6.2f} ms  p99 {r['p99'] * 1e3:6.2f} ms  "
+              f"{r['stored']} of {r['written']} writes stored")
+
+
+if __name__ == "__main__":
+    main()
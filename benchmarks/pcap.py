@@ -0,0 +1,122 @@
+"""Throughput of pcap ingestion in MB/s.
+
+Writes a synthetic dump of interleaved TCP flows, each a few request/response turns with a flag
+in some responses, some segments reordered and retransmitted. The dump is mined with an
+increasing number of workers, a pcapng copy checks that both formats give the same turns.
+
+Run with `python -m benchmarks.pcap`.
+"""
+from multiprocessing import Pool
+import os
+from random import Random
+from struct import Struct
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from uuid import uuid4
+
+from src.pcap import ACK, FIN, SYN, mine, turns
+
+ETHERNET = b"\x02\x00\x00\x00\x00\x01\x02\x00\x00\x00\x00\x02\x08\x00"
+IPV4 = Struct("!BBHHHBBH4s4s")
+TCP = Struct("!HHIIBBHHH")
+PCAP_HEADER = Struct("<IHHiIII")
+PCAP_RECORD = Struct("<IIII")
+
+
+def frame(src: bytes, dst: bytes, sport: int, dport: int, seq: int, ack: int, flags: int, payload: bytes = b"") -> bytes:
+    tcp = TCP.pack(sport, dport, seq & 0xFFFFFFFF, ack & 0xFFFFFFFF, 5 << 4, flags, 65535, 0, 0)
+    ip = IPV4.pack(0x45, 0, 20 + len(tcp) + len(payload), 0, 0x4000, 64, 6, 0, src, dst)
+    return ETHERNET + ip + tcp + payload
+
+
+def flow(rng: Random, n: int, turns: int, mss: int = 1200) -> tuple[list[bytes], list[tuple[bytes, bytes]]]:
+    """Frames of one connection and the turns they carry"""
+    client, server = bytes((10, 0, n >> 8 & 0xFF, n & 0xFF)), bytes((10, 1, 0, 1))
+    sport, dport = 20000 + n % 40000, 8080
+    cseq, sseq = rng.getrandbits(32), rng.getrandbits(32)
+    frames = [frame(client, server, sport, dport, cseq, 0, SYN), frame(server, client, dport, sport, sseq, cseq + 1, SYN | ACK),
+              frame(client, server, sport, dport, cseq + 1, sseq + 1, ACK)]
+    cseq, sseq, expected = cseq + 1, sseq + 1, []
+    for t in range(turns):
+        request = f"GET /read?user=user{n}&cookie={uuid4().hex} HTTP/1.1\r\nHost: target\r\n\r\n".encode()
+        body = f"Your message is: flag{{{uuid4().hex}}}" if t % 3 == 2 else "x" * rng.randrange(100, 4000)
+        response = f"HTTP/1.1 200 OK\r\nContent-Length: {len(body)}\r\n\r\n{body}".encode()
+        expected.append((request, response))
+        frames.append(frame(client, server, sport, dport, cseq, sseq, ACK, request))
+        cseq += len(request)
+        segments = [frame(server, client, dport, sport, sseq + i, cseq, ACK, response[i:i + mss]) for i in range(0, len(response), mss)]
+        if len(segments) > 1 and rng.random() < 0.2: segments[0], segments[1] = segments[1], segments[0] # reordered
+        if rng.random() < 0.1: segments.append(segments[-1]) # retransmitted
+        frames += segments
+        sseq += len(response)
+    frames += [frame(client, server, sport, dport, cseq, sseq, FIN | ACK), frame(server, client, dport, sport, sseq, cseq + 1, FIN | ACK)]
+    return frames, expected
+
+
+def traffic(flows: int, turns: int, concurrent: int = 64, seed: int = 0):
+    """Frames of all flows, concurrent flows interleaved frame by frame"""
+    rng = Random(seed)
+    expected, active, frames = [], [], []
+    for n in range(flows):
+        flow_frames, flow_turns = flow(rng, n, turns)
+        expected.append(flow_turns)
+        active.append(iter(flow_frames))
+        while len(active) >= concurrent or (n == flows - 1 and active):
+            it = rng.choice(active)
+            if (f := next(it, None)) is None: active.remove(it)
+            else: frames.append(f)
+    return frames, expected
+
+
+def write_pcap(path: str, frames: list[bytes]):
+    with open(path, "wb") as f:
+        f.write(PCAP_HEADER.pack(0xA1B2C3D4, 2, 4, 0, 0, 65535, 1))
+        for n, data in enumerate(frames):
+            f.write(PCAP_RECORD.pack(1700000000 + n // 1000, n % 1000 * 1000, len(data), len(data)))
+            f.write(data)
+
+
+def write_pcapng(path: str, frames: list[bytes]):
+    def block(kind: int, body: bytes) -> bytes:
+        body += b"\0" * (-len(body) % 4)
+        return Struct("<II").pack(kind, len(body) + 12) + body + Struct("<I").pack(len(body) + 12)
+    with open(path, "wb") as f:
+        f.write(block(0x0A0D0D0A, Struct("<IHHq").pack(0x1A2B3C4D, 1, 0, -1)))
+        f.write(block(1, Struct("<HHI").pack(1, 0, 65535) + Struct("<HHB3x").pack(9, 1, 9) + b"\0" * 4)) # nanosecond timestamps
+        for n, data in enumerate(frames):
+            ts = (1700000000 + n // 1000) * 10**9 + n % 1000 * 10**6
+            f.write(block(6, Struct("<IIIII").pack(0, ts >> 32, ts & 0xFFFFFFFF, len(data), len(data)) + data))
+
+
+def contents(path: str) -> list[tuple[str, str]]:
+    return [(msg.param["data"], resp) for _, msg, resp in turns([path])]
+
+
+def main(flows: int = 20000, turns_per_flow: int = 6, flag_regex: str = r"flag\{[0-9a-f]{32}\}"):
+    frames, expected = traffic(flows, turns_per_flow)
+    with TemporaryDirectory() as tmp:
+        pcap, small, pcapng = (os.path.join(tmp, name) for name in ("dump.pcap", "small.pcap", "small.pcapng"))
+        write_pcap(pcap, frames)
+        write_pcap(small, frames[:len(frames) // 10])
+        write_pcapng(pcapng, frames[:len(frames) // 10])
+        size = os.path.getsize(pcap)
+        print(f"{len(frames)} packets, {flows} flows, {size / 1e6:.1f} MB")
+        want = sorted((request.decode("latin-1"), response.decode("latin-1")) for flow in expected for request, response in flow)
+        print(f"turns reassembled correctly: {sorted(contents(pcap)) == want}, pcapng gives the same turns: {contents(small) == contents(pcapng)}")
+
+        start = perf_counter()
+        count = sum(1 for _ in turns([pcap]))
+        elapsed = perf_counter() - start
+        print(f"reassembly  {size / elapsed / 1e6:7.1f} MB/s  {count} turns in {elapsed:.2f}s")
+        for workers in sorted({1, 2, os.cpu_count() or 1}):
+            tasks = [([pcap], shard, workers, None, flag_regex, 30.0, False) for shard in range(workers)]
+            start = perf_counter()
+            with Pool(workers) as pool:
+                mined = pool.map(mine, tasks)
+            elapsed = perf_counter() - start
+            attacks = sum(len(results) for results, _ in mined)
+            print(f"{workers} worker(s) {size / elapsed / 1e6:7.1f} MB/s  {attacks} attacks with flags in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
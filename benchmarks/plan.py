@@ -0,0 +1,47 @@
+"""Replays one captured attack against many teams, per-message closures vs a compiled AttackPlan.
+
+Run with `python -m benchmarks.plan`.
+"""
+from time import perf_counter
+from uuid import uuid4
+
+from benchmarks.provenance import record
+from src.man import MAN, Team
+from src.server import Server
+
+
+def teams(count: int) -> list[tuple[Team, str]]:
+    targets = []
+    for n in range(count):
+        server = Server()
+        team = Team(f"team{n}", server, MAN(server))
+        team.manServer.place_flag(username := uuid4().hex, f"flag{{{uuid4().hex}}}")
+        targets.append((team, username))
+    return targets
+
+
+def closures(atk, usernames, targets):
+    attack = atk.generate_attack(usernames)
+    for team, username in targets:
+        resps = []
+        for call in attack(username):
+            resps.append(team.manServer.response(call(resps)))
+
+
+def main(length: int = 20, repeat: int = 20):
+    atk, usernames = record(length)
+    print(f"{length} messages per attack, {repeat} ticks")
+    print(f"{'teams':>6} {'closures':>12} {'plan':>12} {'plan/team':>12}")
+    for count in (1, 10, 50, 200):
+        targets = teams(count)
+        start = perf_counter()
+        for _ in range(repeat): closures(atk, usernames, targets)
+        legacy = (perf_counter() - start) / repeat
+        start = perf_counter()
+        for _ in range(repeat): atk.compile(usernames).run(targets)
+        plan = (perf_counter() - start) / repeat
+        print(f"{count:>6} {legacy * 1e3:>9.2f} ms {plan * 1e3:>9.2f} ms {plan / count * 1e6:>9.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Compares the provenance index against the nested str.find loops Attack used before.
+
+Run with `python -m benchmarks.provenance`.
+"""
+from timeit import timeit
+from uuid import uuid4
+
+from src.server import Message, Server
+from src.shield import Attack, ShieldMAN
+
+
+def legacy_generate_attack(atk: Attack, usernames: list[str]):
+    def attack(username: str) -> list[str]:
+        responses = [resp for _, resp in atk.messages]
+        def shield_message(msg: Message):
+            def call(prev_responses: list[str]):
+                params = {}
+                for key, value in msg.param.items():
+                    if key in usernames: key = username
+                    if value in usernames: value = username
+                    for r, p in zip(responses, prev_responses):
+                        if (key_index := r.find(key)) >= 0:
+                            key = p[key_index:key_index+len(key)]
+                        if (value_index := r.find(value)) >= 0:
+                            value = p[value_index:value_index+len(value)]
+                    params[key] = value
+                return Message(msg.path, params)
+            return call
+        return [shield_message(msg) for msg, _ in atk.messages]
+    return attack
+
+
+def legacy_generate_script(atk: Attack, usernames: list[str]) -> str:
+    script = "def attack(team: Team, username: str) -> list[str]:\n"
+    script += "    resps = []\n"
+    msgs, resps = zip(*atk.messages)
+    for i, msg in enumerate(msgs):
+        params = []
+        for key, value in msg.param.items():
+            keystr, valuestr = f"\"{key}\"", f"\"{value}\""
+            if key in usernames: keystr = "username"
+            if value in usernames: valuestr = "username"
+            for j, r in enumerate(resps[:i]):
+                if (key_index := r.find(key)) >= 0:
+                    keystr = f"resps[{j}][{key_index}:{key_index+len(key)}]"
+                if (value_index := r.find(value)) >= 0:
+                    valuestr = f"resps[{j}][{value_index}:{value_index+len(key)}]"
+            params.append(f"{keystr}: {valuestr}")
+        params = f"{{{', '.join(params)}}}"
+        script += f"    resps.append(team.manServer.response(Message(path='{msg.path}', param={params})))\n"
+    return script
+
+
+def record(length: int) -> tuple[Attack, list[str]]:
+    """Captures one session of about `length` messages: register, login and alternating posts and reads"""
+    server = Server()
+    shield = ShieldMAN("flag{[0-9a-f]{32}}", server)
+    username = uuid4().hex
+    server.messages[username] = f"flag{{{uuid4().hex}}}"
+    shield.response(Message("register", {"username": username, "password": "1234"}))
+    cookie = shield.response(Message("login", {"username": username, "password": "1234"}))[22:]
+    for n in range(length - 2):
+        shield.response(Message("message", {"cookie": cookie, "message": f"post {n}"}) if n % 2 else Message("read", {"cookie": cookie}))
+    return shield.attacks[-1], [username]
+
+
+def replay(generate, atk: Attack, usernames: list[str]):
+    resps = [resp for _, resp in atk.messages]
+    calls = generate(atk, usernames)("victim")
+    for i, call in enumerate(calls):
+        call(resps[:i])
+
+
+def main(repeat: int = 5):
+    print(f"{'messages':>8} {'script legacy':>14} {'script index':>13} {'replay legacy':>14} {'replay index':>13}")
+    for length in (100, 200, 400, 800):
+        atk, usernames = record(length)
+        times = [timeit(lambda: legacy_generate_script(atk, usernames), number=repeat),
+                 timeit(lambda: (setattr(atk, "_provenance", None), atk.generate_script(usernames)), number=repeat),
+                 timeit(lambda: replay(legacy_generate_attack, atk, usernames), number=repeat),
+                 timeit(lambda: (setattr(atk, "_provenance", None), replay(Attack.generate_attack, atk, usernames)), number=repeat)]
+        print(f"{length:>8} " + " ".join(f"{t / repeat * 1e3:>11.2f} ms" for t in times))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Incremental scoreboard against recomputing the ranking from the history of the game.
+
+Run with `python -m benchmarks.scoreboard`.
+"""
+from random import Random
+from time import perf_counter
+
+from src.flags import FlagInfo
+from src.scoreboard import Score, Scoreboard
+
+
+def recompute(captures: list[FlagInfo], slas: list[tuple[str, bool]], teams: list[str]) -> list[tuple[str, Score]]:
+    scores = {name: Score() for name in teams}
+    for info in captures:
+        scores[info.attacker].attack += 1.0
+        scores[info.defender].defence -= 1.0
+    for name, up in slas:
+        if up: scores[name].sla += 1.0
+    return sorted(scores.items(), key = lambda item: (-item[1].total, item[0]))
+
+
+def main(teams: int = 40, ticks: int = 300, capture: float = 0.3, reads: int = 20, seed: int = 0):
+    rng, names = Random(seed), [f"team{n}" for n in range(teams)]
+    board, captures, slas = Scoreboard(), [], []
+    for name in names:
+        board.add_team(name)
+    events, update, read, naive = 0, 0.0, 0.0, 0.0
+    for tick in range(ticks):
+        infos = [FlagInfo(atk, dev, tick, "") for atk in names for dev in names if atk != dev and rng.random() < capture]
+        ups = [(name, rng.random() < 0.9) for name in names]
+        start = perf_counter()
+        board.new_tick(tick)
+        for name, up in ups: board.sla(name, up)
+        for info in infos: board.capture(info)
+        update += perf_counter() - start
+        events += len(infos) + len(ups)
+        captures += infos
+        slas += ups
+        if tick % (ticks // reads) == 0 or tick == ticks - 1:
+            start = perf_counter()
+            ranking = board.ranking()
+            read += perf_counter() - start
+            start = perf_counter()
+            expected = recompute(captures, slas, names)
+            naive += perf_counter() - start
+            assert [name for name, _ in ranking] == [name for name, _ in expected]
+    print(f"{teams} teams, {ticks} ticks, {events} events, rankings identical")
+    print(f"update      {update / events * 1e6:7.2f} us per event")
+    print(f"ranking     incremental {read / (reads + 1) * 1e3:7.3f} ms  recomputed {naive / (reads + 1) * 1e3:7.1f} ms per read (mean over the game)")
+    delta = board.delta(ticks - 1)
+    print(f"last tick   {sum(d.attack for d in delta.values()):.0f} attack points, {sum(d.sla for d in delta.values()):.0f} sla points")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Simulated game of N teams over M ticks with K attacks per tick, all teams behind MAN or ShieldMAN.
+
+An attack registers the username of its pair on the defender, logs in and reads the flag, which is
+then validated with check_flag. Each mode reports message throughput, latency percentiles of
+response() and the peak memory of a second, traced run. For ShieldMAN, the cost of
+generate_attack and generate_script for the captured attacks with flags is reported as well.
+
+Results are written as json, with a baseline of an earlier revision the relative change of every
+number is printed:
+
+    python -m benchmarks.simulation --teams 40 --ticks 20 --attacks 400 --out sim.json
+    python -m benchmarks.simulation --teams 40 --ticks 20 --attacks 400 --baseline sim.json
+"""
+from argparse import ArgumentParser
+import json
+from random import Random
+import subprocess
+from time import perf_counter
+import tracemalloc
+
+from src.game import Gameserver
+from src.man import MAN, Team
+from src.server import Message, Server
+from src.shield import ShieldMAN
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    samples = sorted(samples)
+    at = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))]
+    return {"p50": at(0.5), "p90": at(0.9), "p99": at(0.99), "max": samples[-1]} if samples else {}
+
+
+def setup(mode: str, teams: int) -> Gameserver:
+    game = Gameserver()
+    for n in range(teams):
+        server = Server()
+        man = ShieldMAN(game.flag_regex, server) if mode == "shield" else MAN(server)
+        game.add_team(Team(f"team{n}", server, man))
+    return game
+
+
+def attack(attacker: Team, defender: Team, username: str, latencies: list[float]) -> str:
+    def send(path: str, **param) -> str:
+        start = perf_counter()
+        resp = defender.manServer.response(Message(path, param))
+        latencies.append(perf_counter() - start)
+        return resp
+    send("register", username = username, password = "1234")
+    cookie = send("login", username = username, password = "1234")[22:]
+    return send("read", cookie = cookie)[17:]
+
+
+def simulate(mode: str, teams: int, ticks: int, attacks: int, seed: int = 0) -> tuple[Gameserver, dict]:
+    rng, game = Random(seed), setup(mode, teams)
+    members = list(game.teams.values())
+    latencies, rotate, elapsed, correct = [], 0.0, 0.0, 0
+    for _ in range(ticks):
+        start = perf_counter()
+        game.generate_flags()
+        rotate += perf_counter() - start
+        pairs = [rng.sample(members, 2) for _ in range(attacks)]
+        start = perf_counter()
+        for attacker, defender in pairs:
+            flag = attack(attacker, defender, game.usernames(attacker, defender, -1), latencies)
+            correct += game.check_flag(attacker, defender, flag)
+        elapsed += perf_counter() - start
+    return game, {"messages": len(latencies), "throughput": len(latencies) / elapsed, "latency": percentiles(latencies),
+                  "attack": elapsed / (ticks * attacks), "tick": rotate / ticks, "flags": correct}
+
+
+def generation(game: Gameserver, samples: int) -> dict:
+    """Cost of turning captured attacks with flags into functions and scripts"""
+    attack_times, script_times = [], []
+    for team in game.teams.values():
+        usernames = [name for other in game.teams.values() for name in game.usernames(other, team)]
+        for atk in [atk for atk in team.manServer.attacks if atk.hasFlag][:samples]:
+            start = perf_counter()
+            atk.generate_attack(usernames)
+            attack_times.append(perf_counter() - start)
+            start = perf_counter()
+            atk.generate_script(usernames)
+            script_times.append(perf_counter() - start)
+    return {"attacks": len(attack_times), "generate_attack": percentiles(attack_times), "generate_script": percentiles(script_times)}
+
+
+def peak_memory(mode: str, teams: int, ticks: int, attacks: int, seed: int) -> int:
+    tracemalloc.start()
+    try:
+        game, _ = simulate(mode, teams, ticks, attacks, seed)
+        game.close()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def revision() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output = True, text = True, check = True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(teams: int, ticks: int, attacks: int, seed: int = 0, memory: bool = True, samples: int = 5) -> dict:
+    result = {"revision": revision(), "config": {"teams": teams, "ticks": ticks, "attacks": attacks, "seed": seed}}
+    for mode in ("man", "shield"):
+        game, result[mode] = simulate(mode, teams, ticks, attacks, seed)
+        if mode == "shield": result["generate"] = generation(game, samples)
+        game.close()
+        if memory: result[mode]["peak_memory"] = peak_memory(mode, teams, ticks, attacks, seed)
+    return result
+
+
+def flatten(result: dict, prefix: str = "") -> dict[str, float]:
+    numbers = {}
+    for key, value in result.items():
+        if isinstance(value, dict): numbers.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool): numbers[prefix + key] = value
+    return numbers
+
+
+def compare(result: dict, baseline: dict):
+    """Prints the relative change of every number against the baseline"""
+    if result["config"] != baseline.get("config"): print(f"warning: baseline ran with {baseline.get('config')}")
+    old = flatten(baseline)
+    print(f"{'':32} {baseline.get('revision') or 'baseline':>12} {result['revision'] or 'current':>12}")
+    for key, value in flatten(result).items():
+        if key.startswith("config.") or key not in old: continue
+        change = f"{(value - old[key]) / old[key]:+.1%}" if old[key] else ""
+        print(f"{key:32} {old[key]:12.6g} {value:12.6g} {change:>8}")
+
+
+def report(result: dict):
+    config = result["config"]
+    print(f"{config['teams']} teams, {config['ticks']} ticks, {config['attacks']} attacks per tick")
+    for mode in ("man", "shield"):
+        r, latency = result[mode], result[mode]["latency"]
+        memory = f"  peak {r['peak_memory'] / 1e6:.1f} MB" if "peak_memory" in r else ""
+        print(f"{mode:6} {r['throughput']:9.0f} msg/s  p50 {latency['p50'] * 1e6:6.1f} us  p99 {latency['p99'] * 1e6:6.1f} us  "
+              f"max {latency['max'] * 1e3:6.2f} ms  tick {r['tick'] * 1e3:6.1f} ms  {r['flags']} flags{memory}")
+    gen = result["generate"]
+    if gen["attacks"]:
+        print(f"generate_attack p50 {gen['generate_attack']['p50'] * 1e6:.1f} us  generate_script p50 {gen['generate_script']['p50'] * 1e6:.1f} us "
+              f"over {gen['attacks']} captured attacks")
+
+
+def main(argv: list[str] = None):
+    parser = ArgumentParser(description = "simulated game of Server, MAN and ShieldMAN at scale")
+    parser.add_argument("--teams", type = int, default = 40)
+    parser.add_argument("--ticks", type = int, default = 20)
+    parser.add_argument("--attacks", type = int, default = 400, help = "attacks per tick")
+    parser.add_argument("--seed", type = int, default = 0)
+    parser.add_argument("--no-memory", action = "store_true", help = "skip the traced runs for peak memory")
+    parser.add_argument("--out", default = None, help = "json file for the results")
+    parser.add_argument("--baseline", default = None, help = "json results of an earlier run to compare with")
+    args = parser.parse_args(argv)
+    result = run(args.teams, args.ticks, args.attacks, args.seed, not args.no_memory)
+    report(result)
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(result, json.load(f))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent = 2)
+
+
+if __name__ == "__main__":
+    main()
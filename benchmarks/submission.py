@@ -0,0 +1,54 @@
+"""Bulk flag submission against validating flags one by one with Gameserver.check_flag.
+
+Every team submits the flags of all its pairs of the window in batches, half of them a second time
+and mixed with invalid and own flags, and the verdicts are checked against the expected ones.
+
+Run with `python -m benchmarks.submission`.
+"""
+from random import Random
+from time import perf_counter
+
+from benchmarks.gameserver import game
+from src.submission import FlagSubmission, Status
+
+
+def main(teams: int = 40, window: int = 5, batch: int = 500, seed: int = 0):
+    g, rng = game(teams, window, window), Random(seed)
+    names = list(g.teams)
+    submissions, expected = {}, {}
+    for attacker in names:
+        flags = [g.store.flag(attacker, defender, n) for n in range(window) for defender in names if defender != attacker]
+        again = rng.sample(flags, len(flags) // 2)
+        own = [g.store.flag(attacker, attacker, n) for n in range(window)]
+        foreign = [g.store.flag(names[0 if attacker != names[0] else 1], names[2], n) for n in range(window)]
+        junk = [f"flag{{{rng.getrandbits(128):032x}}}" for _ in range(len(flags) // 10)]
+        submissions[attacker] = flags + again + own + foreign + junk
+        expected[attacker] = [Status.ACCEPTED] * len(flags) + [Status.DUPLICATE] * len(again) + [Status.OWN] * len(own) + [Status.INVALID] * (len(foreign) + len(junk))
+    total = sum(len(flags) for flags in submissions.values())
+
+    submission = g.submission
+    submission.rate = None
+    start = perf_counter()
+    results = {team: [status for i in range(0, len(flags), batch) for status, _ in submission.submit(team, flags[i:i + batch])]
+               for team, flags in submissions.items()}
+    elapsed = perf_counter() - start
+    print(f"{teams} teams, window of {window} ticks, {total} flags in batches of {batch}")
+    print(f"verdicts correct: {results == expected}  {dict((s.name, c) for s, c in submission.counts.items())}")
+    print(f"bulk submission   {total / elapsed:10.0f} flags/s  {elapsed / total * 1e6:.2f} us per flag")
+
+    subs = [(g.teams[team], g.teams[info.defender], flag) for team, flags in submissions.items()
+            for flag in flags if (info := g.store.lookup(flag)) is not None]
+    start = perf_counter()
+    for sub in subs: g.check_flag(*sub)
+    elapsed = perf_counter() - start
+    print(f"check_flag        {len(subs) / elapsed:10.0f} flags/s  without duplicate detection, defender known in advance")
+
+    with game(teams, window, window) as fresh:
+        limited = FlagSubmission(fresh, rate = 10.0, burst = 100)
+        statuses = [status for status, _ in limited.submit(names[0], submissions[names[0]])]
+    g.close()
+    print(f"rate limit of burst 100: {statuses.count(Status.RATE_LIMITED)} of {len(statuses)} flags rejected")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Throughput and added latency of the TcpProxy in front of a local echo service.
+
+The echo service and the proxy run in their own processes, the clients in this one. Every
+client opens one connection and does sequential round trips, first directly against the
+echo service and then through the proxy. Throughput is measured with thousands of concurrent
+connections, the added latency with a single one.
+
+Run with `python -m benchmarks.tcp_proxy`.
+"""
+import asyncio
+from multiprocessing import Process, Queue
+from statistics import median, quantiles
+from time import perf_counter
+
+from src.game import Gameserver
+from src.metrics import metrics
+from src.shield import ShieldMAN
+from src.tcp_proxy import TcpProxy
+
+
+async def echo(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    while data := await reader.read(65536):
+        writer.write(data)
+        await writer.drain()
+    writer.close()
+
+
+def run_echo(ports: Queue):
+    async def serve():
+        server = await asyncio.start_server(echo, "127.0.0.1", 0, backlog = 4096)
+        ports.put(server.sockets[0].getsockname()[1])
+        await server.serve_forever()
+    asyncio.run(serve())
+
+
+def run_proxy(upstream: int, ports: Queue, stop: Queue, results: Queue):
+    async def serve():
+        shield = ShieldMAN(Gameserver.flag_regex)
+        shield.start_pipeline()
+        proxy = TcpProxy(shield, ("127.0.0.1", upstream), ("127.0.0.1", 0))
+        ports.put((await proxy.start())[1])
+        await asyncio.get_running_loop().run_in_executor(None, stop.get)
+        await proxy.close()
+        shield.stop_pipeline()
+        results.put({**proxy.stats(), "attacks": len(shield.attacks), "capture": metrics.stages["capture"].snapshot()})
+    asyncio.run(serve())
+
+
+async def client(port: int, rounds: int, payload: bytes, latencies: list[float]):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for _ in range(rounds):
+        start = perf_counter()
+        writer.write(payload)
+        await reader.readexactly(len(payload))
+        latencies.append(perf_counter() - start)
+    writer.close()
+    await writer.wait_closed()
+
+
+async def load(port: int, connections: int, rounds: int, size: int) -> tuple[float, list[float]]:
+    payload = b"x" * (size - 1) + b"\n"
+    latencies = []
+    start = perf_counter()
+    for batch in range(0, connections, 500): # stay below the default open file limit
+        await asyncio.gather(*(client(port, rounds, payload, latencies) for _ in range(min(500, connections - batch))))
+    return perf_counter() - start, latencies
+
+
+def report(name: str, elapsed: float, latencies: list[float], size: int):
+    p99 = quantiles(latencies, n = 100)[98]
+    print(f"{name:<8} {len(latencies) / elapsed:9.0f} round trips/s {2 * size * len(latencies) / elapsed / 1e6:8.2f} MB/s"
+          f"  median {median(latencies) * 1e6:7.1f} us  p99 {p99 * 1e6:7.1f} us")
+    return median(latencies)
+
+
+def main(connections: int = 2000, rounds: int = 20, size: int = 512):
+    ports, stop, results = Queue(), Queue(), Queue()
+    echo_server = Process(target = run_echo, args = (ports,), daemon = True)
+    echo_server.start()
+    upstream = ports.get()
+    proxy = Process(target = run_proxy, args = (upstream, ports, stop, results), daemon = True)
+    proxy.start()
+    port = ports.get()
+
+    print(f"throughput: {connections} connections x {rounds} round trips of {size} bytes")
+    report("direct", *asyncio.run(load(upstream, connections, rounds, size)), size)
+    report("proxied", *asyncio.run(load(port, connections, rounds, size)), size)
+    print(f"latency: 1 connection x {connections} round trips of {size} bytes")
+    direct = report("direct", *asyncio.run(load(upstream, 1, connections, size)), size)
+    proxied = report("proxied", *asyncio.run(load(port, 1, connections, size)), size)
+    print(f"added latency (median) {(proxied - direct) * 1e6:.1f} us")
+
+    stop.put(None)
+    print(results.get())
+    proxy.join()
+    echo_server.terminate()
+
+
+if __name__ == "__main__":
+    main()
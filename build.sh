@@ -1,3 +1,5 @@
 poetry lock
 poetry install
-poetry run python -m grpc_tools.protoc --proto_path=src --python_out=src --pyi_out=src --grpc_python_out=src src/protos/message_board/message_board.proto
\ No newline at end of file
+poetry run python -m grpc_tools.protoc --proto_path=src --python_out=src --pyi_out=src --grpc_python_out=src src/protos/message_board/message_board.proto
+# the message board imports its protos relative to src, the flag submission as src.protos like the rest of src
+poetry run python -m grpc_tools.protoc --proto_path=. --python_out=. --pyi_out=. --grpc_python_out=. src/protos/flag_submission/flag_submission.proto
@@ -1,8 +1,12 @@
+import asyncio
+
 from src.game import Gameserver
 
 from src.server import Server, Message
 from src.man import MAN, Team
+from src.runner import ExploitRunner
 from src.shield import ShieldMAN
+from src.tick import TickScheduler
 
 def manual_attack(attacker: Team, defender: Team, game: Gameserver, index: int = -1) -> list[str]:
     username = game.usernames(attacker, defender, index)
@@ -27,15 +31,26 @@ a = mistMan.attacks[0]
 mist_usernames = game.usernames(faust, mist)
 username = game.usernames(mist, faust, 0)
 
-func = a.generate_attack(mist_usernames)
-funcs = func(username)
-resps = []
-for f in funcs:
-    msg = f(resps)
-    response = faust.manServer.response(msg)
-    resps.append(response)
+plan = a.compile(mist_usernames)
+for response in plan.run_one(faust, username).responses:
     print(response)
 
 print("\ngenerated attack script:\n")
 
 print(a.generate_script(mist_usernames))
+
+# mist fires all stolen attacks at every other team
+runner = ExploitRunner(game, mist)
+for outcome in runner.run_tick():
+    print(f"\n{outcome.execution.team.name}: {outcome.flags}, correct: {[game.check_flag(mist, outcome.execution.team, f) for f in outcome.flags]}")
+print(runner.snapshot())
+
+# the game loop: every tick rotates and places flags, runs the stolen attacks and submits their flags
+scheduler = TickScheduler(game, tick_length = 0.5, runners = [runner])
+asyncio.run(scheduler.run(ticks = 2))
+for report in scheduler.reports:
+    print(report.summary())
+for name, score in game.scoreboard.ranking():
+    print(f"{game.scoreboard.rank(name)}. {name}: {score.total:g} (attack {score.attack:g}, defence {score.defence:g}, sla {score.sla:g})")
+runner.close()
+game.close()
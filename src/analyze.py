@@ -0,0 +1,92 @@
+"""Re-mines recorded traffic offline.
+
+Streams capture logs through flag scanning and attack segmentation in this process and hands
+every finished attack to a process pool for provenance analysis and script generation.
+
+    python -m src.analyze capture.log [more.log ...] --workers 8 --out attacks.jsonl
+"""
+from argparse import ArgumentParser
+from contextlib import ExitStack
+from heapq import merge
+import json
+from math import inf
+from multiprocessing import Pool
+import sys
+from time import perf_counter
+from typing import Iterable, Iterator
+
+from src.capture_log import CaptureLogReader, LogEntry
+from src.fingerprint import ExploitCache
+from src.game import Gameserver
+from src.provenance import Slice
+from src.shield import Attack, ShieldMAN
+
+
+def entries(paths: list[str]) -> Iterator[LogEntry]:
+    """Records of all logs merged by their wall time, so sessions only ever move forward in time"""
+    with ExitStack() as stack:
+        readers = [stack.enter_context(CaptureLogReader(path)) for path in paths]
+        yield from merge(*readers, key = lambda entry: entry.timestamp)
+
+
+def segment(entries: Iterable[LogEntry], shield: ShieldMAN, every: int = 1024) -> Iterator[Attack]:
+    """Replays entries into the ShieldMAN with their recorded timestamps, yields attacks once their session went idle"""
+    for n, entry in enumerate(entries, 1):
+        shield.capture(entry.message, entry.response, entry.timestamp)
+        if n % every == 0:
+            yield from shield.pop_idle(entry.timestamp)
+    yield from shield.pop_idle(inf)
+
+
+def usernames(atk: Attack) -> list[str]:
+    """Without a game server the accounts logged into are taken as the attacked usernames"""
+    return list({value for rec in atk.messages if rec.path in ShieldMAN.login_paths for key, value in rec.items() if key in ShieldMAN.login_keys})
+
+
+_cache = ExploitCache() # one per worker process
+
+
+def analyse(atk: Attack) -> dict:
+    names = usernames(atk)
+    resolved = atk.resolve(names)
+    exploit = _cache.lookup(atk, names, resolved)
+    return {
+        "attack": str(atk.id),
+        "fingerprint": exploit.fingerprint,
+        "flags": atk.flags,
+        "messages": len(atk.messages),
+        "paths": [path for path, _ in resolved],
+        "usernames": names,
+        "slices": sum(isinstance(source, Slice) for _, params in resolved for param in params for source in param),
+        "script": exploit.script,
+    }
+
+
+def main(argv: list[str] = None):
+    parser = ArgumentParser(prog = "python -m src.analyze", description = "Extract attacks and generate scripts from capture logs")
+    parser.add_argument("logs", nargs = "+", help = "capture logs written by CaptureLog")
+    parser.add_argument("--flag-regex", action = "append", help = "flag format, may be given multiple times")
+    parser.add_argument("--idle-timeout", type = float, default = 30.0, help = "seconds after which a session ends")
+    parser.add_argument("--workers", type = int, default = None, help = "analysis processes, defaults to the cpu count")
+    parser.add_argument("--chunksize", type = int, default = 16)
+    parser.add_argument("--all", action = "store_true", help = "analyse attacks without flags too")
+    parser.add_argument("--out", default = None, help = "json lines output, defaults to stdout")
+    args = parser.parse_args(argv)
+
+    shield = ShieldMAN(args.flag_regex or Gameserver.flag_regex, idle_timeout = args.idle_timeout)
+    attacks = (atk for atk in segment(entries(args.logs), shield) if args.all or atk.hasFlag)
+    out = open(args.out, "w") if args.out else sys.stdout
+    start, count, flags = perf_counter(), 0, 0
+    try:
+        with Pool(args.workers) as pool:
+            for result in pool.imap_unordered(analyse, attacks, args.chunksize):
+                out.write(json.dumps(result) + "\n")
+                count += 1
+                flags += len(result["flags"])
+    finally:
+        if out is not sys.stdout: out.close()
+    print(f"{count} attacks with {flags} flags in {perf_counter() - start:.2f}s", file = sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+from sys import getsizeof
+from typing import Iterator
+from uuid import UUID
+
+from src.server import Message
+
+
+class Record:
+    """Captured message with its response.
+
+    Instead of a Message with its own param dict, the path and the tuple of param keys are
+    interned and shared by all records of the same shape, only the values are stored per record.
+    Unpacks like the former (Message, response) tuples.
+    """
+    __slots__ = ("path", "keys", "values", "response")
+
+    def __init__(self, path: str, keys: tuple[str, ...], values: tuple[str, ...], response: str):
+        self.path = path
+        self.keys = keys
+        self.values = values
+        self.response = response
+
+    @property
+    def message(self) -> Message:
+        return Message(self.path, dict(zip(self.keys, self.values)))
+
+    def items(self) -> Iterator[tuple[str, str]]:
+        return zip(self.keys, self.values)
+
+    def __iter__(self):
+        yield self.message
+        yield self.response
+
+    def __repr__(self):
+        return f"Record({self.path!r}, {dict(self.items())!r}, {self.response!r})"
+
+
+class CaptureStore:
+    """Creates records and keeps track of the memory they use per attack"""
+
+    def __init__(self, budget: int = None):
+        self.budget = budget # bytes, None for unlimited
+        self.strings: dict[str, str] = {}
+        self.shapes: dict[tuple[str, ...], tuple[str, ...]] = {}
+        self.sizes: dict[UUID, int] = {}
+        self.size = 0
+        self.records = 0
+        self.evicted = 0
+
+    def intern(self, s: str) -> str:
+        return self.strings.setdefault(s, s)
+
+    def record(self, attack: UUID, msg: Message, resp: str) -> Record:
+        keys = tuple(self.intern(key) for key in msg.param)
+        keys = self.shapes.setdefault(keys, keys)
+        values = tuple(msg.param.values())
+        rec = Record(self.intern(msg.path), keys, values, resp)
+        size = getsizeof(rec) + getsizeof(values) + getsizeof(resp) + sum(map(getsizeof, values))
+        self.sizes[attack] = self.sizes.get(attack, 0) + size
+        self.size += size
+        self.records += 1
+        return rec
+
+    def charge(self, attack: UUID, size: int):
+        """Counts memory kept alongside the records of an attack, like its provenance index"""
+        self.sizes[attack] = self.sizes.get(attack, 0) + size
+        self.size += size
+
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.size > self.budget
+
+    def release(self, attack: UUID, records: int):
+        self.size -= self.sizes.pop(attack, 0)
+        self.records -= records
+
+    def memory(self) -> dict[str, int]:
+        interned = sum(map(getsizeof, self.strings)) + sum(map(getsizeof, self.shapes))
+        return {"bytes": self.size + interned, "record_bytes": self.size, "interned_bytes": interned, "budget": self.budget,
+                "messages": self.records, "attacks": len(self.sizes), "evicted": self.evicted}
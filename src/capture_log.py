@@ -0,0 +1,148 @@
+from bisect import bisect_left
+from hashlib import blake2b
+from mmap import ACCESS_READ, mmap
+import os
+from struct import Struct
+from time import time
+from typing import Iterator, NamedTuple
+from uuid import UUID
+
+from src.server import Message
+
+# log record: header, path, params as (key length, value length, key, value)*, response
+HEADER = Struct("<16sdIII") # attack id, timestamp, path length, param count, response length
+PARAM = Struct("<II")
+# sidecar index entry, one per record
+ENTRY = Struct("<QI16sd8s") # offset in the log, record length, attack id, timestamp, session hash
+NO_SESSION = bytes(8)
+
+
+def session_hash(token: str) -> bytes:
+    return blake2b(token.encode(), digest_size = 8).digest()
+
+
+class LogEntry(NamedTuple):
+    attack: UUID
+    timestamp: float
+    message: Message
+    response: str
+
+
+class CaptureLog:
+    """Append-only writer for captured messages.
+
+    Every record is written to the log and a fixed size entry with its offset to the sidecar
+    index `<path>.idx`. Timestamps are wall time, the index keeps a hash of the session token the
+    message was sent with, like its cookie, so readers find sessions without decoding. Both files are written through buffered file objects, so appending
+    is a memory copy until the buffer is full.
+    """
+
+    def __init__(self, path: str, buffering: int = 1 << 16):
+        self.path = path
+        self.log = open(path, "ab", buffering = buffering)
+        self.index = open(f"{path}.idx", "ab", buffering = buffering)
+        self.offset = self.log.tell()
+
+    def append(self, attack: UUID, msg: Message, resp: str, timestamp: float = None, session: str = None):
+        timestamp = time() if timestamp is None else timestamp
+        path = msg.path.encode()
+        params = [(str(key).encode(), str(value).encode()) for key, value in msg.param.items()]
+        response = resp.encode()
+        parts = [HEADER.pack(attack.bytes, timestamp, len(path), len(params), len(response)), path]
+        for key, value in params:
+            parts += (PARAM.pack(len(key), len(value)), key, value)
+        parts.append(response)
+        record = b"".join(parts)
+        self.log.write(record)
+        self.index.write(ENTRY.pack(self.offset, len(record), attack.bytes, timestamp, NO_SESSION if session is None else session_hash(session)))
+        self.offset += len(record)
+
+    def flush(self):
+        self.log.flush()
+        self.index.flush()
+
+    def close(self):
+        self.log.close()
+        self.index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _map(path: str) -> mmap | bytes:
+    with open(path, "rb") as f:
+        return mmap(f.fileno(), 0, access = ACCESS_READ) if os.fstat(f.fileno()).st_size else b""
+
+
+class CaptureLogReader:
+    """Random access to a capture log by record number, attack id, session token or time range.
+
+    Log and index are memory-mapped, records are only decoded when they are accessed.
+    Entries of records that were not completely written are ignored.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.log = _map(path)
+        self.index = _map(f"{path}.idx")
+        entries = len(self.index) // ENTRY.size
+        self.offsets, self.lengths, self.timestamps, self.attacks, self.sessions = [], [], [], {}, {}
+        for n, (offset, length, attack, timestamp, session) in enumerate(ENTRY.iter_unpack(memoryview(self.index)[:entries * ENTRY.size])):
+            if offset + length > len(self.log): break
+            self.offsets.append(offset)
+            self.lengths.append(length)
+            self.timestamps.append(timestamp)
+            self.attacks.setdefault(UUID(bytes = attack), []).append(n)
+            if session != NO_SESSION: self.sessions.setdefault(session, []).append(n)
+        self.sorted = all(a <= b for a, b in zip(self.timestamps, self.timestamps[1:]))
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def raw(self, n: int) -> memoryview:
+        """Undecoded bytes of record n without copying"""
+        return memoryview(self.log)[self.offsets[n]:self.offsets[n] + self.lengths[n]]
+
+    def __getitem__(self, n: int) -> LogEntry:
+        view = self.raw(n)
+        attack, timestamp, path_len, count, resp_len = HEADER.unpack_from(view)
+        pos = HEADER.size
+        path = str(view[pos:pos + path_len], "utf-8")
+        pos += path_len
+        params = {}
+        for _ in range(count):
+            key_len, value_len = PARAM.unpack_from(view, pos)
+            pos += PARAM.size
+            params[str(view[pos:pos + key_len], "utf-8")] = str(view[pos + key_len:pos + key_len + value_len], "utf-8")
+            pos += key_len + value_len
+        return LogEntry(UUID(bytes = attack), timestamp, Message(path, params), str(view[pos:pos + resp_len], "utf-8"))
+
+    def __iter__(self) -> Iterator[LogEntry]:
+        return (self[n] for n in range(len(self)))
+
+    def attack(self, attack: UUID) -> list[LogEntry]:
+        return [self[n] for n in self.attacks.get(attack, [])]
+
+    def session(self, token: str) -> list[LogEntry]:
+        """Records of messages sent with the session token"""
+        entries = (self[n] for n in self.sessions.get(session_hash(token), []))
+        return [entry for entry in entries if token in entry.message.param.values()] # drops hash collisions
+
+    def between(self, start: float, end: float) -> Iterator[LogEntry]:
+        """Records with start <= timestamp < end"""
+        if self.sorted:
+            return (self[n] for n in range(bisect_left(self.timestamps, start), bisect_left(self.timestamps, end)))
+        return (self[n] for n, t in enumerate(self.timestamps) if start <= t < end)
+
+    def close(self):
+        if isinstance(self.log, mmap): self.log.close()
+        if isinstance(self.index, mmap): self.index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,101 @@
+from dataclasses import dataclass, field
+from hashlib import blake2b
+from random import Random
+from uuid import UUID
+
+from src.shield import Attack, ShieldMAN
+
+PRIME = (1 << 61) - 1
+
+
+def shingles(atk: Attack, k: int = 2) -> set[str]:
+    """Every message as path and param keys, plus every run of k consecutive messages"""
+    steps = [f"{rec.path}({','.join(sorted(rec.keys))})" for rec in atk.messages]
+    return set(steps) | {" ".join(steps[i:i + k]) for i in range(len(steps) - k + 1)}
+
+
+@dataclass
+class Cluster:
+    id: int
+    representative: Attack = field(repr = False)
+    signature: tuple[int, ...] = field(repr = False)
+    members: list[UUID] = field(default_factory = list, repr = False)
+    flags: int = 0
+
+    @property
+    def size(self):
+        return len(self.members)
+
+    def offer(self, atk: Attack, signature: tuple[int, ...]):
+        """The shortest attack that yielded flags represents the cluster"""
+        rep = self.representative
+        if (atk.hasFlag, -len(atk.messages)) > (rep.hasFlag, -len(rep.messages)):
+            self.representative, self.signature = atk, signature
+
+
+class AttackClusters:
+    """Groups near-duplicate attacks by MinHash signatures of their message shingles.
+
+    Signatures are split into bands, and every band of every member is a key into the LSH buckets.
+    A new attack is only compared with clusters sharing at least one band with it, so assigning
+    it does not depend on the number of stored attacks.
+    """
+
+    def __init__(self, permutations: int = 64, bands: int = 16, threshold: float = 0.5, seed: int = 0):
+        if permutations % bands: raise ValueError("permutations have to split evenly into bands!")
+        rng = Random(seed)
+        self.hashes = [(rng.randrange(1, PRIME), rng.randrange(PRIME)) for _ in range(permutations)]
+        self.bands = bands
+        self.rows = permutations // bands
+        self.threshold = threshold
+        self.clusters: list[Cluster] = []
+        self.buckets: dict[tuple, set[int]] = {}
+        self.assigned: dict[UUID, int] = {}
+
+    def signature(self, atk: Attack) -> tuple[int, ...]:
+        values = [int.from_bytes(blake2b(s.encode(), digest_size = 8).digest(), "little") for s in shingles(atk)]
+        return tuple(min(((a * v + b) % PRIME for v in values), default = 0) for a, b in self.hashes)
+
+    def band_keys(self, signature: tuple[int, ...]) -> list[tuple]:
+        return [(band, signature[band * self.rows:(band + 1) * self.rows]) for band in range(self.bands)]
+
+    @staticmethod
+    def similarity(a: tuple[int, ...], b: tuple[int, ...]) -> float:
+        """Estimated Jaccard similarity of the shingle sets"""
+        return sum(x == y for x, y in zip(a, b)) / len(a)
+
+    def add(self, atk: Attack) -> Cluster:
+        if (cid := self.assigned.get(atk.id)) is not None: return self.clusters[cid]
+        signature = self.signature(atk)
+        keys = self.band_keys(signature)
+        candidates = set().union(*(self.buckets.get(key, ()) for key in keys))
+        best, score = None, self.threshold
+        for cid in candidates:
+            if (s := self.similarity(signature, self.clusters[cid].signature)) >= score:
+                best, score = self.clusters[cid], s
+        if best is None:
+            best = Cluster(len(self.clusters), atk, signature)
+            self.clusters.append(best)
+        best.members.append(atk.id)
+        best.flags += len(atk.flags)
+        best.offer(atk, signature)
+        for key in keys:
+            self.buckets.setdefault(key, set()).add(best.id)
+        self.assigned[atk.id] = best.id
+        return best
+
+    def update(self, shield: ShieldMAN, now: float = None) -> list[Cluster]:
+        """Assigns all finished attacks of the ShieldMAN not seen before.
+
+        An attack is finished once its session was idle for longer than the idle timeout of the
+        ShieldMAN, until then further messages may still join it. Running attacks are left for a
+        later update, so no attack is clustered from a partial list of messages."""
+        now = shield.clock() if now is None else now
+        with shield.lock:
+            finished = [atk for atk in shield.attacks[:-1] if atk.messages and atk.id not in self.assigned
+                        and now - atk.last_seen > shield.idle_timeout]
+        return [self.add(atk) for atk in finished]
+
+    def representatives(self) -> list[Cluster]:
+        """Clusters by the number of flags their attacks yielded, then by size"""
+        return sorted(self.clusters, key = lambda c: (c.flags, c.size), reverse = True)
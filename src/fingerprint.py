@@ -0,0 +1,65 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from hashlib import blake2b
+from typing import TYPE_CHECKING, Callable
+
+from src.plan import AttackPlan
+from src.provenance import USERNAME, Resolved, Slice, Source
+
+if TYPE_CHECKING:
+    from src.shield import Attack
+
+
+def _shape(source: Source):
+    if source is USERNAME: return "username"
+    if isinstance(source, Slice): return (source.response, source.start, source.end)
+    return source
+
+
+def fingerprint(resolved: Resolved) -> str:
+    """Hash of the shape of an attack: paths, param keys and where every value came from.
+    Usernames, cookies and other values taken from responses only count by their provenance, so
+    replays with other accounts match. Literal values are part of the shape, attacks that differ
+    in their payload get their own exploits."""
+    canonical = tuple((path, tuple(sorted((repr(_shape(key)), repr(_shape(value))) for key, value in params)))
+                      for path, params in resolved)
+    return blake2b(repr(canonical).encode(), digest_size = 16).hexdigest()
+
+
+@dataclass(frozen=True)
+class Exploit:
+    """Everything generated for one exploit shape"""
+    fingerprint: str
+    script: str
+    plan: AttackPlan
+    attack: Callable[[str], list[Callable[[list[str]], object]]] # as returned by Attack.generate_attack
+
+
+class ExploitCache:
+    """LRU cache of generated exploits keyed by fingerprint"""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.entries: OrderedDict[str, Exploit] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, atk: "Attack", usernames: list[str], resolved: Resolved = None) -> Exploit:
+        resolved = atk.resolve(usernames) if resolved is None else resolved
+        key = fingerprint(resolved)
+        if (exploit := self.entries.get(key)) is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return exploit
+        self.misses += 1
+        exploit = self.entries[key] = Exploit(key, atk.generate_script(usernames, resolved), atk.compile(usernames, resolved),
+                                              atk.generate_attack(usernames, resolved))
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last = False)
+        return exploit
+
+    def __len__(self):
+        return len(self.entries)
+
+    def stats(self) -> dict[str, int]:
+        return {"size": len(self.entries), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
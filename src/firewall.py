@@ -0,0 +1,124 @@
+from collections import deque
+from typing import Callable, Iterable, Literal
+
+from src.scanner import FlagScanner
+
+
+class AhoCorasick:
+    """Automaton finding all occurrences of many strings in one pass over a text"""
+
+    def __init__(self, words: Iterable[str] = ()):
+        self.goto: list[dict[str, int]] = [{}]
+        self.fail: list[int] = [0]
+        self.out: list[tuple[str, ...]] = [()]
+        for word in words:
+            self.add(word)
+        self.build()
+
+    def add(self, word: str):
+        node = 0
+        for ch in word:
+            if (nxt := self.goto[node].get(ch)) is None:
+                nxt = self.goto[node][ch] = len(self.goto)
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append(())
+            node = nxt
+        self.out[node] += (word,)
+
+    def build(self):
+        """Computes the failure links breadth first, has to be called after adding words"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self.goto[node].items():
+                queue.append(nxt)
+                f = self.fail[node]
+                while f and ch not in self.goto[f]: f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] += self.out[self.fail[nxt]]
+
+    def findall(self, text: str) -> list[str]:
+        goto, fail, out = self.goto, self.fail, self.out
+        node, found = 0, []
+        for ch in text:
+            while node and ch not in goto[node]: node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]: found.extend(out[node])
+        return found
+
+    def __bool__(self):
+        return len(self.goto) > 1
+
+
+class FlagFirewall:
+    """Stops our own valid flags from leaving the service.
+
+    Flags matching one of the scanner's formats are found by the compiled scanner and checked
+    against a set of live flags, so a response costs one regex pass and a lookup per candidate.
+    Flags of no known format are searched with an Aho-Corasick automaton instead.
+    Flags are grouped by tick, rotate() starts a new tick and forgets the ticks outside the window.
+    The automaton is only rebuilt if irregular flags were added or dropped.
+
+    By default leaks are only reported. The checker of the gameserver reads our flags through the
+    same service, so "block" and "redact" fail its checks as well and cost SLA points. Choose
+    them only where the checker never reads the responses.
+    """
+
+    def __init__(self, scanner: FlagScanner, mode: Literal["block", "redact", "alert"] = "alert", window: int = 5,
+                 on_leak: Callable[[str, list[str]], None] = None, blocked: str = "Service unavailable!"):
+        self.scanner = scanner
+        self.mode = mode
+        self.window = window
+        self.on_leak = on_leak
+        self.blocked = blocked
+        self.ticks: deque[list[str]] = deque([[]])
+        self.live: dict[str, int] = {} # flag -> number of ticks in the window it was placed in
+        self.irregular: dict[str, int] = {}
+        self.automaton = AhoCorasick()
+        self.dirty = False # automaton has to be rebuilt before the next check
+        self.checked = 0
+        self.leaked = 0
+
+    def add(self, flag: str):
+        self.ticks[-1].append(flag)
+        if self.scanner.scan(flag) == [flag]:
+            self.live[flag] = self.live.get(flag, 0) + 1
+        else:
+            self.irregular[flag] = self.irregular.get(flag, 0) + 1
+            self.dirty = True
+
+    def rotate(self):
+        self.ticks.append([])
+        while len(self.ticks) > self.window:
+            for flag in self.ticks.popleft():
+                flags = self.live if flag in self.live else self.irregular
+                self.dirty |= flags is self.irregular
+                if (count := flags[flag] - 1): flags[flag] = count
+                else: del flags[flag]
+
+    def __len__(self):
+        return len(self.live) + len(self.irregular)
+
+    def leaks(self, resp: str) -> list[str]:
+        live = self.live
+        found = [flag for flag in self.scanner.scan(resp) if flag in live]
+        if self.dirty:
+            self.automaton, self.dirty = AhoCorasick(self.irregular), False
+        if self.automaton: found += self.automaton.findall(resp)
+        return found
+
+    def filter(self, resp: str) -> str:
+        """Response as it may leave the service"""
+        self.checked += 1
+        if not (found := self.leaks(resp)): return resp
+        self.leaked += 1
+        if self.on_leak is not None: self.on_leak(resp, found)
+        if self.mode == "block": return self.blocked
+        if self.mode == "redact":
+            for flag in found:
+                resp = resp.replace(flag, "*" * len(flag))
+        return resp
+
+    def stats(self) -> dict[str, int]:
+        return {"live": len(self), "ticks": len(self.ticks), "checked": self.checked, "leaked": self.leaked}
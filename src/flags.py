@@ -0,0 +1,138 @@
+from collections import deque
+from struct import Struct
+from sys import getsizeof
+from typing import Iterator, NamedTuple
+
+FLAG_SIZE = 16 # bytes of a flag and of a username
+HEADER = Struct("!HH") # pair and tick modulo 2**16 at the start of every flag
+MAX_TEAMS = 256 # pairs have to fit into the header
+MAX_WINDOW = 0xFFFF # ticks are told apart by their number modulo 2**16
+
+
+def encode_flag(flag: str) -> bytes | None:
+    """16 bytes of a flag{<32 hex digits>}, None for anything else"""
+    if len(flag) != 38 or flag[:5] != "flag{" or flag[37] != "}": return None
+    try:
+        raw = bytes.fromhex(flag[5:37])
+    except ValueError:
+        return None
+    return raw if len(raw) == FLAG_SIZE else None # fromhex skips whitespace
+
+
+def decode_flag(raw: bytes) -> str:
+    return f"flag{{{raw.hex()}}}"
+
+
+class FlagInfo(NamedTuple):
+    attacker: str
+    defender: str
+    tick: int
+    username: str
+
+
+class Tick:
+    """Flags and usernames of one tick as 16 byte slots, pair attacker * teams + defender"""
+    __slots__ = ("number", "teams", "flags", "usernames")
+
+    def __init__(self, number: int, teams: int, flags: bytes, usernames: bytes):
+        self.number = number
+        self.teams = teams
+        self.flags = flags
+        self.usernames = usernames
+
+    def flag(self, pair: int) -> bytes:
+        return self.flags[pair * FLAG_SIZE:(pair + 1) * FLAG_SIZE]
+
+    def username(self, pair: int) -> str:
+        return self.usernames[pair * FLAG_SIZE:(pair + 1) * FLAG_SIZE].hex()
+
+
+class FlagStore:
+    """Flags of the last `window` ticks for every attacker:defender pair of teams.
+
+    Teams are numbered in the order they were added. A tick keeps all its flags and usernames in
+    two bytes objects, so a new tick replaces the oldest one by dropping a single object. The
+    first 4 of the 16 random bytes of a flag are overwritten with its pair and tick, a submitted
+    flag is validated by comparing it with the flag in that slot, without any index.
+    """
+
+    def __init__(self, window: int = 5):
+        if window is None or not 1 <= window <= MAX_WINDOW:
+            raise ValueError(f"Flags stay valid for 1 to {MAX_WINDOW} ticks, the header only holds the tick modulo 2**16!")
+        self.window = window # ticks a flag stays valid
+        self.names: list[str] = []
+        self.ids: dict[str, int] = {}
+        self.ticks: deque[Tick] = deque(maxlen = window)
+        self.count = 0 # ticks ever added
+
+    def add_team(self, name: str) -> int:
+        if (id := self.ids.get(name)) is None:
+            if len(self.names) >= MAX_TEAMS: raise ValueError(f"At most {MAX_TEAMS} teams fit into the flags!")
+            id = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return id
+
+    def add_tick(self, random: bytes, usernames: bytes) -> Tick:
+        """random and usernames hold 16 bytes for every pair of the current teams"""
+        teams = len(self.names)
+        if len(random) != len(usernames) or len(random) != teams * teams * FLAG_SIZE:
+            raise ValueError(f"A tick of {teams} teams needs {teams * teams * FLAG_SIZE} random bytes for flags and usernames!")
+        flags, number = bytearray(random), self.count & 0xFFFF
+        for pair in range(teams * teams):
+            HEADER.pack_into(flags, pair * FLAG_SIZE, pair, number)
+        tick = Tick(self.count, teams, bytes(flags), usernames)
+        self.ticks.append(tick) # drops the oldest tick once the window is full
+        self.count += 1
+        return tick
+
+    def __len__(self):
+        return len(self.ticks)
+
+    def __iter__(self) -> Iterator[Tick]:
+        return iter(self.ticks)
+
+    def locate(self, flag: str) -> tuple[Tick, int] | None:
+        """Tick and pair the flag was issued for, None for invalid or expired flags"""
+        if (raw := encode_flag(flag)) is None or not self.ticks: return None
+        pair, number = HEADER.unpack_from(raw)
+        age = (self.ticks[-1].number - number) & 0xFFFF
+        if age >= len(self.ticks): return None # expired or never issued
+        tick = self.ticks[-1 - age]
+        if pair >= tick.teams * tick.teams or tick.flag(pair) != raw or flag != decode_flag(raw): return None # issued flags are lowercase
+        return tick, pair
+
+    def lookup(self, flag: str) -> FlagInfo | None:
+        if (found := self.locate(flag)) is None: return None
+        tick, pair = found
+        attacker, defender = divmod(pair, tick.teams)
+        return FlagInfo(self.names[attacker], self.names[defender], tick.number, tick.username(pair))
+
+    def position(self, number: int) -> int:
+        """Index in the window of the tick with that number, negative numbers count back from the latest tick"""
+        number = number + self.count if number < 0 else number
+        if not self.ticks or not 0 <= (index := number - self.ticks[0].number) < len(self.ticks):
+            raise IndexError(f"Tick {number} is not in the window of the last {len(self.ticks)} ticks!")
+        return index
+
+    def flag(self, attacker: str, defender: str, index: int = -1) -> str:
+        """Flag of the pair in the index-th tick of the window"""
+        atk, dev = self.ids[attacker], self.ids[defender]
+        tick = self.ticks[index]
+        if max(atk, dev) >= tick.teams: raise KeyError(f"{attacker} or {defender} joined after tick {tick.number}!")
+        return decode_flag(tick.flag(atk * tick.teams + dev))
+
+    def username(self, attacker: str, defender: str, index: int = -1) -> str:
+        """Username of the pair in the index-th tick of the window"""
+        atk, dev = self.ids[attacker], self.ids[defender]
+        tick = self.ticks[index]
+        if max(atk, dev) >= tick.teams: raise KeyError(f"{attacker} or {defender} joined after tick {tick.number}!")
+        return tick.username(atk * tick.teams + dev)
+
+    def usernames(self, attacker: str, defender: str) -> list[str]:
+        """Usernames of the pair in all ticks of the window, ticks before a team joined are skipped"""
+        atk, dev = self.ids[attacker], self.ids[defender]
+        return [tick.username(atk * tick.teams + dev) for tick in self.ticks if atk < tick.teams and dev < tick.teams]
+
+    def memory(self) -> int:
+        """Bytes used by the ticks in the window"""
+        return sum(getsizeof(tick) + getsizeof(tick.flags) + getsizeof(tick.usernames) for tick in self.ticks)
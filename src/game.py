@@ -1,29 +1,156 @@
-
+from concurrent.futures import Future, wait
 from dataclasses import dataclass, field
-from uuid import uuid4
+from os import urandom
+from queue import SimpleQueue
+from threading import Thread
+from time import perf_counter
+from typing import Iterable
 
+from src.flags import FLAG_SIZE, FlagInfo, FlagStore, Tick, decode_flag
 from src.man import Team
+from src.scoreboard import Scoreboard
+from src.submission import FlagSubmission
+
+
+@dataclass
+class Placement:
+    """How placing the flags of a tick on one team went"""
+    team: str
+    flags: int = 0 # placed
+    latency: float = 0.0
+    error: str = None
+    timed_out: bool = False
+
+
+class PlaceWorker:
+    """Long-lived daemon thread placing the flags of one team, a hung team never blocks the exit"""
+
+    def __init__(self, name: str):
+        self.jobs: SimpleQueue = SimpleQueue()
+        self.thread = Thread(target=self._run, name=f"place-flags-{name}", daemon=True)
+        self.thread.start()
+
+    def submit(self, func, *args) -> Future:
+        future = Future()
+        self.jobs.put((future, func, args))
+        return future
+
+    def _run(self):
+        while (job := self.jobs.get()) is not None:
+            future, func, args = job
+            if not future.set_running_or_notify_cancel(): continue
+            try:
+                future.set_result(func(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def close(self):
+        self.jobs.put(None)
 
 
 @dataclass
 class Gameserver:
     teams: dict[str, Team] = field(default_factory=dict)
-    flags: list[dict[(str, str), (str, str)]] = field(default_factory=list) # each gametick one flag is generated for every Team:Team pair
     flag_regex: str = field(default="flag{[0-9a-f]{32}}")
+    flag_window: int = 5 # ticks a flag stays valid, at most MAX_WINDOW
+    place_timeout: float = 5.0 # seconds a tick waits for the flags to be placed
+    scoreboard: Scoreboard = field(default_factory=Scoreboard, repr=False)
+    submit_rate: float | None = 1000.0 # flags per second a team may submit, None for no limit
+    submit_burst: int = 20000
+    submission: FlagSubmission = field(init=False, repr=False) # shared by all ways of submitting flags
+    store: FlagStore = field(init=False, repr=False) # each gametick one flag is generated for every Team:Team pair, replaces the list of all flags
+    placements: dict[str, Placement] = field(init=False, default_factory=dict, repr=False) # of the last tick
+
+    def __post_init__(self):
+        self.store = FlagStore(self.flag_window)
+        self.submission = FlagSubmission(self, self.submit_rate, self.submit_burst)
+        for name in self.teams:
+            self.store.add_team(name)
+            self.scoreboard.add_team(name)
+        self._workers: dict[str, PlaceWorker] = {} # one thread per team, so a slow team never delays another
+        self._placing: dict[str, Future] = {}
 
-    def generate_flags(self):
-        newflags = {(atk, dev): (uuid4().hex, f"flag{{{uuid4().hex}}}") for atk in self.teams for dev in self.teams}
-        for (_, dev), (username, flag) in newflags.items():
-            self.teams[dev].manServer.place_flag(username, flag)
-        self.flags.append(newflags)
+    def __enter__(self) -> "Gameserver":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Stops the threads placing flags, once they are done with their current team"""
+        for worker in self._workers.values():
+            worker.close()
+        self._workers.clear()
+
+    def generate_flags(self, timeout: float = None) -> dict[str, Placement]:
+        """Starts a new tick and places its flags, see rotate_flags and place_flags"""
+        return self.place_flags(self.rotate_flags(), timeout)
+
+    def rotate_flags(self) -> Tick:
+        """Draws the flags and usernames of a new tick, the oldest tick leaves the window"""
+        pairs = len(self.teams) ** 2
+        random = urandom(2 * pairs * FLAG_SIZE)
+        for team in self.teams.values():
+            team.manServer.new_tick()
+        tick = self.store.add_tick(random[:pairs * FLAG_SIZE], random[pairs * FLAG_SIZE:])
+        self.scoreboard.new_tick(tick.number)
+        return tick
+
+    def place_flags(self, tick: Tick, timeout: float = None) -> dict[str, Placement]:
+        """Places the flags of the tick on all teams at once, returns when all are placed or after the timeout.
+
+        Teams that are still busy with the flags of an earlier tick are skipped.
+        """
+        teams, pairs = list(self.teams.values())[:tick.teams], tick.teams ** 2
+        self.placements, futures = {}, {}
+        for dev, team in enumerate(teams):
+            if (running := self._placing.get(team.name)) is not None and not running.done():
+                self.placements[team.name] = Placement(team.name, error="still placing the flags of an earlier tick", timed_out=True)
+                continue
+            flags = [(tick.username(pair), decode_flag(tick.flag(pair))) for pair in range(dev, pairs, tick.teams)]
+            if (worker := self._workers.get(team.name)) is None:
+                worker = self._workers[team.name] = PlaceWorker(team.name)
+            futures[team.name] = self._placing[team.name] = worker.submit(self._place, team, flags)
+        timeout = self.place_timeout if timeout is None else timeout
+        wait(futures.values(), timeout)
+        for name, future in futures.items():
+            self.placements[name] = future.result() if future.done() else Placement(name, latency=timeout, timed_out=True)
+        for name, placement in self.placements.items():
+            self.scoreboard.sla(name, placement.error is None and not placement.timed_out)
+        return self.placements
+
+    @staticmethod
+    def _place(team: Team, flags: list[tuple[str, str]]) -> Placement:
+        placement, start = Placement(team.name), perf_counter()
+        try:
+            for username, flag in flags:
+                team.manServer.place_flag(username, flag)
+                placement.flags += 1
+        except Exception as e:
+            placement.error = f"{type(e).__name__}: {e}"
+        placement.latency = perf_counter() - start
+        return placement
 
     def add_team(self, team: Team):
         self.teams[team.name] = team
-        
-    def usernames(self, attacker: Team, defender: Team, index: int = None) -> list[str]:
-        name = lambda d: d[(attacker.name, defender.name)][0]
-        return [name(d) for d in self.flags] if index is None else name(self.flags[index])
+        self.store.add_team(team.name)
+        self.scoreboard.add_team(team.name)
+
+    def usernames(self, attacker: Team, defender: Team, index: int = None) -> list[str] | str:
+        """Username of the pair in tick `index`, negative indices count back from the latest tick like before.
+        Without index, the usernames of all ticks whose flags are still valid. Older ticks raise an IndexError."""
+        if index is None: return self.store.usernames(attacker.name, defender.name)
+        return self.store.username(attacker.name, defender.name, self.store.position(index))
+
+    def flag(self, attacker: Team, defender: Team, index: int = -1) -> str:
+        """Flag of the pair in tick `index`, indexed like usernames"""
+        return self.store.flag(attacker.name, defender.name, self.store.position(index))
 
     def check_flag(self, attacker: Team, defender: Team, flag: str) -> bool:
-        flags = [d[(attacker.name,defender.name)][1] for d in self.flags]
-        return flag in flags
\ No newline at end of file
+        info = self.store.lookup(flag)
+        return info is not None and info.attacker == attacker.name and info.defender == defender.name
+
+    def check_flags(self, attacker: Team, flags: Iterable[str]) -> list[FlagInfo | None]:
+        """Who the flags were stolen from and when, None for flags that are invalid for the attacker"""
+        lookup, name = self.store.lookup, attacker.name
+        return [info if (info := lookup(flag)) is not None and info.attacker == name else None for flag in flags]
\ No newline at end of file
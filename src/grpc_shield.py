@@ -0,0 +1,186 @@
+"""SHIELD for gRPC services.
+
+ShieldInterceptor captures every call of a grpc.aio server into a ShieldMAN: the method name is
+the path, the request fields flattened with dotted names are the params and the text format of
+the response, or of all streamed responses line by line, is the response. GrpcMAN answers
+Messages by calling a gRPC service, so attacks captured this way can be replayed with AttackPlans,
+the ExploitRunner or generated scripts.
+
+    server = grpc.aio.server(interceptors=[ShieldInterceptor(shield)])
+    target = Team("target", None, GrpcMAN(grpc.insecure_channel("localhost:50051"), message_board_pb2.DESCRIPTOR.services_by_name["MessageBoard"]))
+"""
+from inspect import isasyncgenfunction, iscoroutinefunction
+from uuid import uuid4
+
+import grpc
+from google.protobuf import message_factory, text_format
+from google.protobuf.descriptor import FieldDescriptor, ServiceDescriptor
+from google.protobuf.message import Message as Protobuf
+
+from src.server import Message
+from src.shield import ShieldMAN
+
+
+def _repeated(field: FieldDescriptor) -> bool:
+    if hasattr(field, "is_repeated"): return field.is_repeated
+    return field.label == FieldDescriptor.LABEL_REPEATED # protobuf < 5.29, label is gone in 7
+
+
+def flatten(proto: Protobuf, prefix: str = "") -> dict[str, str]:
+    """Set fields of a protobuf as params, nested messages with dotted names"""
+    params = {}
+    for field, value in proto.ListFields():
+        if field.type == FieldDescriptor.TYPE_MESSAGE and not _repeated(field):
+            params.update(flatten(value, f"{prefix}{field.name}."))
+        else:
+            params[prefix + field.name] = str(value)
+    return params
+
+
+def _convert(field: FieldDescriptor, value: str):
+    if field.type == FieldDescriptor.TYPE_BOOL: return value == "True"
+    if field.type in (FieldDescriptor.TYPE_FLOAT, FieldDescriptor.TYPE_DOUBLE): return float(value)
+    if field.type == FieldDescriptor.TYPE_BYTES: return value.encode()
+    if field.type == FieldDescriptor.TYPE_STRING: return value
+    return int(value)
+
+
+def unflatten(cls: type[Protobuf], params: dict[str, str]) -> Protobuf:
+    """Inverse of flatten for requests without repeated fields"""
+    proto = cls()
+    for key, value in params.items():
+        *path, name = key.split(".")
+        target = proto
+        for part in path:
+            target = getattr(target, part)
+        setattr(target, name, _convert(target.DESCRIPTOR.fields_by_name[name], value))
+    return proto
+
+
+def serialize(proto: Protobuf) -> str:
+    return text_format.MessageToString(proto, as_one_line = True)
+
+
+def _message_class(descriptor) -> type[Protobuf]:
+    if hasattr(message_factory, "GetMessageClass"): return message_factory.GetMessageClass(descriptor)
+    return message_factory.MessageFactory().GetPrototype(descriptor) # protobuf < 4.21
+
+
+class ShieldInterceptor(grpc.aio.ServerInterceptor):
+    """Captures unary and server streaming calls, calls of other kinds pass through untouched.
+
+    Handlers keep their kind, synchronous handlers still run on the server's executor. Start the
+    pipeline of the ShieldMAN to keep the analysis off the call path.
+    """
+
+    def __init__(self, shield: ShieldMAN):
+        self.shield = shield
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None: return None
+        path = handler_call_details.method.rpartition("/")[2]
+        if handler.unary_unary is not None:
+            return grpc.unary_unary_rpc_method_handler(self._unary(path, handler.unary_unary),
+                request_deserializer = handler.request_deserializer, response_serializer = handler.response_serializer)
+        if handler.unary_stream is not None:
+            return grpc.unary_stream_rpc_method_handler(self._stream(path, handler.unary_stream),
+                request_deserializer = handler.request_deserializer, response_serializer = handler.response_serializer)
+        return handler
+
+    def record(self, path: str, request: Protobuf, resp: str):
+        self.shield.record(Message(path, flatten(request)), resp)
+
+    @staticmethod
+    def error(e: Exception, context) -> str:
+        """Status of the failed call as GrpcMAN reports it, so captured and replayed errors match"""
+        code = context.code() if hasattr(context, "code") else None # the context of sync servicers has none
+        if code is not None: return f"{code}: {context.details()}"
+        return f"{type(e).__name__}: {e}"
+
+    def _unary(self, path: str, behavior):
+        if iscoroutinefunction(behavior):
+            async def unary(request, context):
+                try:
+                    response = await behavior(request, context)
+                except Exception as e:
+                    self.record(path, request, self.error(e, context))
+                    raise
+                self.record(path, request, serialize(response))
+                return response
+            return unary
+
+        def unary(request, context):
+            try:
+                response = behavior(request, context)
+            except Exception as e:
+                self.record(path, request, self.error(e, context))
+                raise
+            self.record(path, request, serialize(response))
+            return response
+        return unary
+
+    def _stream(self, path: str, behavior):
+        if isasyncgenfunction(behavior):
+            async def stream(request, context):
+                lines = []
+                try:
+                    async for response in behavior(request, context):
+                        lines.append(serialize(response))
+                        yield response
+                except Exception as e:
+                    lines.append(self.error(e, context))
+                    raise
+                finally:
+                    self.record(path, request, "\n".join(lines))
+            return stream
+
+        def stream(request, context):
+            lines = []
+            try:
+                for response in behavior(request, context):
+                    lines.append(serialize(response))
+                    yield response
+            except Exception as e:
+                lines.append(self.error(e, context))
+                raise
+            finally:
+                self.record(path, request, "\n".join(lines))
+        return stream
+
+
+class GrpcMAN:
+    """Answers Messages by calling the methods of a gRPC service over a synchronous channel"""
+
+    def __init__(self, channel: grpc.Channel, service: ServiceDescriptor):
+        self.channel = channel
+        self.service = service
+        self.methods = {}
+        for method in service.methods:
+            request, response = _message_class(method.input_type), _message_class(method.output_type)
+            call = (channel.unary_stream if method.server_streaming else channel.unary_unary)(
+                f"/{service.full_name}/{method.name}", request_serializer = request.SerializeToString, response_deserializer = response.FromString)
+            self.methods[method.name] = (request, call, method.server_streaming)
+
+    def response(self, msg: Message) -> str:
+        if msg.path not in self.methods: return "site not found"
+        request, call, streaming = self.methods[msg.path]
+        try:
+            if streaming: return "\n".join(serialize(response) for response in call(unflatten(request, msg.param)))
+            return serialize(call(unflatten(request, msg.param)))
+        except grpc.RpcError as e:
+            return f"{e.code()}: {e.details()}"
+
+    def place_flag(self, username: str, flag: str):
+        """Stores the flag on a private board named after the user, like MessageBoardClient.write_flag"""
+        password = uuid4().hex
+        self.response(Message("register", {"username": username, "password": password}))
+        cookie = self.response(Message("login", {"username": username, "password": password}))
+        cookie = text_format.Parse(cookie, _message_class(self.service.methods_by_name["login"].output_type)()).text
+        auth = {"auth.boardid": username, "auth.cookie": cookie}
+        self.response(Message("create", {**auth, "boardname": username, "public": "False"}))
+        self.response(Message("write", {**auth, "text": flag}))
+        self.response(Message("logout", {"text": cookie}))
+
+    def new_tick(self):
+        pass
@@ -0,0 +1,64 @@
+"""gRPC service of the FlagSubmission.
+
+A team streams FlagBatches and gets a Verdicts message for every batch, one Verdict per flag in
+the order of the batch. The team is never taken from the payload: every stream sends the secret
+token of its team as `team-token` metadata, streams without a known token are aborted as
+UNAUTHENTICATED. Rate limits are kept per authenticated team. The protos are built by build.sh,
+the service runs next to the game loop:
+
+    tokens = {secrets.token_hex(16): team.name for team in game.teams.values()} # handed out to the teams
+    await asyncio.gather(serve(game, tokens), TickScheduler(game, runners = runners).run())
+"""
+import logging
+from time import perf_counter
+from typing import AsyncIterator
+
+import grpc
+
+from src.game import Gameserver
+from src.metrics import metrics
+from src.protos.flag_submission.flag_submission_pb2 import FlagBatch, Verdict, Verdicts
+from src.protos.flag_submission.flag_submission_pb2_grpc import FlagSubmissionServicer, add_FlagSubmissionServicer_to_server
+from src.submission import FlagSubmission
+
+logger = logging.getLogger(__name__)
+
+TOKEN_KEY = "team-token"
+
+
+class FlagSubmissionService(FlagSubmissionServicer):
+
+    def __init__(self, submission: FlagSubmission, tokens: dict[str, str]):
+        super().__init__()
+        self.submission = submission
+        self.tokens = tokens # secret token: team name
+
+    def team(self, context: grpc.aio.ServicerContext) -> str | None:
+        """Team the stream authenticated as with its metadata"""
+        token = next((value for key, value in context.invocation_metadata() or () if key == TOKEN_KEY), None)
+        return self.tokens.get(token) if isinstance(token, str) else None
+
+    async def submit(self, requests: AsyncIterator[FlagBatch], context: grpc.aio.ServicerContext) -> AsyncIterator[Verdicts]:
+        if (team := self.team(context)) is None:
+            logger.warning("unauthenticated submission from %s", context.peer())
+            await context.abort(grpc.StatusCode.UNAUTHENTICATED, f"Send the token of your team as {TOKEN_KEY} metadata!")
+        async for batch in requests:
+            start = perf_counter()
+            try:
+                verdicts = self.submission.submit(team, batch.flags)
+            except KeyError as e:
+                logger.warning("submission of team %r, which is not in the game", team)
+                await context.abort(grpc.StatusCode.NOT_FOUND, str(e))
+            yield Verdicts(verdicts=[Verdict(flag=flag, status=status, defender=info.defender, tick=info.tick) if info else Verdict(flag=flag, status=status)
+                                     for flag, (status, info) in zip(batch.flags, verdicts)])
+            metrics.observe("submission:batch", perf_counter() - start)
+
+
+async def serve(game: Gameserver, tokens: dict[str, str], address: str = "[::]:50052"):
+    """Serves the FlagSubmission of the game to the teams of the tokens, rate limits are set on the Gameserver"""
+    server = grpc.aio.server()
+    add_FlagSubmissionServicer_to_server(FlagSubmissionService(game.submission, tokens), server)
+    server.add_insecure_port(address)
+    await server.start()
+    logger.info("flag submission listening on %s", address)
+    await server.wait_for_termination()
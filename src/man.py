@@ -15,6 +15,10 @@ class MAN:
     def place_flag(self, username: str, flag: str):
         self.server.passwords[username] = uuid4()
         self.server.messages[username] = flag
+
+    def new_tick(self):
+        """Called by the game server before the flags of a new tick are placed"""
+        pass
     
 @dataclass
 class Team:
@@ -2,6 +2,7 @@ import asyncio
 from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
+from inspect import isasyncgenfunction, iscoroutinefunction, unwrap
 import logging
 from logging import DEBUG, INFO, WARNING, ERROR, CRITICAL
 from time import sleep
@@ -50,7 +51,42 @@ def setup_logger(fileLevel=logging.INFO, outLevel=logging.DEBUG, errLevel=loggin
     logging.info("Logger setup completed")
 
 
+STATUS = {Unauthenticated: (grpc.StatusCode.UNAUTHENTICATED, "Unauthenticated"),
+          InvalidArgument: (grpc.StatusCode.INVALID_ARGUMENT, "Invalid argument"),
+          NotFound: (grpc.StatusCode.NOT_FOUND, "Not found"),
+          PermissionDenied: (grpc.StatusCode.PERMISSION_DENIED, "Permission denied")}
+
+
+async def abort(self: "MessageBoardImpl", context, e: Exception):
+    if (status := STATUS.get(type(e))) is None:
+        self.logger.exception(f"{type(e).__name__}: {str(e)}")
+        raise e
+    code, message = status
+    self.logger.warning(message)
+    await context.abort(code, str(e))
+
+
 def wrap_exceptions(func):
+    original = unwrap(func) # log and null wrap the handler without changing its kind
+    if isasyncgenfunction(original):
+        @wraps(func)
+        async def stream(self: "MessageBoardImpl", request, context):
+            try:
+                async for resp in func(self, request, context):
+                    yield resp
+            except Exception as e:
+                await abort(self, context, e)
+        return stream
+
+    if iscoroutinefunction(original):
+        @wraps(func)
+        async def call(self: "MessageBoardImpl", request, context):
+            try:
+                return await func(self, request, context) or Empty()
+            except Exception as e:
+                await abort(self, context, e)
+        return call
+
     @wraps(func)
     def wrapper(self: "MessageBoardImpl", request, context):
         try:
@@ -286,11 +322,55 @@ class MessageBoardImpl(MessageBoardServicer):
         self.boards[boardid] = Board(boardname, username, public)
 
 
-async def serve():
+def async_handler(name: str, stream: bool = False):
+    """Runs a MessageBoardImpl handler as coroutine, streams send a copy taken before the first await"""
+    handler = getattr(MessageBoardImpl, name).__wrapped__ # with its log and null checks, errors are handled by wrap_exceptions below
+
+    if stream:
+        async def call(self: "MessageBoardImpl", request, context):
+            for resp in list(handler(self, request, context)):
+                yield resp
+    else:
+        async def call(self: "MessageBoardImpl", request, context):
+            return handler(self, request, context)
+
+    call.__name__ = call.__qualname__ = name
+    return wrap_exceptions(call)
+
+
+class AsyncMessageBoardImpl(MessageBoardImpl):
+    """MessageBoardImpl whose handlers run on the event loop of the grpc.aio server.
+
+    No thread pool caps the calls in flight. None of the handlers awaits, so each one runs to its
+    end before the next starts and the dicts and boards need no locks. Streamed reads send a copy
+    of the messages, writes that arrive while a stream is sent do not change it.
+    """
+    register = async_handler("register")
+    login = async_handler("login")
+    logout = async_handler("logout")
+    get_count = async_handler("get_count")
+    read = async_handler("read", stream=True)
+    read_all = async_handler("read_all", stream=True)
+    write = async_handler("write")
+    create = async_handler("create")
+    delete = async_handler("delete")
+    add_owner = async_handler("add_owner")
+    add_reader = async_handler("add_reader")
+    remove_owner = async_handler("remove_owner")
+    remove_reader = async_handler("remove_reader")
+    rename = async_handler("rename")
+    get_name = async_handler("get_name")
+    exists = async_handler("exists")
+
+
+async def serve(interceptors: list[grpc.aio.ServerInterceptor] = None, servicer: MessageBoardImpl = None, address: str = '[::]:50051'):
     logging.info("server setup")
-    server = grpc.aio.server(ThreadPoolExecutor(max_workers=10))
-    add_MessageBoardServicer_to_server(MessageBoardImpl(), server)
-    server.add_insecure_port('[::]:50051')
+    servicer = AsyncMessageBoardImpl() if servicer is None else servicer
+    # synchronous handlers are run by grpc in a thread pool
+    executor = None if isinstance(servicer, AsyncMessageBoardImpl) else ThreadPoolExecutor(max_workers=10)
+    server = grpc.aio.server(executor, interceptors=interceptors)
+    add_MessageBoardServicer_to_server(servicer, server)
+    server.add_insecure_port(address)
     try:
         logging.info("server starting")
         await server.start()
@@ -0,0 +1,163 @@
+from collections import Counter
+from contextlib import contextmanager
+from cProfile import Profile
+from functools import wraps
+import json
+from math import frexp
+from pstats import Stats
+import sys
+from threading import Event, Lock, Thread, get_ident
+from time import perf_counter
+
+
+class Histogram:
+    """Latency histogram with power of two buckets, cheap enough for every message"""
+
+    def __init__(self):
+        self.buckets: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        exp = frexp(seconds)[1] # seconds < 2**exp
+        self.buckets[exp] = self.buckets.get(exp, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min: self.min = seconds
+        if seconds > self.max: self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th quantile"""
+        rank, seen = q * self.count, 0
+        for exp in sorted(self.buckets):
+            seen += self.buckets[exp]
+            if seen >= rank: return min(2.0 ** exp, self.max)
+        return self.max
+
+    def snapshot(self) -> dict[str, float]:
+        if not self.count: return {"count": 0}
+        return {"count": self.count, "total": self.total, "mean": self.total / self.count, "min": self.min, "max": self.max,
+                "p50": self.percentile(0.5), "p90": self.percentile(0.9), "p99": self.percentile(0.99)}
+
+
+class Sampler:
+    """Samples the innermost frames of all threads in the background"""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self.lock = Lock()
+        self.stopped = Event()
+        self.thread = Thread(target = self.run, name = "metrics-sampler", daemon = True)
+        self.thread.start()
+
+    def run(self):
+        own = get_ident()
+        while not self.stopped.wait(self.interval):
+            frames = [f"{frame.f_code.co_filename}:{frame.f_lineno}({frame.f_code.co_name})"
+                      for ident, frame in sys._current_frames().items() if ident != own]
+            with self.lock:
+                self.samples.update(frames)
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+
+class Metrics:
+    """Per-stage latency histograms, counters and opt-in profilers of the SHIELD pipeline.
+
+    Stages are observed from the request path, the pipeline worker and the event loop at once, so
+    recording, snapshots and resets hold `lock`."""
+
+    def __init__(self):
+        self.started = perf_counter()
+        self.stages: dict[str, Histogram] = {}
+        self.counters: Counter[str] = Counter()
+        self.profiler: Profile = None
+        self.profile: list[dict] = []
+        self.sampler: Sampler = None
+        self.samples: Counter[str] = Counter()
+        self.lock = Lock()
+
+    def observe(self, stage: str, seconds: float):
+        with self.lock:
+            if (hist := self.stages.get(stage)) is None:
+                hist = self.stages[stage] = Histogram()
+            hist.observe(seconds)
+
+    def count(self, counter: str, amount: int = 1):
+        with self.lock:
+            self.counters[counter] += amount
+
+    @contextmanager
+    def timer(self, stage: str):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, perf_counter() - start)
+
+    def timed(self, stage: str):
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                start = perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(stage, perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def start_profile(self):
+        """cProfile of the calling thread until stop_profile()"""
+        if self.profiler is None:
+            self.profiler = Profile()
+            self.profiler.enable()
+
+    def stop_profile(self, top: int = 30) -> list[dict]:
+        if self.profiler is None: return self.profile
+        self.profiler.disable()
+        stats = Stats(self.profiler)
+        rows = sorted(stats.stats.items(), key = lambda item: item[1][3], reverse = True)[:top] # by cumulative time
+        self.profile = [{"function": f"{file}:{line}({name})", "calls": nc, "total": tt, "cumulative": ct}
+                        for (file, line, name), (cc, nc, tt, ct, _) in rows]
+        self.profiler = None
+        return self.profile
+
+    def start_sampling(self, interval: float = 0.005):
+        """Statistical profile of all threads until stop_sampling()"""
+        if self.sampler is None:
+            self.sampler = Sampler(interval)
+
+    def stop_sampling(self) -> Counter[str]:
+        if self.sampler is None: return Counter()
+        self.sampler.stop()
+        self.samples, self.sampler = self.sampler.samples, None
+        return self.samples
+
+    def snapshot(self, top: int = 30) -> dict:
+        if (sampler := self.sampler) is not None:
+            with sampler.lock: samples = sampler.samples.most_common(top)
+        else: samples = self.samples.most_common(top)
+        with self.lock:
+            return {"uptime": perf_counter() - self.started,
+                    "counters": dict(self.counters),
+                    "stages": {stage: hist.snapshot() for stage, hist in self.stages.items()},
+                    "profile": self.profile,
+                    "samples": dict(samples)}
+
+    def dump(self, **kwargs) -> str:
+        return json.dumps(self.snapshot(), **kwargs)
+
+    def reset(self):
+        with self.lock:
+            self.started = perf_counter()
+            self.stages.clear()
+            self.counters.clear()
+
+
+metrics = Metrics() # shared by all SHIELD components
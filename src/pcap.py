@@ -0,0 +1,363 @@
+"""Mines attacks from pcap and pcapng dumps.
+
+Dumps are memory-mapped and walked packet by packet, headers are unpacked in place and only the
+payload of TCP segments is copied. TCP streams are reassembled per direction and split into
+turns like in the TcpProxy: what the client sent until the server answered is the `data` param
+of a Message on path "tcp", the answer until the client sends again its response.
+
+With several workers, every worker walks all dumps but only reassembles the flows hashed to its
+shard, so flows never have to be moved between processes and attacks are mined where their
+traffic is. Results are written as json lines like by src.analyze.
+
+    python -m src.pcap dump.pcap [more.pcapng ...] --port 8080 --workers 8 --out attacks.jsonl
+"""
+from argparse import ArgumentParser
+from contextlib import nullcontext
+import json
+from math import inf
+from multiprocessing import Pool
+import os
+from struct import Struct, error as StructError
+import sys
+from time import perf_counter
+from typing import Callable, Iterable, Iterator
+from zlib import crc32
+
+from src.analyze import analyse
+from src.capture_log import _map
+from src.game import Gameserver
+from src.server import Message
+from src.shield import Attack, ShieldMAN
+from src.tcp_proxy import ENCODING, TcpProxy
+
+MASK = 0xFFFFFFFF
+FIN, SYN, RST, ACK = 0x01, 0x02, 0x04, 0x10
+
+PCAP_MAGIC = {b"\xd4\xc3\xb2\xa1": ("<", 1e-6), b"\xa1\xb2\xc3\xd4": (">", 1e-6),
+              b"\x4d\x3c\xb2\xa1": ("<", 1e-9), b"\xa1\xb2\x3c\x4d": (">", 1e-9)}
+PCAPNG_SHB = 0x0A0D0D0A
+U16, U32 = Struct("!H"), Struct("!I")
+IPV4 = Struct("!BxHxxHxB2x4s4s") # version/ihl, total length, flags/fragment offset, protocol, source, destination
+IPV6 = Struct("!4xHBx16s16s") # payload length, next header, source, destination
+TCP = Struct("!2s2sI4xBB") # source port, destination port, sequence number, data offset, flags
+
+
+def packets(buf) -> Iterator[tuple[float, int, int, int]]:
+    """Timestamp, link type, offset and captured length of every packet of a pcap or pcapng dump"""
+    if len(buf) < 24: return
+    if buf[:4] in PCAP_MAGIC: yield from _pcap(buf)
+    elif U32.unpack_from(buf)[0] == PCAPNG_SHB: yield from _pcapng(buf)
+    else: raise ValueError("not a pcap or pcapng file")
+
+
+def _pcap(buf) -> Iterator[tuple[float, int, int, int]]:
+    order, unit = PCAP_MAGIC[bytes(buf[:4])]
+    linktype = Struct(order + "I").unpack_from(buf, 20)[0] & 0xFFFF
+    record = Struct(order + "IIII")
+    pos, end = 24, len(buf)
+    while pos + 16 <= end:
+        sec, frac, caplen, _ = record.unpack_from(buf, pos)
+        pos += 16
+        if pos + caplen > end: return # truncated dump
+        yield sec + frac * unit, linktype, pos, caplen
+        pos += caplen
+
+
+def _pcapng(buf) -> Iterator[tuple[float, int, int, int]]:
+    pos, end = 0, len(buf)
+    interfaces, timestamp = [], 0.0
+    block, packet, obsolete, u16 = Struct("<II"), Struct("<IIII"), Struct("<HHIII"), Struct("<H")
+    while pos + 12 <= end:
+        if U32.unpack_from(buf, pos)[0] == PCAPNG_SHB: # byte order of the section follows the type
+            order = "<" if buf[pos + 8:pos + 12] == b"\x4d\x3c\x2b\x1a" else ">"
+            block, packet, obsolete, u16 = Struct(order + "II"), Struct(order + "IIII"), Struct(order + "HHIII"), Struct(order + "H")
+            interfaces = []
+        kind, length = block.unpack_from(buf, pos)
+        if length < 12 or pos + length > end: return # corrupt or truncated dump
+        body = pos + 8
+        if kind == 1: # interface description
+            interfaces.append((u16.unpack_from(buf, body)[0], _resolution(buf, body + 8, pos + length - 4, u16.format[0])))
+        elif kind == 6: # enhanced packet
+            iface, high, low, caplen = packet.unpack_from(buf, body)
+            linktype, unit = interfaces[iface]
+            timestamp = ((high << 32) | low) * unit
+            yield timestamp, linktype, body + 20, caplen
+        elif kind == 3 and interfaces: # simple packet, captured length is bounded by the block
+            yield timestamp, interfaces[0][0], body + 4, min(block.unpack_from(buf, body)[0], length - 16)
+        elif kind == 2: # obsolete packet
+            iface, _, high, low, caplen = obsolete.unpack_from(buf, body)
+            linktype, unit = interfaces[iface]
+            timestamp = ((high << 32) | low) * unit
+            yield timestamp, linktype, body + 20, caplen
+        pos += length
+
+
+def _resolution(buf, pos: int, end: int, order: str) -> float:
+    option = Struct(order + "HH")
+    while pos + 4 <= end:
+        code, length = option.unpack_from(buf, pos)
+        if code == 0: break
+        if code == 9: # if_tsresol
+            value = buf[pos + 4]
+            return 2.0 ** -(value & 0x7F) if value & 0x80 else 10.0 ** -value
+        pos += 4 + (length + 3) // 4 * 4
+    return 1e-6
+
+
+def network(buf, linktype: int, pos: int, end: int) -> tuple[int, int]:
+    """Ethertype and offset of the network layer, ethertype 0 for unknown link types"""
+    if linktype == 1: # ethernet
+        ethertype, pos = U16.unpack_from(buf, pos + 12)[0], pos + 14
+        while ethertype in (0x8100, 0x88A8) and pos + 4 <= end: # vlan tags
+            ethertype, pos = U16.unpack_from(buf, pos + 2)[0], pos + 4
+        return ethertype, pos
+    if linktype in (101, 12, 14, 228, 229): # raw ip
+        return (0x86DD if buf[pos] >> 4 == 6 else 0x0800), pos
+    if linktype == 113: return U16.unpack_from(buf, pos + 14)[0], pos + 16 # linux cooked
+    if linktype == 276: return U16.unpack_from(buf, pos)[0], pos + 20 # linux cooked v2
+    if linktype == 0: # loopback, address family in host byte order
+        family = buf[pos] or buf[pos + 3]
+        return (0x0800 if family == 2 else 0x86DD if family in (10, 24, 28, 30) else 0), pos + 4
+    return 0, pos
+
+
+def segment(buf, linktype: int, pos: int, caplen: int) -> tuple[bytes, bytes, int, int, int, int] | None:
+    """Source and destination endpoints, sequence number, flags and payload bounds of a TCP segment"""
+    end = pos + caplen
+    try:
+        ethertype, pos = network(buf, linktype, pos, end)
+        if ethertype == 0x0800:
+            vihl, total, fragment, proto, src, dst = IPV4.unpack_from(buf, pos)
+            if proto != 6 or fragment & 0x3FFF: return None # fragments are not reassembled
+            end = min(end, pos + total) # ethernet padding
+            pos += (vihl & 0x0F) * 4
+        elif ethertype == 0x86DD:
+            length, proto, src, dst = IPV6.unpack_from(buf, pos)
+            if proto != 6: return None # extension headers are not followed
+            pos += 40
+            end = min(end, pos + length)
+        else: return None
+        sport, dport, seq, offset, flags = TCP.unpack_from(buf, pos)
+    except (IndexError, StructError): # truncated packet
+        return None
+    return src + sport, dst + dport, seq, flags, pos + (offset >> 4) * 4, end
+
+
+def endpoint(ep: bytes) -> str:
+    host = ".".join(map(str, ep[:4])) if len(ep) == 6 else ":".join(ep[i:i + 2].hex() for i in range(0, 16, 2))
+    return f"{host}:{int.from_bytes(ep[-2:], 'big')}"
+
+
+def shard_of(src: bytes, dst: bytes, shards: int) -> int:
+    """Same shard for both directions of a flow in every process"""
+    return crc32(src + dst if src < dst else dst + src) % shards
+
+
+class Stream:
+    """One direction of a TCP flow, delivers payload in sequence order"""
+    __slots__ = ("next", "pending", "pending_size", "fin")
+
+    def __init__(self):
+        self.next: int = None
+        self.pending: dict[int, bytes] = {}
+        self.pending_size = 0
+        self.fin = False
+
+    def accept(self, seq: int, payload: bytes, max_pending: int) -> bytes:
+        if self.next is None: self.next = seq # capture started mid flow
+        ahead = (seq - self.next) & MASK
+        if ahead >= 1 << 31: # retransmission, keep only what was not delivered yet
+            behind = (1 << 32) - ahead
+            if behind >= len(payload): return b""
+            payload, ahead = payload[behind:], 0
+        if ahead:
+            if self.pending_size + len(payload) <= max_pending:
+                self.pending[seq] = payload
+                self.pending_size += len(payload)
+                return b""
+            self.next = seq # segments got lost, skip the gap
+        data = [payload]
+        self.next = (self.next + len(payload)) & MASK
+        while (segment := self.pending.pop(self.next, None)) is not None:
+            self.pending_size -= len(segment)
+            data.append(segment)
+            self.next = (self.next + len(segment)) & MASK
+        return b"".join(data)
+
+    def rest(self) -> bytes:
+        """Everything still waiting for a segment that never came, in sequence order"""
+        rest = b"".join(self.pending[seq] for seq in sorted(self.pending, key = lambda seq: (seq - self.next) & MASK))
+        self.pending.clear()
+        self.pending_size = 0
+        return rest
+
+
+class Flow:
+    __slots__ = ("id", "client", "streams", "request", "response", "started", "last")
+
+    def __init__(self, id: str, client: bytes, timestamp: float):
+        self.id = id
+        self.client = client
+        self.streams = (Stream(), Stream()) # from the client, from the server
+        self.request = bytearray()
+        self.response = bytearray()
+        self.started = self.last = timestamp
+
+
+class Reassembler:
+    """Reassembles TCP flows and hands every request/response turn to on_turn(flow id, timestamp, request, response)"""
+
+    def __init__(self, on_turn: Callable[[str, float, bytes, bytes], object], ports: set[int] = None,
+                 idle_timeout: float = 60.0, max_turn: int = 1 << 20, max_pending: int = 1 << 20):
+        self.on_turn = on_turn
+        self.ports = {port.to_bytes(2, "big") for port in ports} if ports else None
+        self.idle_timeout = idle_timeout
+        self.max_turn = max_turn
+        self.max_pending = max_pending
+        self.flows: dict[tuple[bytes, bytes], Flow] = {}
+        self.turns = self.finished = 0
+
+    def packet(self, timestamp: float, src: bytes, dst: bytes, seq: int, flags: int, payload: bytes):
+        if self.ports is not None and src[-2:] not in self.ports and dst[-2:] not in self.ports: return
+        key = (src, dst) if src < dst else (dst, src)
+        flow = self.flows.get(key)
+        if flags & SYN and not flags & ACK and flow is not None and (flow.request or flow.response):
+            self.finish(key) # port reused by a new connection
+            flow = None
+        if flow is None:
+            if not (flags & SYN or payload): return # stray packet of a finished flow
+            flow = self.flows[key] = self.open(src, dst, flags, timestamp)
+        from_client = src == flow.client
+        stream = flow.streams[not from_client]
+        if flags & SYN:
+            stream.next = (seq + 1) & MASK
+        elif payload and (data := stream.accept(seq, payload, self.max_pending)):
+            self.collect(flow, data, from_client, timestamp)
+        flow.last = timestamp
+        if flags & RST: self.finish(key)
+        elif flags & FIN:
+            stream.fin = True
+            if flow.streams[from_client].fin: self.finish(key)
+
+    def open(self, src: bytes, dst: bytes, flags: int, timestamp: float) -> Flow:
+        """Whoever sent the SYN is the client, without one it is the side with the higher, ephemeral port"""
+        client = src if flags & SYN and not flags & ACK or src[-2:] > dst[-2:] else dst
+        server = dst if client == src else src
+        return Flow(f"{endpoint(client)}>{endpoint(server)}@{timestamp:.6f}", client, timestamp)
+
+    def collect(self, flow: Flow, data: bytes, from_client: bool, timestamp: float):
+        if from_client:
+            if flow.response: self.turn(flow)
+            if not flow.request: flow.started = timestamp
+            turn = flow.request
+        else: turn = flow.response
+        turn += data[:self.max_turn - len(turn)]
+
+    def turn(self, flow: Flow):
+        if not flow.request and not flow.response: return
+        self.on_turn(flow.id, flow.started, bytes(flow.request), bytes(flow.response))
+        flow.request.clear()
+        flow.response.clear()
+        self.turns += 1
+
+    def finish(self, key: tuple[bytes, bytes]):
+        flow = self.flows.pop(key)
+        for from_client, stream in zip((True, False), flow.streams):
+            if rest := stream.rest(): self.collect(flow, rest, from_client, flow.last)
+        self.turn(flow)
+        self.finished += 1
+
+    def expire(self, now: float):
+        """Finishes flows without packets for idle_timeout seconds"""
+        for key in [key for key, flow in self.flows.items() if now - flow.last > self.idle_timeout]:
+            self.finish(key)
+
+    def close(self):
+        for key in list(self.flows):
+            self.finish(key)
+
+
+def turns(paths: Iterable[str], shard: int = 0, shards: int = 1, ports: set[int] = None, idle_timeout: float = 60.0,
+          every: int = 65536, stats: dict = None) -> Iterator[tuple[float, Message, str]]:
+    """Timestamp, Message and response of every turn of the flows in the shard, in order of completion"""
+    done: list[tuple[float, Message, str]] = []
+    key = TcpProxy.session_key
+    reassembler = Reassembler(lambda flow, timestamp, request, response: done.append(
+        (timestamp, Message("tcp", {key: flow, "data": request.decode(ENCODING)}), response.decode(ENCODING))), ports, idle_timeout)
+    count = timestamp = 0
+    for path in paths:
+        buf = _map(path)
+        try:
+            for timestamp, linktype, pos, caplen in packets(buf):
+                count += 1
+                if (seg := segment(buf, linktype, pos, caplen)) is None: continue
+                src, dst, seq, flags, start, end = seg
+                if shards > 1 and shard_of(src, dst, shards) != shard: continue
+                reassembler.packet(timestamp, src, dst, seq, flags, buf[start:end] if end > start else b"")
+                if count % every == 0: reassembler.expire(timestamp)
+                if done:
+                    yield from done
+                    done.clear()
+        finally:
+            if hasattr(buf, "close"): buf.close()
+    reassembler.close()
+    yield from done
+    if stats is not None: stats.update(packets = count, flows = reassembler.finished, turns = reassembler.turns)
+
+
+def attacks(paths: Iterable[str], shield: ShieldMAN, shard: int = 0, shards: int = 1, ports: set[int] = None,
+            every: int = 1024, stats: dict = None) -> Iterator[Attack]:
+    """Attacks in the dumps, every flow is a session of the ShieldMAN, yielded once it went idle"""
+    shield.session_keys = shield.session_keys | {TcpProxy.session_key}
+    for n, (timestamp, msg, resp) in enumerate(turns(paths, shard, shards, ports, shield.idle_timeout, stats = stats), 1):
+        shield.capture(msg, resp, timestamp)
+        if n % every == 0:
+            yield from shield.pop_idle(timestamp)
+    yield from shield.pop_idle(inf)
+
+
+def mine(task: tuple) -> tuple[list[dict], dict]:
+    """Analyses the attacks of one shard, runs in a worker process"""
+    paths, shard, shards, ports, flag_regex, idle_timeout, everything = task
+    shield, stats = ShieldMAN(flag_regex, idle_timeout = idle_timeout), {}
+    results = []
+    for atk in attacks(paths, shield, shard, shards, ports, stats = stats):
+        if everything or atk.hasFlag:
+            results.append({**analyse(atk), "flow": dict(atk.messages[0].items())[TcpProxy.session_key]})
+    return results, stats
+
+
+def main(argv: list[str] = None):
+    parser = ArgumentParser(prog = "python -m src.pcap", description = "Extract attacks and generate scripts from pcap and pcapng dumps")
+    parser.add_argument("dumps", nargs = "+", help = "pcap or pcapng files, in capture order")
+    parser.add_argument("--port", type = int, action = "append", help = "service port, may be given multiple times, defaults to all")
+    parser.add_argument("--flag-regex", action = "append", help = "flag format, may be given multiple times")
+    parser.add_argument("--idle-timeout", type = float, default = 30.0, help = "seconds after which a session ends")
+    parser.add_argument("--workers", type = int, default = os.cpu_count(), help = "processes, each reassembles one shard of the flows")
+    parser.add_argument("--all", action = "store_true", help = "analyse attacks without flags too")
+    parser.add_argument("--out", default = None, help = "json lines output, defaults to stdout")
+    args = parser.parse_args(argv)
+
+    size = sum(os.path.getsize(path) for path in args.dumps)
+    tasks = [(args.dumps, shard, args.workers, set(args.port or ()) or None, args.flag_regex or Gameserver.flag_regex, args.idle_timeout, args.all)
+             for shard in range(args.workers)]
+    out = open(args.out, "w") if args.out else sys.stdout
+    start, count, flags, totals = perf_counter(), 0, 0, {}
+    try:
+        with Pool(args.workers) if args.workers > 1 else nullcontext() as pool:
+            for results, stats in pool.imap_unordered(mine, tasks) if pool else map(mine, tasks):
+                for result in results:
+                    out.write(json.dumps(result) + "\n")
+                    flags += len(result["flags"])
+                count += len(results)
+                for name, value in stats.items():
+                    totals[name] = totals.get(name, 0) + value
+    finally:
+        if out is not sys.stdout: out.close()
+    elapsed = perf_counter() - start
+    print(f"{count} attacks with {flags} flags from {totals.get('flows', 0)} flows and {totals.get('turns', 0)} turns "
+          f"in {elapsed:.2f}s, {size / elapsed / 1e6:.1f} MB/s", file = sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+from collections import deque
+from threading import Event, Lock, Thread
+from time import perf_counter, sleep
+from typing import Callable, Literal
+
+from src.server import Message
+
+
+class CapturePipeline:
+    """Bounded queue between the request path and the analysis of captured messages.
+
+    The request path appends (msg, resp, timestamp, wall) to a deque and counts it under one lock, so
+    concurrent requests never lose a count and join() waits for everything enqueued before it. A
+    worker thread pops the entries and hands them to the capture callback. If the worker falls behind
+    and maxsize entries are waiting, new entries are dropped or, with overflow="block", the request
+    path waits until there is space again. The timestamp is on the clock sessions are timed with,
+    wall is the time.time() the message was seen at.
+    """
+
+    def __init__(self, capture: Callable[[Message, str, float, float], object], maxsize: int = 65536,
+                 overflow: Literal["drop", "block"] = "drop", name: str = "shield-capture"):
+        self.capture = capture
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.queue: deque[tuple[Message, str, float, float]] = deque()
+        self.wakeup = Event()
+        self.idle = False
+        self.running = True
+        self.lock = Lock()
+        self.enqueued = self.processed = self.dropped = self.errors = self.max_depth = 0
+        self.blocked = 0.0 # seconds the request path waited for space
+        self.worker = Thread(target = self.run, name = name, daemon = True)
+        self.worker.start()
+
+    def put(self, msg: Message, resp: str, timestamp: float, wall: float = None):
+        queue = self.queue
+        if len(queue) >= self.maxsize:
+            if self.overflow == "drop":
+                with self.lock: self.dropped += 1
+                return
+            start = perf_counter()
+            while len(queue) >= self.maxsize and self.running: sleep(0.0005)
+            with self.lock: self.blocked += perf_counter() - start
+        with self.lock:
+            queue.append((msg, resp, timestamp, wall))
+            self.enqueued += 1
+        if self.idle: self.wakeup.set()
+
+    def run(self):
+        queue, capture = self.queue, self.capture
+        while self.running or queue:
+            if not queue:
+                self.idle = True
+                self.wakeup.wait(0.05) # timeout covers an entry appended right before idle was set
+                self.wakeup.clear()
+                self.idle = False
+                continue
+            self.max_depth = max(self.max_depth, len(queue))
+            msg, resp, timestamp, wall = queue.popleft()
+            try:
+                capture(msg, resp, timestamp, wall)
+            except Exception:
+                self.errors += 1
+            self.processed += 1
+
+    def join(self, timeout: float = None) -> bool:
+        """Waits until everything enqueued so far was processed"""
+        deadline = None if timeout is None else perf_counter() + timeout
+        target = self.enqueued
+        while self.processed < target:
+            if deadline is not None and perf_counter() > deadline: return False
+            sleep(0.001)
+        return True
+
+    def close(self):
+        self.running = False
+        self.wakeup.set()
+        self.worker.join()
+
+    def stats(self) -> dict[str, float]:
+        return {"depth": len(self.queue), "max_depth": self.max_depth, "enqueued": self.enqueued, "processed": self.processed,
+                "dropped": self.dropped, "errors": self.errors, "blocked": self.blocked}
@@ -0,0 +1,89 @@
+from dataclasses import dataclass, field
+from time import perf_counter
+
+from src.man import Team
+from src.provenance import USERNAME, Resolved, Slice, Source
+from src.server import Message
+
+LITERAL, NAME, SLICE = range(3)
+
+
+def slot(source: Source) -> tuple:
+    """Flattens a source into a tuple that is cheap to resolve: (kind, *arguments)"""
+    if source is USERNAME: return (NAME,)
+    if isinstance(source, Slice): return (SLICE, source.response, source.start, source.end)
+    return (LITERAL, source)
+
+
+@dataclass(frozen=True, slots=True)
+class Operation:
+    """One message of a plan: params with only literal sources are prebuilt, the rest are slots"""
+    path: str
+    static: dict[str, str]
+    slots: tuple[tuple[tuple, tuple], ...]
+
+    def build(self, username: str, responses: list[str]) -> Message:
+        params = dict(self.static)
+        for key, value in self.slots:
+            params[_take(key, username, responses)] = _take(value, username, responses)
+        return Message(self.path, params)
+
+
+def _take(slot: tuple, username: str, responses: list[str]) -> str:
+    kind = slot[0]
+    if kind == LITERAL: return slot[1]
+    if kind == NAME: return username
+    return responses[slot[1]][slot[2]:slot[3]]
+
+
+@dataclass(slots=True)
+class Execution:
+    team: Team
+    username: str
+    responses: list[str] = field(default_factory=list)
+    error: Exception | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class AttackPlan:
+    """Attack compiled into a flat list of operations.
+
+    Provenance is resolved once when compiling, running the plan only copies the static params
+    and fills the username and response slices. run() executes all targets in lockstep, so every
+    operation is looked up once per step and shared by all targets.
+    """
+    operations: tuple[Operation, ...]
+
+    @classmethod
+    def compile(cls, resolved: Resolved) -> "AttackPlan":
+        operations = []
+        for path, params in resolved:
+            static, slots = {}, []
+            for key, value in params:
+                if isinstance(key, str) and isinstance(value, str): static[key] = value
+                else: slots.append((slot(key), slot(value)))
+            operations.append(Operation(path, static, tuple(slots)))
+        return cls(tuple(operations))
+
+    def __len__(self):
+        return len(self.operations)
+
+    def run(self, targets: list[tuple[Team, str]], deadline: float = None) -> list[Execution]:
+        """Runs the plan against every (team, username) target, a failing target does not stop the others.
+        Targets still running at the perf_counter deadline fail with a TimeoutError."""
+        executions = [Execution(team, username) for team, username in targets]
+        running = executions
+        for op in self.operations:
+            if deadline is not None and perf_counter() > deadline:
+                for ex in running: ex.error = TimeoutError("Attack plan exceeded its deadline!")
+                break
+            for ex in running:
+                try:
+                    ex.responses.append(ex.team.manServer.response(op.build(ex.username, ex.responses)))
+                except Exception as e:
+                    ex.error = e
+            running = [ex for ex in running if ex.error is None]
+        return executions
+
+    def run_one(self, team: Team, username: str, deadline: float = None) -> Execution:
+        return self.run([(team, username)], deadline)[0]
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: src/protos/flag_submission/flag_submission.proto
+# Protobuf Python Version: 7.35.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    7,
+    35,
+    1,
+    '',
+    'src/protos/flag_submission/flag_submission.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n0src/protos/flag_submission/flag_submission.proto\x12\x0f\x66lag_submission\"&\n\tFlagBatch\x12\r\n\x05\x66lags\x18\x02 \x03(\tJ\x04\x08\x01\x10\x02R\x04team\"`\n\x07Verdict\x12\x0c\n\x04\x66lag\x18\x01 \x01(\t\x12\'\n\x06status\x18\x02 \x01(\x0e\x32\x17.flag_submission.Status\x12\x10\n\x08\x64\x65\x66\x65nder\x18\x03 \x01(\t\x12\x0c\n\x04tick\x18\x04 \x01(\r\"6\n\x08Verdicts\x12*\n\x08verdicts\x18\x01 \x03(\x0b\x32\x18.flag_submission.Verdict*M\n\x06Status\x12\x0b\n\x07INVALID\x10\x00\x12\x0c\n\x08\x41\x43\x43\x45PTED\x10\x01\x12\r\n\tDUPLICATE\x10\x02\x12\x07\n\x03OWN\x10\x03\x12\x10\n\x0cRATE_LIMITED\x10\x04\x32W\n\x0e\x46lagSubmission\x12\x45\n\x06submit\x12\x1a.flag_submission.FlagBatch\x1a\x19.flag_submission.Verdicts\"\x00(\x01\x30\x01\x62\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'src.protos.flag_submission.flag_submission_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_STATUS']._serialized_start=263
+  _globals['_STATUS']._serialized_end=340
+  _globals['_FLAGBATCH']._serialized_start=69
+  _globals['_FLAGBATCH']._serialized_end=107
+  _globals['_VERDICT']._serialized_start=109
+  _globals['_VERDICT']._serialized_end=205
+  _globals['_VERDICTS']._serialized_start=207
+  _globals['_VERDICTS']._serialized_end=261
+  _globals['_FLAGSUBMISSION']._serialized_start=342
+  _globals['_FLAGSUBMISSION']._serialized_end=429
+# @@protoc_insertion_point(module_scope)
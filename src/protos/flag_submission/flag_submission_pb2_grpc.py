@@ -0,0 +1,97 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+import warnings
+
+from src.protos.flag_submission import flag_submission_pb2 as src_dot_protos_dot_flag__submission_dot_flag__submission__pb2
+
+GRPC_GENERATED_VERSION = '1.84.0'
+GRPC_VERSION = grpc.__version__
+_version_not_supported = False
+
+try:
+    from grpc._utilities import first_version_is_lower
+    _version_not_supported = first_version_is_lower(GRPC_VERSION, GRPC_GENERATED_VERSION)
+except ImportError:
+    _version_not_supported = True
+
+if _version_not_supported:
+    raise RuntimeError(
+        f'The grpc package installed is at version {GRPC_VERSION},'
+        + ' but the generated code in src/protos/flag_submission/flag_submission_pb2_grpc.py depends on'
+        + f' grpcio>={GRPC_GENERATED_VERSION}.'
+        + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
+        + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
+    )
+
+
+class FlagSubmissionStub:
+    """Missing associated documentation comment in .proto file."""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.submit = channel.stream_stream(
+                '/flag_submission.FlagSubmission/submit',
+                request_serializer=src_dot_protos_dot_flag__submission_dot_flag__submission__pb2.FlagBatch.SerializeToString,
+                response_deserializer=src_dot_protos_dot_flag__submission_dot_flag__submission__pb2.Verdicts.FromString,
+                _registered_method=True)
+
+
+class FlagSubmissionServicer:
+    """Missing associated documentation comment in .proto file."""
+
+    def submit(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_FlagSubmissionServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'submit': grpc.stream_stream_rpc_method_handler(
+                    servicer.submit,
+                    request_deserializer=src_dot_protos_dot_flag__submission_dot_flag__submission__pb2.FlagBatch.FromString,
+                    response_serializer=src_dot_protos_dot_flag__submission_dot_flag__submission__pb2.Verdicts.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'flag_submission.FlagSubmission', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('flag_submission.FlagSubmission', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class FlagSubmission:
+    """Missing associated documentation comment in .proto file."""
+
+    @staticmethod
+    def submit(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/flag_submission.FlagSubmission/submit',
+            src_dot_protos_dot_flag__submission_dot_flag__submission__pb2.FlagBatch.SerializeToString,
+            src_dot_protos_dot_flag__submission_dot_flag__submission__pb2.Verdicts.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: protos/message_board/message_board.proto
+# Protobuf Python Version: 7.35.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    7,
+    35,
+    1,
+    '',
+    'protos/message_board/message_board.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+from google.protobuf import empty_pb2 as google_dot_protobuf_dot_empty__pb2
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n(protos/message_board/message_board.proto\x12\rmessage_board\x1a\x1bgoogle/protobuf/empty.proto\"1\n\x0b\x43redentials\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x10\n\x08password\x18\x02 \x01(\t\"\x14\n\x04Text\x12\x0c\n\x04text\x18\x01 \x01(\t\"\x1a\n\tPostCount\x12\r\n\x05\x63ount\x18\x01 \x01(\x05\",\n\tBoardAuth\x12\x0f\n\x07\x62oardid\x18\x01 \x01(\t\x12\x0e\n\x06\x63ookie\x18\x02 \x01(\t\"V\n\x0e\x42oardReadRange\x12&\n\x04\x61uth\x18\x01 \x01(\x0b\x32\x18.message_board.BoardAuth\x12\r\n\x05index\x18\x02 \x01(\x05\x12\r\n\x05\x63ount\x18\x03 \x01(\x05\"X\n\x0b\x42oardCreate\x12&\n\x04\x61uth\x18\x01 \x01(\x0b\x32\x18.message_board.BoardAuth\x12\x11\n\tboardname\x18\x02 \x01(\t\x12\x0e\n\x06public\x18\x03 \x01(\x08\"A\n\tBoardText\x12&\n\x04\x61uth\x18\x01 \x01(\x0b\x32\x18.message_board.BoardAuth\x12\x0c\n\x04text\x18\x02 \x01(\t\"\x1d\n\x0b\x42oardExists\x12\x0e\n\x06\x65xists\x18\x01 \x01(\x08\x32\x8b\x08\n\x0cMessageBoard\x12@\n\x08register\x12\x1a.message_board.Credentials\x1a\x16.google.protobuf.Empty\"\x00\x12:\n\x05login\x12\x1a.message_board.Credentials\x1a\x13.message_board.Text\"\x00\x12\x37\n\x06logout\x12\x13.message_board.Text\x1a\x16.google.protobuf.Empty\"\x00\x12\x41\n\tget_count\x12\x18.message_board.BoardAuth\x1a\x18.message_board.PostCount\"\x00\x12>\n\x04read\x12\x1d.message_board.BoardReadRange\x1a\x13.message_board.Text\"\x00\x30\x01\x12=\n\x08read_all\x12\x18.message_board.BoardAuth\x1a\x13.message_board.Text\"\x00\x30\x01\x12;\n\x05write\x12\x18.message_board.BoardText\x1a\x16.google.protobuf.Empty\"\x00\x12>\n\x06\x63reate\x12\x1a.message_board.BoardCreate\x1a\x16.google.protobuf.Empty\"\x00\x12<\n\x06\x64\x65lete\x12\x18.message_board.BoardAuth\x1a\x16.google.protobuf.Empty\"\x00\x12?\n\tadd_owner\x12\x18.message_board.BoardText\x1a\x16.google.protobuf.Empty\"\x00\x12@\n\nadd_reader\x12\x18.message_board.BoardText\x1a\x16.google.protobuf.Empty\"\x00\x12\x42\n\x0cremove_owner\x12\x18.message_board.BoardText\x1a\x16.google.protobuf.Empty\"\x00\x12\x43\n\rremove_reader\x12\x18.message_board.BoardText\x1a\x16.google.protobuf.Empty\"\x00\x12<\n\x06rename\x12\x18.message_board.BoardText\x1a\x16.google.protobuf.Empty\"\x00\x12;\n\x08get_name\x12\x18.message_board.BoardAuth\x1a\x13.message_board.Text\"\x00\x12@\n\x06\x65xists\x12\x18.message_board.BoardAuth\x1a\x1a.message_board.BoardExists\"\x00\x62\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'protos.message_board.message_board_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_CREDENTIALS']._serialized_start=88
+  _globals['_CREDENTIALS']._serialized_end=137
+  _globals['_TEXT']._serialized_start=139
+  _globals['_TEXT']._serialized_end=159
+  _globals['_POSTCOUNT']._serialized_start=161
+  _globals['_POSTCOUNT']._serialized_end=187
+  _globals['_BOARDAUTH']._serialized_start=189
+  _globals['_BOARDAUTH']._serialized_end=233
+  _globals['_BOARDREADRANGE']._serialized_start=235
+  _globals['_BOARDREADRANGE']._serialized_end=321
+  _globals['_BOARDCREATE']._serialized_start=323
+  _globals['_BOARDCREATE']._serialized_end=411
+  _globals['_BOARDTEXT']._serialized_start=413
+  _globals['_BOARDTEXT']._serialized_end=478
+  _globals['_BOARDEXISTS']._serialized_start=480
+  _globals['_BOARDEXISTS']._serialized_end=509
+  _globals['_MESSAGEBOARD']._serialized_start=512
+  _globals['_MESSAGEBOARD']._serialized_end=1547
+# @@protoc_insertion_point(module_scope)
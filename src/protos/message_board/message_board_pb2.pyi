@@ -0,0 +1,69 @@
+from google.protobuf import empty_pb2 as _empty_pb2
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import message as _message
+from collections.abc import Mapping as _Mapping
+from typing import ClassVar as _ClassVar, Optional as _Optional, Union as _Union
+
+DESCRIPTOR: _descriptor.FileDescriptor
+
+class Credentials(_message.Message):
+    __slots__ = ("username", "password")
+    USERNAME_FIELD_NUMBER: _ClassVar[int]
+    PASSWORD_FIELD_NUMBER: _ClassVar[int]
+    username: str
+    password: str
+    def __init__(self, username: _Optional[str] = ..., password: _Optional[str] = ...) -> None: ...
+
+class Text(_message.Message):
+    __slots__ = ("text",)
+    TEXT_FIELD_NUMBER: _ClassVar[int]
+    text: str
+    def __init__(self, text: _Optional[str] = ...) -> None: ...
+
+class PostCount(_message.Message):
+    __slots__ = ("count",)
+    COUNT_FIELD_NUMBER: _ClassVar[int]
+    count: int
+    def __init__(self, count: _Optional[int] = ...) -> None: ...
+
+class BoardAuth(_message.Message):
+    __slots__ = ("boardid", "cookie")
+    BOARDID_FIELD_NUMBER: _ClassVar[int]
+    COOKIE_FIELD_NUMBER: _ClassVar[int]
+    boardid: str
+    cookie: str
+    def __init__(self, boardid: _Optional[str] = ..., cookie: _Optional[str] = ...) -> None: ...
+
+class BoardReadRange(_message.Message):
+    __slots__ = ("auth", "index", "count")
+    AUTH_FIELD_NUMBER: _ClassVar[int]
+    INDEX_FIELD_NUMBER: _ClassVar[int]
+    COUNT_FIELD_NUMBER: _ClassVar[int]
+    auth: BoardAuth
+    index: int
+    count: int
+    def __init__(self, auth: _Optional[_Union[BoardAuth, _Mapping]] = ..., index: _Optional[int] = ..., count: _Optional[int] = ...) -> None: ...
+
+class BoardCreate(_message.Message):
+    __slots__ = ("auth", "boardname", "public")
+    AUTH_FIELD_NUMBER: _ClassVar[int]
+    BOARDNAME_FIELD_NUMBER: _ClassVar[int]
+    PUBLIC_FIELD_NUMBER: _ClassVar[int]
+    auth: BoardAuth
+    boardname: str
+    public: bool
+    def __init__(self, auth: _Optional[_Union[BoardAuth, _Mapping]] = ..., boardname: _Optional[str] = ..., public: _Optional[bool] = ...) -> None: ...
+
+class BoardText(_message.Message):
+    __slots__ = ("auth", "text")
+    AUTH_FIELD_NUMBER: _ClassVar[int]
+    TEXT_FIELD_NUMBER: _ClassVar[int]
+    auth: BoardAuth
+    text: str
+    def __init__(self, auth: _Optional[_Union[BoardAuth, _Mapping]] = ..., text: _Optional[str] = ...) -> None: ...
+
+class BoardExists(_message.Message):
+    __slots__ = ("exists",)
+    EXISTS_FIELD_NUMBER: _ClassVar[int]
+    exists: bool
+    def __init__(self, exists: _Optional[bool] = ...) -> None: ...
@@ -0,0 +1,743 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+import warnings
+
+from google.protobuf import empty_pb2 as google_dot_protobuf_dot_empty__pb2
+from protos.message_board import message_board_pb2 as protos_dot_message__board_dot_message__board__pb2
+
+GRPC_GENERATED_VERSION = '1.84.0'
+GRPC_VERSION = grpc.__version__
+_version_not_supported = False
+
+try:
+    from grpc._utilities import first_version_is_lower
+    _version_not_supported = first_version_is_lower(GRPC_VERSION, GRPC_GENERATED_VERSION)
+except ImportError:
+    _version_not_supported = True
+
+if _version_not_supported:
+    raise RuntimeError(
+        f'The grpc package installed is at version {GRPC_VERSION},'
+        + ' but the generated code in protos/message_board/message_board_pb2_grpc.py depends on'
+        + f' grpcio>={GRPC_GENERATED_VERSION}.'
+        + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
+        + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
+    )
+
+
+class MessageBoardStub:
+    """Missing associated documentation comment in .proto file."""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.register = channel.unary_unary(
+                '/message_board.MessageBoard/register',
+                request_serializer=protos_dot_message__board_dot_message__board__pb2.Credentials.SerializeToString,
+                response_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+                _registered_method=True)
+        self.login = channel.unary_unary(
+                '/message_board.MessageBoard/login',
+                request_serializer=protos_dot_message__board_dot_message__board__pb2.Credentials.SerializeToString,
+                response_deserializer=protos_dot_message__board_dot_message__board__pb2.Text.FromString,
+                _registered_method=True)
+        self.logout = channel.unary_unary(
+                '/message_board.MessageBoard/logout',
+                request_serializer=protos_dot_message__board_dot_message__board__pb2.Text.SerializeToString,
+                response_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+                _registered_method=True)
+        self.get_count = channel.unary_unary(
+                '/message_board.MessageBoard/get_count',
+                request_serializer=protos_dot_message__board_dot_message__board__pb2.BoardAuth.SerializeToString,
+                response_deserializer=protos_dot_message__board_dot_message__board__pb2.PostCount.FromString,
+                _registered_method=True)
+        self.read = channel.unary_stream(
+                '/message_board.MessageBoard/read',
+                request_serializer=protos_dot_message__board_dot_message__board__pb2.BoardReadRange.SerializeToString,
+                response_deserializer=protos_dot_message__board_dot_message__board__pb2.Text.FromString,
+                _registered_method=True)
+        self.read_all = channel.unary_stream(
+                '/message_board.MessageBoard/read_all',
+                request_serializer=protos_dot_message__board_dot_message__board__pb2.BoardAuth.SerializeToString,
+                response_deserializer=protos_dot_message__board_dot_message__board__pb2.Text.FromString,
+                _registered_method=True)
+        self.write = channel.unary_unary(
+                '/message_board.MessageBoard/write',
+                request_serializer=protos_dot_message__board_dot_message__board__pb2.BoardText.SerializeToString,
+                response_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+                _registered_method=True)
+        self.create = channel.unary_unary(
+                '/message_board.MessageBoard/create',
+                request_serializer=protos_dot_message__board_dot_message__board__pb2.BoardCreate.SerializeToString,
+                response_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+                _registered_method=True)
+        self.delete = channel.unary_unary(
+                '/message_board.MessageBoard/delete',
+                request_serializer=protos_dot_message__board_dot_message__board__pb2.BoardAuth.SerializeToString,
+                response_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+                _registered_method=True)
+        self.add_owner = channel.unary_unary(
+                '/message_board.MessageBoard/add_owner',
+                request_serializer=protos_dot_message__board_dot_message__board__pb2.BoardText.SerializeToString,
+                response_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+                _registered_method=True)
+        self.add_reader = channel.unary_unary(
+                '/message_board.MessageBoard/add_reader',
+                request_serializer=protos_dot_message__board_dot_message__board__pb2.BoardText.SerializeToString,
+                response_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+                _registered_method=True)
+        self.remove_owner = channel.unary_unary(
+                '/message_board.MessageBoard/remove_owner',
+                request_serializer=protos_dot_message__board_dot_message__board__pb2.BoardText.SerializeToString,
+                response_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+                _registered_method=True)
+        self.remove_reader = channel.unary_unary(
+                '/message_board.MessageBoard/remove_reader',
+                request_serializer=protos_dot_message__board_dot_message__board__pb2.BoardText.SerializeToString,
+                response_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+                _registered_method=True)
+        self.rename = channel.unary_unary(
+                '/message_board.MessageBoard/rename',
+                request_serializer=protos_dot_message__board_dot_message__board__pb2.BoardText.SerializeToString,
+                response_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+                _registered_method=True)
+        self.get_name = channel.unary_unary(
+                '/message_board.MessageBoard/get_name',
+                request_serializer=protos_dot_message__board_dot_message__board__pb2.BoardAuth.SerializeToString,
+                response_deserializer=protos_dot_message__board_dot_message__board__pb2.Text.FromString,
+                _registered_method=True)
+        self.exists = channel.unary_unary(
+                '/message_board.MessageBoard/exists',
+                request_serializer=protos_dot_message__board_dot_message__board__pb2.BoardAuth.SerializeToString,
+                response_deserializer=protos_dot_message__board_dot_message__board__pb2.BoardExists.FromString,
+                _registered_method=True)
+
+
+class MessageBoardServicer:
+    """Missing associated documentation comment in .proto file."""
+
+    def register(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def login(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def logout(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def get_count(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def read(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def read_all(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def write(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def create(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def delete(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def add_owner(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def add_reader(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def remove_owner(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def remove_reader(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def rename(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def get_name(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def exists(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_MessageBoardServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'register': grpc.unary_unary_rpc_method_handler(
+                    servicer.register,
+                    request_deserializer=protos_dot_message__board_dot_message__board__pb2.Credentials.FromString,
+                    response_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+            ),
+            'login': grpc.unary_unary_rpc_method_handler(
+                    servicer.login,
+                    request_deserializer=protos_dot_message__board_dot_message__board__pb2.Credentials.FromString,
+                    response_serializer=protos_dot_message__board_dot_message__board__pb2.Text.SerializeToString,
+            ),
+            'logout': grpc.unary_unary_rpc_method_handler(
+                    servicer.logout,
+                    request_deserializer=protos_dot_message__board_dot_message__board__pb2.Text.FromString,
+                    response_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+            ),
+            'get_count': grpc.unary_unary_rpc_method_handler(
+                    servicer.get_count,
+                    request_deserializer=protos_dot_message__board_dot_message__board__pb2.BoardAuth.FromString,
+                    response_serializer=protos_dot_message__board_dot_message__board__pb2.PostCount.SerializeToString,
+            ),
+            'read': grpc.unary_stream_rpc_method_handler(
+                    servicer.read,
+                    request_deserializer=protos_dot_message__board_dot_message__board__pb2.BoardReadRange.FromString,
+                    response_serializer=protos_dot_message__board_dot_message__board__pb2.Text.SerializeToString,
+            ),
+            'read_all': grpc.unary_stream_rpc_method_handler(
+                    servicer.read_all,
+                    request_deserializer=protos_dot_message__board_dot_message__board__pb2.BoardAuth.FromString,
+                    response_serializer=protos_dot_message__board_dot_message__board__pb2.Text.SerializeToString,
+            ),
+            'write': grpc.unary_unary_rpc_method_handler(
+                    servicer.write,
+                    request_deserializer=protos_dot_message__board_dot_message__board__pb2.BoardText.FromString,
+                    response_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+            ),
+            'create': grpc.unary_unary_rpc_method_handler(
+                    servicer.create,
+                    request_deserializer=protos_dot_message__board_dot_message__board__pb2.BoardCreate.FromString,
+                    response_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+            ),
+            'delete': grpc.unary_unary_rpc_method_handler(
+                    servicer.delete,
+                    request_deserializer=protos_dot_message__board_dot_message__board__pb2.BoardAuth.FromString,
+                    response_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+            ),
+            'add_owner': grpc.unary_unary_rpc_method_handler(
+                    servicer.add_owner,
+                    request_deserializer=protos_dot_message__board_dot_message__board__pb2.BoardText.FromString,
+                    response_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+            ),
+            'add_reader': grpc.unary_unary_rpc_method_handler(
+                    servicer.add_reader,
+                    request_deserializer=protos_dot_message__board_dot_message__board__pb2.BoardText.FromString,
+                    response_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+            ),
+            'remove_owner': grpc.unary_unary_rpc_method_handler(
+                    servicer.remove_owner,
+                    request_deserializer=protos_dot_message__board_dot_message__board__pb2.BoardText.FromString,
+                    response_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+            ),
+            'remove_reader': grpc.unary_unary_rpc_method_handler(
+                    servicer.remove_reader,
+                    request_deserializer=protos_dot_message__board_dot_message__board__pb2.BoardText.FromString,
+                    response_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+            ),
+            'rename': grpc.unary_unary_rpc_method_handler(
+                    servicer.rename,
+                    request_deserializer=protos_dot_message__board_dot_message__board__pb2.BoardText.FromString,
+                    response_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+            ),
+            'get_name': grpc.unary_unary_rpc_method_handler(
+                    servicer.get_name,
+                    request_deserializer=protos_dot_message__board_dot_message__board__pb2.BoardAuth.FromString,
+                    response_serializer=protos_dot_message__board_dot_message__board__pb2.Text.SerializeToString,
+            ),
+            'exists': grpc.unary_unary_rpc_method_handler(
+                    servicer.exists,
+                    request_deserializer=protos_dot_message__board_dot_message__board__pb2.BoardAuth.FromString,
+                    response_serializer=protos_dot_message__board_dot_message__board__pb2.BoardExists.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'message_board.MessageBoard', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('message_board.MessageBoard', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class MessageBoard:
+    """Missing associated documentation comment in .proto file."""
+
+    @staticmethod
+    def register(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/message_board.MessageBoard/register',
+            protos_dot_message__board_dot_message__board__pb2.Credentials.SerializeToString,
+            google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def login(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/message_board.MessageBoard/login',
+            protos_dot_message__board_dot_message__board__pb2.Credentials.SerializeToString,
+            protos_dot_message__board_dot_message__board__pb2.Text.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def logout(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/message_board.MessageBoard/logout',
+            protos_dot_message__board_dot_message__board__pb2.Text.SerializeToString,
+            google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def get_count(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/message_board.MessageBoard/get_count',
+            protos_dot_message__board_dot_message__board__pb2.BoardAuth.SerializeToString,
+            protos_dot_message__board_dot_message__board__pb2.PostCount.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def read(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/message_board.MessageBoard/read',
+            protos_dot_message__board_dot_message__board__pb2.BoardReadRange.SerializeToString,
+            protos_dot_message__board_dot_message__board__pb2.Text.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def read_all(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/message_board.MessageBoard/read_all',
+            protos_dot_message__board_dot_message__board__pb2.BoardAuth.SerializeToString,
+            protos_dot_message__board_dot_message__board__pb2.Text.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def write(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/message_board.MessageBoard/write',
+            protos_dot_message__board_dot_message__board__pb2.BoardText.SerializeToString,
+            google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def create(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/message_board.MessageBoard/create',
+            protos_dot_message__board_dot_message__board__pb2.BoardCreate.SerializeToString,
+            google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def delete(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/message_board.MessageBoard/delete',
+            protos_dot_message__board_dot_message__board__pb2.BoardAuth.SerializeToString,
+            google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def add_owner(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/message_board.MessageBoard/add_owner',
+            protos_dot_message__board_dot_message__board__pb2.BoardText.SerializeToString,
+            google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def add_reader(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/message_board.MessageBoard/add_reader',
+            protos_dot_message__board_dot_message__board__pb2.BoardText.SerializeToString,
+            google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def remove_owner(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/message_board.MessageBoard/remove_owner',
+            protos_dot_message__board_dot_message__board__pb2.BoardText.SerializeToString,
+            google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def remove_reader(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/message_board.MessageBoard/remove_reader',
+            protos_dot_message__board_dot_message__board__pb2.BoardText.SerializeToString,
+            google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def rename(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/message_board.MessageBoard/rename',
+            protos_dot_message__board_dot_message__board__pb2.BoardText.SerializeToString,
+            google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def get_name(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/message_board.MessageBoard/get_name',
+            protos_dot_message__board_dot_message__board__pb2.BoardAuth.SerializeToString,
+            protos_dot_message__board_dot_message__board__pb2.Text.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def exists(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/message_board.MessageBoard/exists',
+            protos_dot_message__board_dot_message__board__pb2.BoardAuth.SerializeToString,
+            protos_dot_message__board_dot_message__board__pb2.BoardExists.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
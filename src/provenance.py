@@ -0,0 +1,105 @@
+from bisect import bisect_right
+from dataclasses import dataclass
+import re
+from sys import getsizeof
+from typing import Sequence
+
+MIN_TOKEN = 4 # shorter tokens match earlier responses by chance too often
+TOKEN = re.compile(r"[\w-]+")
+ENTRY = 2 * 8 + getsizeof(1000) # an index and an offset in the lists of a token, offsets are mostly ints of their own
+NEW_ENTRY = 2 * getsizeof([0]) + getsizeof((None, None)) + 3 * 8 + getsizeof(1000) # both lists, their tuple and a slot of the dict
+
+
+@dataclass(frozen=True, slots=True)
+class Slice:
+    """Token taken from an earlier response: responses[response][start:end]"""
+    response: int
+    start: int
+    end: int
+
+    def take(self, responses: Sequence[str]) -> str:
+        return responses[self.response][self.start:self.end]
+
+    def __str__(self):
+        return f"resps[{self.response}][{self.start}:{self.end}]"
+
+
+class _Username:
+    """Placeholder for the username of the attacked team"""
+    def __str__(self):
+        return "username"
+
+USERNAME = _Username()
+
+Source = str | Slice | _Username # a plain str is a literal
+Resolved = list[tuple[str, list[tuple[Source, Source]]]] # path and (key, value) sources of every message
+
+
+class ProvenanceIndex:
+    """Token index over the responses of an attack.
+
+    Every response is split into tokens once when it is appended, the index maps each token to the
+    responses it occurs in and its first offset in each. A param is looked up by the token it
+    starts with, so it is found where that token starts in a response, and finding it does not
+    depend on the number or length of the responses. Params starting with something else than a
+    token character are searched response by response, these occurrences are cached per param and
+    only extended by responses appended since.
+    """
+
+    def __init__(self, responses: Sequence[str] = ()):
+        self.responses: list[str] = []
+        self.tokens: dict[str, tuple[list[int], list[int]]] = {} # token: indices, offsets
+        self.size = 0 # bytes used by the index
+        self._scanned: dict[str, tuple[list[int], list[int], list[int]]] = {} # indices, offsets, [responses scanned]
+        for resp in responses:
+            self.append(resp)
+
+    def append(self, resp: str):
+        i, tokens, size = len(self.responses), self.tokens, 0
+        self.responses.append(resp)
+        for match in TOKEN.finditer(resp):
+            if (found := tokens.get(token := match.group())) is None:
+                tokens[token] = ([i], [match.start()])
+                size += getsizeof(token) + NEW_ENTRY
+            elif found[0][-1] != i: # only the first offset in every response is needed
+                found[0].append(i)
+                found[1].append(match.start())
+                size += ENTRY
+        self.size += size
+
+    def __len__(self):
+        return len(self.responses)
+
+    def occurrences(self, token: str) -> tuple[list[int], list[int]]:
+        """Indices of the responses containing a whole token and its first offset in each"""
+        return self.tokens.get(token, ([], []))
+
+    def _scan(self, token: str) -> tuple[list[int], list[int]]:
+        if (found := self._scanned.get(token)) is None: found = self._scanned[token] = ([], [], [0])
+        indices, offsets, scanned = found
+        for i in range(scanned[0], len(self.responses)):
+            if (offset := self.responses[i].find(token)) >= 0:
+                indices.append(i)
+                offsets.append(offset)
+        scanned[0] = len(self.responses)
+        return indices, offsets
+
+    def find(self, token: str, before: int) -> Slice | None:
+        """Latest response before message `before` that contains the token"""
+        if len(token) < MIN_TOKEN: return None
+        if (head := TOKEN.match(token)) is None:
+            indices, offsets = self._scan(token)
+        elif (found := self.tokens.get(head.group())) is None: return None
+        else: indices, offsets = found
+        k = bisect_right(indices, before - 1)
+        if head is None or head.end() == len(token):
+            return Slice(indices[k - 1], offsets[k - 1], offsets[k - 1] + len(token)) if k else None
+        for j in range(k - 1, -1, -1): # params of several tokens: the latest response it follows its first token in
+            if (offset := self.responses[indices[j]].find(token, offsets[j])) >= 0:
+                return Slice(indices[j], offset, offset + len(token))
+        return None
+
+    def source(self, token: str, before: int, usernames: set[str]) -> Source:
+        """Where a token of message `before` came from: the attacked username, an earlier response or a literal"""
+        if token in usernames: return USERNAME
+        return self.find(token, before) or token
@@ -0,0 +1,148 @@
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from statistics import fmean
+from time import perf_counter
+from uuid import UUID
+
+from src.fingerprint import ExploitCache
+from src.game import Gameserver
+from src.man import Team
+from src.plan import AttackPlan, Execution
+from src.shield import Attack, ShieldMAN
+
+
+@dataclass
+class Outcome:
+    attack: UUID
+    execution: Execution
+    latency: float
+    flags: list[str] = field(default_factory=list)
+
+
+@dataclass
+class AttackStats:
+    runs: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    flags: int = 0
+    elapsed: float = 0.0 # wall time of all ticks this attack was fired in
+    latencies: list[float] = field(default_factory=list, repr=False)
+
+    def record(self, outcome: Outcome):
+        self.runs += 1
+        self.flags += len(outcome.flags)
+        self.latencies.append(outcome.latency)
+        if isinstance(outcome.execution.error, TimeoutError): self.timeouts += 1
+        elif outcome.execution.error is not None: self.errors += 1
+
+    @property
+    def throughput(self) -> float:
+        """Targets attacked per second"""
+        return self.runs / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> dict[str, float]:
+        lat = sorted(self.latencies)
+        pick = lambda q: lat[min(len(lat) - 1, int(q * len(lat)))] if lat else 0.0
+        return {"runs": self.runs, "errors": self.errors, "timeouts": self.timeouts, "flags": self.flags,
+                "throughput": self.throughput, "mean": fmean(lat) if lat else 0.0, "p50": pick(0.5), "p95": pick(0.95), "max": pick(1.0)}
+
+
+class ExploitRunner:
+    """Fires every flag yielding attack captured by a team's ShieldMAN at all other teams.
+
+    Every target is one job on a thread pool that fires the attacks one after another, so no two
+    threads talk to the same team and at most max_workers targets are attacked at once. An attack
+    stops at the next message once it ran for longer than timeout seconds. A target that is not
+    done after timeout seconds per attack is given up, even if a response() hangs. Its thread is
+    abandoned and the target is skipped until it returns. Plans are shared through an
+    ExploitCache, so replays of a known exploit are not compiled again.
+    """
+
+    def __init__(self, game: Gameserver, team: Team, max_workers: int = 16, timeout: float = 5.0, cache: ExploitCache = None):
+        if not isinstance(team.manServer, ShieldMAN):
+            raise ValueError(f"Team {team.name} has no ShieldMAN to take attacks from!")
+        self.game = game
+        self.team = team
+        self.shield: ShieldMAN = team.manServer
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix="exploit")
+        self.cache = ExploitCache() if cache is None else cache
+        self.plans: dict[UUID, AttackPlan] = {}
+        self.stats: dict[UUID, AttackStats] = {}
+        self._running: dict[str, Future] = {} # job of every target, hung ones stay until they return
+
+    def attacks(self) -> list[Attack]:
+        with self.shield.lock:
+            return [atk for atk in self.shield.attacks if atk.hasFlag]
+
+    def our_usernames(self) -> list[str]:
+        """Usernames our flags were placed on, these are replaced in captured attacks"""
+        return [name for other in self.game.teams.values() for name in self.game.usernames(other, self.team)]
+
+    def targets(self, index: int = -1) -> list[tuple[Team, str]]:
+        return [(other, self.game.usernames(self.team, other, index)) for other in self.game.teams.values() if other is not self.team]
+
+    def plan(self, atk: Attack) -> AttackPlan:
+        """Resolves under the lock of the ShieldMAN, whose pipeline may extend the attack and its index meanwhile"""
+        usernames = self.our_usernames()
+        with self.shield.lock:
+            if (plan := self.plans.get(atk.id)) is not None and len(plan) == len(atk.messages): return plan
+            resolved = atk.resolve(usernames) # recompiled if the attack went on
+        plan = self.plans[atk.id] = self.cache.lookup(atk, usernames, resolved).plan
+        return plan
+
+    def _execute(self, atk: Attack, plan: AttackPlan, team: Team, username: str) -> Outcome:
+        start = perf_counter()
+        execution = plan.run_one(team, username, deadline = start + self.timeout)
+        flags = [flag for flags in self.shield.scanner.scan_many(execution.responses) for flag in flags]
+        return Outcome(atk.id, execution, perf_counter() - start, flags)
+
+    def _attack_target(self, plans: list[tuple[Attack, AttackPlan]], team: Team, username: str, outcomes: list[Outcome]):
+        """Fires the attacks at one target one after another, outcomes are appended as they finish"""
+        for atk, plan in plans:
+            try:
+                outcomes.append(self._execute(atk, plan, team, username))
+            except Exception as e:
+                outcomes.append(Outcome(atk.id, Execution(team, username, error = e), 0.0))
+
+    def run_tick(self, index: int = -1, deadline: float = None) -> list[Outcome]:
+        """Runs all attacks against all targets of the given tick.
+        Attacks not finished at the perf_counter deadline, or once their target used up its
+        timeout per attack, are reported as timeouts."""
+        start = perf_counter()
+        plans = [(atk, self.plan(atk)) for atk in self.attacks()]
+        if not plans: return []
+        cutoff = start + self.timeout * len(plans)
+        cutoff = cutoff if deadline is None else min(cutoff, deadline)
+        jobs: dict[str, tuple[Future, Team, str, list[Outcome]]] = {}
+        outcomes = []
+        for team, username in self.targets(index):
+            if (running := self._running.get(team.name)) is not None and not running.done():
+                outcomes += [Outcome(atk.id, Execution(team, username, error = TimeoutError("Target still hangs in an earlier tick!")), 0.0)
+                             for atk, _ in plans]
+                continue
+            finished: list[Outcome] = []
+            future = self._running[team.name] = self.executor.submit(self._attack_target, plans, team, username, finished)
+            jobs[team.name] = (future, team, username, finished)
+        wait([future for future, _, _, _ in jobs.values()], timeout = max(0.0, cutoff - perf_counter()))
+
+        for future, team, username, finished in jobs.values():
+            finished = list(finished) # a hung job may still append
+            outcomes += finished
+            if len(finished) < len(plans):
+                future.cancel()
+                outcomes += [Outcome(atk.id, Execution(team, username, error = TimeoutError("Target did not answer in time!")), perf_counter() - start)
+                             for atk, _ in plans[len(finished):]]
+
+        elapsed = perf_counter() - start
+        for atk, _ in plans:
+            self.stats.setdefault(atk.id, AttackStats()).elapsed += elapsed
+        for outcome in outcomes:
+            self.stats[outcome.attack].record(outcome)
+        return outcomes
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        return {str(atk): stats.summary() for atk, stats in self.stats.items()}
+
+    def close(self):
+        self.executor.shutdown(wait = False, cancel_futures = True)
@@ -0,0 +1,72 @@
+import re
+from re import _parser
+from typing import Iterable, Iterator
+
+_LITERAL = _parser.LITERAL
+
+
+def literal_prefix(pattern: str) -> str:
+    """Longest literal string every match of the pattern has to start with"""
+    parsed = _parser.parse(pattern)
+    if parsed.state.flags & re.IGNORECASE: return ""
+    prefix = []
+    for op, arg in parsed:
+        if op is not _LITERAL: break
+        prefix.append(chr(arg))
+    return "".join(prefix)
+
+
+def max_width(pattern: str) -> int:
+    """Upper bound for the length of a match, may be huge for unbounded patterns"""
+    return _parser.parse(pattern).getwidth()[1]
+
+
+class FlagScanner:
+    """Finds flags of one or more formats in responses.
+
+    All formats are compiled once into a single alternation. Before the regex runs,
+    a response is checked for the literal prefix of every format (e.g. 'flag{'),
+    so responses without any flag candidates only cost a substring search.
+    """
+
+    def __init__(self, *patterns: str, window: int = 4096):
+        if not patterns: raise ValueError("FlagScanner needs at least one flag pattern!")
+        self.patterns = patterns
+        self.regex = re.compile("|".join(f"(?:{p})" for p in patterns))
+        prefixes = [literal_prefix(p) for p in patterns]
+        self.prefixes = tuple(set(prefixes)) if all(prefixes) else () # a single format without prefix disables the prefilter
+        self.window = min(max(max_width(p) for p in patterns), window) # overlap needed between stream chunks
+
+    def candidate(self, text: str) -> bool:
+        if not self.prefixes: return True
+        for prefix in self.prefixes:
+            if prefix in text: return True
+        return False
+
+    def findall(self, text: str) -> list[str]:
+        if not self.regex.groups: return self.regex.findall(text)
+        return [m.group() for m in self.regex.finditer(text)] # user formats with groups, findall would return those
+
+    def scan(self, text: str) -> list[str]:
+        return self.findall(text) if self.candidate(text) else []
+
+    def scan_many(self, texts: Iterable[str]) -> list[list[str]]:
+        candidate, findall = self.candidate, self.findall
+        return [findall(t) if candidate(t) else [] for t in texts]
+
+    def scan_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        """Yields flags from a chunked response, including flags spanning chunk boundaries.
+        Only the last `window` characters are kept between chunks."""
+        buffer = ""
+        for chunk in chunks:
+            buffer += chunk
+            cut = len(buffer) - self.window + 1 # matches starting before cut are complete
+            if cut <= 0: continue
+            end = 0
+            if self.candidate(buffer):
+                for m in self.regex.finditer(buffer):
+                    if m.start() >= cut: break
+                    yield m.group()
+                    end = m.end()
+            buffer = buffer[max(cut, end):]
+        yield from self.scan(buffer)
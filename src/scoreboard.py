@@ -0,0 +1,93 @@
+"""Attack, defence and SLA points of all teams, updated per event.
+
+A captured flag gives its attacker `attack_points` and costs its defender `defence_points`, a team
+whose flags could be placed in a tick gets `sla_points`. Every event updates the totals, the delta
+of the current tick and the ranking in place, so reading the scoreboard never looks at the history
+of the game. Flags are booked from the event loop, SLA from the thread placing the flags, all
+changes and reads hold the lock of the scoreboard.
+"""
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from threading import Lock
+
+from src.flags import FlagInfo
+
+
+@dataclass(slots=True)
+class Score:
+    attack: float = 0.0
+    defence: float = 0.0
+    sla: float = 0.0
+
+    @property
+    def total(self) -> float:
+        return self.attack + self.defence + self.sla
+
+    def copy(self) -> "Score":
+        return Score(self.attack, self.defence, self.sla)
+
+
+class Scoreboard:
+
+    def __init__(self, attack_points: float = 1.0, defence_points: float = 1.0, sla_points: float = 1.0):
+        self.attack_points = attack_points
+        self.defence_points = defence_points
+        self.sla_points = sla_points
+        self.tick = 0 # events are booked on this tick
+        self.scores: dict[str, Score] = {}
+        self.deltas: dict[int, dict[str, Score]] = {} # tick: points gained in it per team
+        self._keys: dict[str, tuple[float, str]] = {}
+        self._ranking: list[tuple[float, str]] = [] # (-total, name) in ranking order
+        self.lock = Lock()
+
+    def add_team(self, name: str):
+        with self.lock:
+            if name in self.scores: return
+            self.scores[name] = Score()
+            self._keys[name] = key = (-0.0, name)
+            insort(self._ranking, key)
+
+    def new_tick(self, number: int):
+        with self.lock:
+            self.tick = number
+
+    def capture(self, info: FlagInfo):
+        """Books a flag accepted for the first time"""
+        with self.lock:
+            self._add(info.attacker, attack = self.attack_points)
+            self._add(info.defender, defence = -self.defence_points)
+
+    def sla(self, team: str, up: bool):
+        """Books the availability of a team in the current tick"""
+        if not up: return
+        with self.lock:
+            self._add(team, sla = self.sla_points)
+
+    def _add(self, team: str, attack: float = 0.0, defence: float = 0.0, sla: float = 0.0):
+        score = self.scores[team]
+        score.attack += attack
+        score.defence += defence
+        score.sla += sla
+        if (deltas := self.deltas.get(self.tick)) is None: deltas = self.deltas[self.tick] = {}
+        if (delta := deltas.get(team)) is None: delta = deltas[team] = Score()
+        delta.attack += attack
+        delta.defence += defence
+        delta.sla += sla
+        old, new = self._keys[team], (-score.total, team)
+        del self._ranking[bisect_left(self._ranking, old)]
+        insort(self._ranking, new)
+        self._keys[team] = new
+
+    def ranking(self) -> list[tuple[str, Score]]:
+        """Teams with a copy of their scores, best first, ties by name"""
+        with self.lock:
+            return [(name, self.scores[name].copy()) for _, name in self._ranking]
+
+    def rank(self, team: str) -> int:
+        """Place of the team, starting at 1"""
+        with self.lock:
+            return bisect_left(self._ranking, self._keys[team]) + 1
+
+    def delta(self, tick: int) -> dict[str, Score]:
+        with self.lock:
+            return {team: score.copy() for team, score in self.deltas.get(tick, {}).items()}
@@ -1,9 +1,24 @@
 
+import asyncio
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from re import findall
+from json import dumps
+import re
+from time import monotonic, perf_counter, time
+from threading import RLock
+from typing import Callable
 from uuid import uuid4
 
+from src.capture import CaptureStore, Record
+from src.capture_log import CaptureLog
+from src.fingerprint import Exploit, ExploitCache
+from src.firewall import FlagFirewall
 from src.man import MAN, Team
+from src.metrics import metrics
+from src.pipeline import CapturePipeline
+from src.plan import AttackPlan
+from src.provenance import USERNAME, ProvenanceIndex, Resolved, Slice, Source
+from src.scanner import FlagScanner
 from src.server import Message, Server
 
 
@@ -11,66 +26,268 @@ from src.server import Message, Server
 class Attack:
     id: uuid4 = field(init = False, default_factory = uuid4)
     flags: list[str] = field(init = False, default_factory = list)
-    messages: list[(Message, str)] = field(default_factory = list, init = False, repr = False)
+    messages: list[Record] = field(default_factory = list, init = False, repr = False)
+    last_seen: float = field(init = False, default = 0.0, repr = False)
+    resolved: Resolved = field(init = False, default_factory = list, repr = False, compare = False) # kept up to date online
+    _provenance: ProvenanceIndex = field(init = False, default = None, repr = False, compare = False)
 
     @property
     def hasFlag(self):
         return len(self.flags) > 0
 
-    def generate_attack(self, usernames:list[str]):
+    @property
+    def provenance(self) -> ProvenanceIndex:
+        """Index over the captured responses, extended by the messages added since"""
+        if self._provenance is None or len(self._provenance) > len(self.messages):
+            self._provenance = ProvenanceIndex()
+        for rec in self.messages[len(self._provenance):]:
+            self._provenance.append(rec.response)
+        return self._provenance
+
+    def _resolve(self, i: int, usernames: set[str]) -> tuple[str, list[tuple[Source, Source]]]:
+        rec, index = self.messages[i], self.provenance
+        return rec.path, [(index.source(key, i, usernames), index.source(value, i, usernames)) for key, value in rec.items()]
+
+    @metrics.timed("resolve")
+    def resolve(self, usernames: list[str]) -> Resolved:
+        """Path and the source of every param key and value for each message"""
+        usernames = set(usernames)
+        return [self._resolve(i, usernames) for i in range(len(self.messages))]
+
+    def advance(self, usernames: set[str]) -> Resolved:
+        """Resolves only the messages added since the last call"""
+        for i in range(len(self.resolved), len(self.messages)):
+            self.resolved.append(self._resolve(i, usernames))
+        return self.resolved
+
+    @metrics.timed("compile")
+    def compile(self, usernames: list[str], resolved: Resolved = None) -> AttackPlan:
+        return AttackPlan.compile(self.resolve(usernames) if resolved is None else resolved)
+
+    @metrics.timed("generate_attack")
+    def generate_attack(self, usernames:list[str], resolved: Resolved = None):
+        resolved = self.resolve(usernames) if resolved is None else resolved
         def attack(username:str) -> list[str]:
-            responses = [resp for _,resp in self.messages]
-            def shield_message(msg:Message):
+            def take(source: Source, prev_responses: list[str]) -> str:
+                if source is USERNAME: return username
+                if isinstance(source, Slice): return source.take(prev_responses)
+                return source
+            def shield_message(path: str, params: list[tuple[Source, Source]]):
                 def call(prev_responses:list[str]):
-                    params = {}
-                    for key, value in msg.param.items():
-                        if key in usernames: key = username
-                        if value in usernames: value = username
-                        for r,p in zip(responses, prev_responses):
-                            if (key_index := r.find(key)) >= 0: # key was found in previous answer
-                                key = p[key_index:key_index+len(key)]
-                            if (value_index := r.find(value)) >= 0: # value was found in previous answer
-                                value = p[value_index:value_index+len(value)]
-                        params[key] = value
-                    return Message(msg.path, params)
+                    return Message(path, {take(key, prev_responses): take(value, prev_responses) for key, value in params})
                 return call
-            return [shield_message(msg) for msg, _ in self.messages]
+            return [shield_message(path, params) for path, params in resolved]
         return attack
-    
-    def generate_script(self, usernames:list[str]) -> str:
+
+    @metrics.timed("generate_script")
+    def generate_script(self, usernames:list[str], resolved: Resolved = None) -> str:
         script = "def attack(team: Team, username: str) -> list[str]:\n"
         script += "    resps = []\n"
-        msgs, resps = zip(*self.messages)
-
-        for i,msg in enumerate(msgs):
-            params = []
-            for key, value in msg.param.items():
-                keystr, valuestr = f"\"{key}\"", f"\"{value}\""
-                if key in usernames: keystr = "username"
-                if value in usernames: valuestr = "username"
-                for j,r in enumerate(resps[:i]):
-                    if (key_index := r.find(key)) >= 0: # key was found in previous answer
-                        keystr = f"resps[{j}][{key_index}:{key_index+len(key)}]"
-                    if (value_index := r.find(value)) >= 0: # value was found in previous answer
-                        valuestr = f"resps[{j}][{value_index}:{value_index+len(key)}]"
-                params.append(f"{keystr}: {valuestr}")
-            params = f"{{{', '.join(params)}}}"
-            script += f"    resps.append(team.manServer.response(Message(path='{msg.path}', param={params})))\n"
+        render = lambda source: dumps(source) if isinstance(source, str) else str(source)
+        for path, params in self.resolve(usernames) if resolved is None else resolved:
+            params = f"{{{', '.join(f'{render(key)}: {render(value)}' for key, value in params)}}}"
+            script += f"    resps.append(team.manServer.response(Message(path={path!r}, param={params})))\n"
         return script
- 
+
 class ShieldMAN(MAN):
+    """MAN that records all traffic and splits it into attacks by session.
 
-    def __init__(self, flag_regex: str, server: Server = None):
+    A session is identified by its tokens: cookies sent with any request, usernames sent to
+    register/login and tokens handed out in register/login responses. Every token maps to its
+    attack, so a message is sorted into its attack by a single dict lookup. A session that
+    was idle for longer than idle_timeout seconds starts a new attack.
+
+    Messages are kept as compact records. Once they use more than memory_budget bytes, the
+    least recently active attacks without flags are evicted. With a CaptureLog, every message
+    is also appended to disk and survives restarts and evictions. With a FlagFirewall, our own
+    flags placed through this MAN are reported before a response leaves, or blocked or redacted
+    in the other modes of the firewall. After start_pipeline(), all of the above except the
+    firewall runs on a background thread and the request path only enqueues the message.
+    Capturing and dropping attacks hold `lock`, threads reading attacks or sessions while
+    messages are captured have to hold it as well.
+
+    Once someone subscribes, the provenance of every attack is resolved message by message. As
+    soon as a response contains a flag, the exploit up to that message is published. The token
+    index this builds counts against memory_budget like the records themselves.
+    """
+    session_keys = {"cookie"}
+    login_paths = {"register", "login"}
+    login_keys = {"username"}
+    token_regex = re.compile(r"[0-9A-Za-z_-]{16,}")
+
+    def __init__(self, flag_regex: str | list[str], server: Server = None, idle_timeout: float = 30.0, clock: Callable[[], float] = monotonic,
+                 memory_budget: int = None, log: CaptureLog = None, firewall: FlagFirewall = None):
         super().__init__(server = server)
         self.flag_regex = flag_regex
+        self.scanner = FlagScanner(*([flag_regex] if isinstance(flag_regex, str) else flag_regex))
+        self.idle_timeout = idle_timeout
+        self.clock = clock
         self.attacks = [Attack()]
+        self.sessions: dict[str, Attack] = {}
+        self.evictable: OrderedDict[uuid4, Attack] = OrderedDict() # attacks without flags, least recently active first
+        self._prune_at = 1024
+        self.store = CaptureStore(memory_budget)
+        self.log = log
+        self.firewall = firewall
+        self.pipeline: CapturePipeline = None
+        self.usernames: set[str] = set() # accounts our flags were placed in
+        self.exploits = ExploitCache()
+        self.subscribers: list[Callable[[Attack, Exploit, list[str]], object]] = []
+        self.lock = RLock()
 
     def response(self, msg:Message):
+        start = perf_counter()
         resp = self.server.response(msg)
-        atk = self.attacks[-1]
-        atk.messages.append((msg, resp))
-        atk.flags.extend(findall(self.flag_regex, resp))
+        proxied = perf_counter()
+        self.record(msg, resp)
+        if self.firewall is not None: resp = self.firewall.filter(resp)
+        end = perf_counter()
+        metrics.observe("proxy", proxied - start)
+        metrics.observe("overhead", end - proxied) # added to the response latency by SHIELD
         return resp
 
+    def record(self, msg: Message, resp: str):
+        """Captures a message answered elsewhere, through the pipeline if it is running"""
+        if self.pipeline is None: self.capture(msg, resp)
+        else: self.pipeline.put(msg, resp, self.clock(), time())
+
+    def place_flag(self, username: str, flag: str):
+        super().place_flag(username, flag)
+        self.usernames.add(username)
+        if self.firewall is not None: self.firewall.add(flag)
+
+    def new_tick(self):
+        if self.firewall is not None: self.firewall.rotate()
+
+    def subscribe(self, callback: Callable[[Attack, Exploit, list[str]], object]):
+        """callback(attack, exploit, flags) is called with every exploit that just yielded flags"""
+        self.subscribers.append(callback)
+
+    def subscribe_queue(self, queue: asyncio.Queue, loop: asyncio.AbstractEventLoop = None):
+        """Puts (attack, exploit, flags) into an asyncio queue, safe to use with the capture pipeline"""
+        loop = asyncio.get_running_loop() if loop is None else loop
+        self.subscribe(lambda *item: loop.call_soon_threadsafe(queue.put_nowait, item))
+
+    def publish(self, atk: Attack, flags: list[str]):
+        start = perf_counter()
+        exploit = self.exploits.lookup(atk, list(self.usernames), atk.resolved[:])
+        metrics.observe("publish", perf_counter() - start)
+        for callback in self.subscribers:
+            callback(atk, exploit, flags)
+
+    def start_pipeline(self, maxsize: int = 65536, overflow: str = "drop") -> CapturePipeline:
+        if self.pipeline is None:
+            self.pipeline = CapturePipeline(self.capture, maxsize, overflow)
+        return self.pipeline
+
+    def stop_pipeline(self):
+        """Processes all enqueued messages and returns to capturing on the request path"""
+        if self.pipeline is not None:
+            self.pipeline.close()
+            self.pipeline = None
+
+    def capture(self, msg: Message, resp: str, timestamp: float = None, wall: float = None) -> Attack:
+        """Sorts a message and its response into the attack of its session.
+        timestamp is on the session clock, a replayed timestamp is wall time as well, so it is
+        logged unless wall is given."""
+        with self.lock:
+            return self._capture(msg, resp, timestamp, wall)
+
+    def _capture(self, msg: Message, resp: str, timestamp: float = None, wall: float = None) -> Attack:
+        start = perf_counter()
+        now = self.clock() if timestamp is None else timestamp
+        tokens = self.session_tokens(msg)
+        atk = self.find_attack(tokens, now)
+        atk.messages.append(self.store.record(atk.id, msg, resp))
+        scan = perf_counter()
+        flags = self.scanner.scan(resp)
+        metrics.observe("scan", perf_counter() - scan)
+        if flags:
+            atk.flags.extend(flags)
+            metrics.count("flags", len(flags))
+            self.evictable.pop(atk.id, None)
+        elif not atk.hasFlag:
+            self.evictable[atk.id] = atk
+            self.evictable.move_to_end(atk.id)
+        atk.last_seen = now
+        if self.subscribers:
+            indexed = atk._provenance.size if atk._provenance is not None else 0
+            atk.advance(self.usernames)
+            self.store.charge(atk.id, atk.provenance.size - indexed)
+            if flags: self.publish(atk, flags)
+        if self.log is not None:
+            self.log.append(atk.id, msg, resp, timestamp if wall is None else wall, tokens[0] if tokens else None)
+        if msg.path in self.login_paths:
+            tokens.extend(self.token_regex.findall(resp))
+        for token in tokens:
+            self.sessions[token] = atk
+        if len(self.sessions) > self._prune_at:
+            self.prune_sessions(now)
+        if self.store.over_budget():
+            self.evict(keep = atk)
+        metrics.count("messages")
+        metrics.observe("capture", perf_counter() - start)
+        return atk
+
+    def session_tokens(self, msg: Message) -> list[str]:
+        keys = self.session_keys | self.login_keys if msg.path in self.login_paths else self.session_keys
+        return [str(value) for key, value in msg.param.items() if key.rpartition(".")[2] in keys and value] # nested keys like auth.cookie
+
+    def find_attack(self, tokens: list[str], now: float) -> Attack:
+        for token in tokens:
+            if (atk := self.sessions.get(token)) is not None and now - atk.last_seen <= self.idle_timeout:
+                return atk
+        if not tokens: # anonymous messages belong to the latest attack
+            atk = self.attacks[-1]
+            if not atk.messages or now - atk.last_seen <= self.idle_timeout:
+                return atk
+        return self.new_attack()
+
+    def new_attack(self) -> Attack:
+        if self.attacks[-1].messages:
+            self.attacks.append(Attack())
+            metrics.count("attacks")
+        return self.attacks[-1]
+
+    def prune_sessions(self, now: float):
+        """Drops tokens of idle sessions, amortized over index growth"""
+        self.sessions = {token: atk for token, atk in self.sessions.items() if now - atk.last_seen <= self.idle_timeout}
+        self._prune_at = max(1024, 2 * len(self.sessions))
+
+    def evict(self, watermark: float = 0.9, keep: Attack = None):
+        """Drops the least recently active attacks without flags until the store is below watermark * budget.
+        keep, the attack just captured into, and the latest attack are never evicted."""
+        with self.lock:
+            keep, current, evicted = (keep or self.attacks[-1]).id, self.attacks[-1].id, set()
+            for id, atk in self.evictable.items():
+                if self.store.size <= watermark * self.store.budget: break
+                if id == keep or id == current: continue
+                self.store.release(id, len(atk.messages))
+                evicted.add(id)
+            self.store.evicted += len(evicted)
+            self.drop(evicted)
+
+    def pop_idle(self, now: float) -> list[Attack]:
+        """Removes and returns all attacks whose session went idle"""
+        with self.lock:
+            idle = [atk for atk in self.attacks if atk.messages and now - atk.last_seen > self.idle_timeout]
+            for atk in idle:
+                self.store.release(atk.id, len(atk.messages))
+            self.drop({atk.id for atk in idle})
+        return idle
+
+    def drop(self, ids: set):
+        if not ids: return
+        with self.lock:
+            for id in ids:
+                self.evictable.pop(id, None)
+            self.attacks = [atk for atk in self.attacks if atk.id not in ids] or [Attack()]
+            self.sessions = {token: atk for token, atk in self.sessions.items() if atk.id not in ids}
+
+    def memory(self) -> dict[str, int]:
+        return self.store.memory()
+
     def end_attack(self):
-        self.attacks.append(Attack())
+        with self.lock:
+            self.sessions.clear()
+            self.attacks.append(Attack())
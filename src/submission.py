@@ -0,0 +1,105 @@
+"""Bulk flag submission of the Gameserver.
+
+Teams submit flags in batches without naming the defender, it is read from the flag itself. Every
+flag gets a Status, the numbers match the Status enum of protos/flag_submission. A flag is accepted
+once per tick and pair, the pair of a flag already names its attacker, so duplicates are tracked in
+a byte per pair of every tick in the window. Every team may submit `rate` flags per second with
+bursts of up to `burst` flags, the rest of a batch is rejected as RATE_LIMITED. Accepted flags are
+booked on the scoreboard of the game.
+
+Every Gameserver has one FlagSubmission, shared by all ways flags are submitted, so a flag is
+never scored twice. Submissions may come from the event loop and from threads at once.
+
+    for status, info in game.submission.submit("team1", flags): ...
+"""
+from enum import IntEnum
+from threading import Lock
+from time import monotonic
+from typing import TYPE_CHECKING, Iterable
+
+from src.flags import FlagInfo
+
+if TYPE_CHECKING:
+    from src.game import Gameserver
+
+
+class Status(IntEnum):
+    INVALID = 0
+    ACCEPTED = 1
+    DUPLICATE = 2
+    OWN = 3
+    RATE_LIMITED = 4
+
+
+class TokenBucket:
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = monotonic()
+
+    def take(self, count: int) -> int:
+        """Takes up to count tokens, returns how many were available"""
+        now = monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        taken = min(count, int(self.tokens))
+        self.tokens -= taken
+        return taken
+
+
+class FlagSubmission:
+
+    def __init__(self, game: "Gameserver", rate: float | None = 1000.0, burst: int = 20000):
+        self.game = game
+        self.rate = rate # flags per second and team, None for no limit
+        self.burst = burst
+        self.buckets: dict[str, TokenBucket] = {}
+        self.submitted: dict[int, bytearray] = {} # tick number: a byte per pair, set once accepted
+        self.counts = dict.fromkeys(Status, 0)
+        self.lock = Lock()
+
+    def submit(self, team: str, flags: Iterable[str]) -> list[tuple[Status, FlagInfo | None]]:
+        """Status of every flag, with who it was stolen from for valid flags"""
+        if team not in self.game.teams: raise KeyError(f"Unknown team {team}!")
+        flags = flags if isinstance(flags, list) else list(flags)
+        with self.lock:
+            return self._submit(team, flags)
+
+    def _submit(self, team: str, flags: list[str]) -> list[tuple[Status, FlagInfo | None]]:
+        if self.rate is None: allowed = len(flags)
+        else:
+            if (bucket := self.buckets.get(team)) is None:
+                bucket = self.buckets[team] = TokenBucket(self.rate, self.burst)
+            allowed = bucket.take(len(flags))
+        store, own = self.game.store, self.game.store.ids[team]
+        self._expire()
+        verdicts = []
+        for flag in flags[:allowed]:
+            if (found := store.locate(flag)) is None:
+                verdicts.append((Status.INVALID, None))
+                continue
+            tick, pair = found
+            attacker, defender = divmod(pair, tick.teams)
+            if attacker != own: verdicts.append((Status.INVALID, None)); continue
+            info = FlagInfo(team, store.names[defender], tick.number, tick.username(pair))
+            if defender == own: verdicts.append((Status.OWN, info)); continue
+            if (seen := self.submitted.get(tick.number)) is None:
+                seen = self.submitted[tick.number] = bytearray(tick.teams * tick.teams)
+            if seen[pair]: verdicts.append((Status.DUPLICATE, info)); continue
+            seen[pair] = 1
+            verdicts.append((Status.ACCEPTED, info))
+            self.game.scoreboard.capture(info)
+        verdicts += [(Status.RATE_LIMITED, None)] * (len(flags) - allowed)
+        for status, _ in verdicts:
+            self.counts[status] += 1
+        return verdicts
+
+    def _expire(self):
+        """Drops the submissions of ticks that left the window"""
+        if not self.submitted or not self.game.store.ticks: return
+        oldest = self.game.store.ticks[0].number
+        for number in [number for number in self.submitted if number < oldest]:
+            del self.submitted[number]
@@ -0,0 +1,248 @@
+"""SHIELD in front of a service running as its own process.
+
+TcpProxy accepts connections on a port and opens a connection to the upstream service for each
+of them. Both directions are BufferedProtocols: the event loop reads straight into one
+preallocated buffer per direction and a memoryview of it is written to the other side, so
+forwarding does not copy or allocate as long as the receiving socket keeps up. Each connection
+is a session: what the client sent until the service answered becomes the `data` param of a
+Message on path "tcp", the answer until the client sends again its response. Both are captured
+by the ShieldMAN, together with the connection id as session token.
+
+    python -m src.tcp_proxy --listen 0.0.0.0:8080 --upstream 127.0.0.1:8081 --log capture.log
+"""
+from argparse import ArgumentParser
+import asyncio
+from itertools import count
+import sys
+
+from src.capture_log import CaptureLog
+from src.game import Gameserver
+from src.metrics import metrics
+from src.server import Message
+from src.shield import ShieldMAN
+
+ENCODING = "latin-1" # every byte maps to one char and back
+
+
+def address(spec: str) -> tuple[str, int]:
+    host, _, port = spec.rpartition(":")
+    return host.strip("[]") or "0.0.0.0", int(port)
+
+
+class Connection:
+    """Turn being assembled for one proxied connection"""
+    __slots__ = ("id", "peer", "request", "response", "sent", "received", "turns", "truncated", "client", "upstream")
+
+    def __init__(self, id: str, peer: tuple):
+        self.id = id
+        self.peer = peer
+        self.request = bytearray()
+        self.response = bytearray()
+        self.sent = self.received = self.turns = 0
+        self.truncated = False
+        self.client: Pipe = None
+        self.upstream: Pipe = None
+
+
+class Pipe(asyncio.BufferedProtocol):
+    """One side of a proxied connection, everything it receives is written to the other side"""
+
+    def __init__(self, proxy: "TcpProxy", conn: Connection, upstream: bool):
+        self.proxy = proxy
+        self.conn = conn
+        self.upstream = upstream # receives from the service
+        self.buffer = memoryview(bytearray(proxy.buffer_size))
+        self.transport: asyncio.Transport = None
+        self.other: Pipe = None
+        self.eof = False
+
+    def connection_made(self, transport: asyncio.Transport):
+        self.transport = transport
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        return self.buffer
+
+    def buffer_updated(self, nbytes: int):
+        chunk = self.proxy.forward(self.conn, self.buffer[:nbytes], self.upstream)
+        dst = self.other.transport
+        dst.write(chunk)
+        if dst.get_write_buffer_size() and isinstance(chunk, memoryview) and chunk.obj is self.buffer.obj: # redacted chunks are copies
+            self.buffer = memoryview(bytearray(len(self.buffer))) # the transport may still hold the old one
+
+    def eof_received(self) -> bool:
+        self.eof = True
+        if self.other.eof or not self.other.transport.can_write_eof(): self.other.transport.close()
+        else: self.other.transport.write_eof() # half close, the other direction keeps running
+        return not self.other.eof # keeps the transport open while the other direction runs
+
+    def connection_lost(self, exc: Exception):
+        if self.other is not None and self.other.transport is not None: self.other.transport.close()
+        self.proxy.finish(self.conn)
+
+    def pause_writing(self):
+        self.other.transport.pause_reading()
+
+    def resume_writing(self):
+        self.other.transport.resume_reading()
+
+
+class ClientPipe(Pipe):
+    """Side of the client, holds back its data until the connection to the service is up"""
+
+    def connection_made(self, transport: asyncio.Transport):
+        super().connection_made(transport)
+        transport.pause_reading()
+        self.proxy.spawn(self.proxy.connect(self))
+
+
+class TcpProxy:
+    """Asyncio man in the middle between clients and one upstream TCP service.
+
+    Every capture runs on the event loop, start the pipeline of the ShieldMAN to keep it off the
+    forwarding path. With a FlagFirewall, every chunk from the service is filtered before it is
+    forwarded, flags split across two chunks are not found. Turns longer than max_turn bytes are
+    forwarded completely but captured truncated.
+    """
+
+    session_key = "connection"
+
+    def __init__(self, shield: ShieldMAN, upstream: tuple[str, int], listen: tuple[str, int] = ("0.0.0.0", 0),
+                 buffer_size: int = 16384, max_turn: int = 1 << 20, backlog: int = 4096):
+        self.shield = shield
+        shield.session_keys = shield.session_keys | {self.session_key} # connection ids as session tokens of this shield only
+        self.upstream = upstream
+        self.listen = listen
+        self.buffer_size = buffer_size
+        self.max_turn = max_turn
+        self.backlog = backlog
+        self.server: asyncio.Server = None
+        self.address: tuple[str, int] = None
+        self.connections: dict[str, Connection] = {}
+        self.tasks: set[asyncio.Task] = set()
+        self.ids = count()
+        self.accepted = self.refused = self.bytes_up = self.bytes_down = 0
+
+    async def start(self) -> tuple[str, int]:
+        """Accepts connections in the background, returns the bound address"""
+        self.server = await asyncio.get_running_loop().create_server(self.accept, *self.listen, backlog = self.backlog)
+        self.address = self.server.sockets[0].getsockname()[:2]
+        return self.address
+
+    def spawn(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    def accept(self) -> ClientPipe:
+        self.accepted += 1
+        conn = Connection(f"tcp-{next(self.ids)}", None)
+        self.connections[conn.id] = conn
+        conn.client = ClientPipe(self, conn, False)
+        return conn.client
+
+    async def connect(self, client: ClientPipe):
+        conn = client.conn
+        conn.peer = client.transport.get_extra_info("peername")
+        conn.upstream = upstream = Pipe(self, conn, True)
+        start = asyncio.get_running_loop().time()
+        try:
+            await asyncio.get_running_loop().create_connection(lambda: upstream, *self.upstream)
+        except OSError:
+            self.refused += 1
+            client.transport.close()
+            return
+        metrics.observe("tcp_connect", asyncio.get_running_loop().time() - start)
+        client.other, upstream.other = upstream, client
+        if client.transport.is_closing(): upstream.transport.close()
+        else: client.transport.resume_reading()
+
+    def forward(self, conn: Connection, chunk: memoryview, upstream: bool) -> memoryview | bytes:
+        """Collects a chunk into the current turn, returns what is forwarded"""
+        n = len(chunk)
+        if not upstream:
+            if conn.response: self.turn(conn)
+            self.collect(conn, conn.request, chunk)
+            conn.sent += n
+            self.bytes_up += n
+            return chunk
+        self.collect(conn, conn.response, chunk)
+        conn.received += n
+        self.bytes_down += n
+        if self.shield.firewall is None: return chunk
+        return self.shield.firewall.filter(str(chunk, ENCODING)).encode(ENCODING)
+
+    def collect(self, conn: Connection, turn: bytearray, chunk: memoryview):
+        if len(turn) + len(chunk) <= self.max_turn: turn += chunk
+        else:
+            turn += chunk[:self.max_turn - len(turn)]
+            conn.truncated = True
+
+    def turn(self, conn: Connection):
+        """Hands the request and response collected so far to the ShieldMAN"""
+        if not conn.request and not conn.response: return
+        msg = Message("tcp", {self.session_key: conn.id, "data": conn.request.decode(ENCODING)})
+        self.shield.record(msg, conn.response.decode(ENCODING))
+        conn.request.clear()
+        conn.response.clear()
+        conn.turns += 1
+        metrics.count("tcp_turns")
+
+    def finish(self, conn: Connection):
+        if self.connections.pop(conn.id, None) is not None: self.turn(conn)
+
+    async def serve_forever(self):
+        if self.server is None: await self.start()
+        await self.server.serve_forever()
+
+    async def close(self):
+        """Stops accepting and closes all proxied connections"""
+        if self.server is not None: self.server.close()
+        for conn in list(self.connections.values()):
+            for pipe in (conn.client, conn.upstream):
+                if pipe is not None and pipe.transport is not None: pipe.transport.close()
+        for task in list(self.tasks): task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions = True)
+        if self.server is not None:
+            await self.server.wait_closed()
+            self.server = None
+
+    def stats(self) -> dict[str, int]:
+        return {"active": len(self.connections), "accepted": self.accepted, "refused": self.refused,
+                "bytes_up": self.bytes_up, "bytes_down": self.bytes_down}
+
+
+def main(argv: list[str] = None):
+    parser = ArgumentParser(prog = "python -m src.tcp_proxy", description = "Capture the traffic of a TCP service into SHIELD")
+    parser.add_argument("--listen", default = "0.0.0.0:8080", help = "host:port to accept clients on")
+    parser.add_argument("--upstream", required = True, help = "host:port of the service")
+    parser.add_argument("--flag-regex", action = "append", help = "flag format, may be given multiple times")
+    parser.add_argument("--idle-timeout", type = float, default = 30.0, help = "seconds after which a session ends")
+    parser.add_argument("--log", default = None, help = "capture log to append all traffic to")
+    parser.add_argument("--buffer-size", type = int, default = 16384, help = "bytes per direction and connection")
+    args = parser.parse_args(argv)
+
+    log = CaptureLog(args.log) if args.log else None
+    shield = ShieldMAN(args.flag_regex or Gameserver.flag_regex, idle_timeout = args.idle_timeout, log = log)
+    shield.start_pipeline()
+    proxy = TcpProxy(shield, address(args.upstream), address(args.listen), buffer_size = args.buffer_size)
+
+    async def run():
+        print("listening on {}:{}".format(*await proxy.start()), flush = True)
+        try:
+            await proxy.serve_forever()
+        finally:
+            await proxy.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        shield.stop_pipeline()
+        if log is not None: log.close()
+        print(proxy.stats(), file = sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""Game loop driving the Gameserver tick by tick.
+
+Every tick runs its stages one after another. A stage gets a share of the tick length as budget
+and has to finish before min(stage start + budget, end of the tick). Synchronous stages run in a
+daemon thread, so the loop keeps its schedule even if one of them hangs. Threads cannot be
+cancelled, the stage is reported as timed out and its thread keeps running in the background.
+Until it returns, the stage is skipped in later ticks, so a hung rotate never runs twice at once.
+Coroutine stages are cancelled on timeout. The exploit stage gives its runners an earlier
+deadline and collects what they found without cancelling them, a runner still busy with an
+earlier tick is not started again. What each stage consumed of the tick is kept per tick.
+
+    scheduler = TickScheduler(game, tick_length = 60.0, runners = [ExploitRunner(game, mist)])
+    asyncio.run(scheduler.run(ticks = 10))
+"""
+import asyncio
+from dataclasses import dataclass, field
+from inspect import iscoroutinefunction
+from itertools import count
+import logging
+from threading import Thread
+from time import perf_counter
+from typing import Callable
+
+from src.flags import FlagInfo
+from src.game import Gameserver
+from src.metrics import metrics
+from src.runner import ExploitRunner, Outcome
+from src.submission import Status
+
+logger = logging.getLogger(__name__)
+RESERVE = 0.1 # share of the exploit stage kept to collect the outcomes of the runners
+
+
+def in_thread(func: Callable, *args) -> tuple[asyncio.Future, Thread]:
+    """Runs func on a daemon thread. Unlike asyncio.to_thread, a call that hangs neither keeps
+    asyncio.run from returning nor the interpreter from exiting."""
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    def settle(result, error):
+        if future.done(): return
+        if error is None: future.set_result(result)
+        else: future.set_exception(error)
+    def run():
+        try: result, error = func(*args), None
+        except Exception as e: result, error = None, e
+        try: loop.call_soon_threadsafe(settle, result, error)
+        except RuntimeError: pass # the loop is closed, nobody waits for the result anymore
+    thread = Thread(target = run, name = f"tick-{getattr(func, '__name__', 'stage')}", daemon = True)
+    thread.start()
+    return future, thread
+
+
+@dataclass
+class TickState:
+    """Passed to every stage of a tick, stages hand their results on through it"""
+    number: int
+    started: float # perf_counter
+    deadline: float = 0.0 # of the running stage
+    results: dict[str, object] = field(default_factory=dict)
+
+
+@dataclass
+class Stage:
+    name: str
+    run: Callable[[TickState], object] # function or coroutine function
+    budget: float # share of the tick length
+
+
+@dataclass
+class StageReport:
+    name: str
+    elapsed: float = 0.0
+    budget: float = 0.0 # seconds
+    share: float = 0.0 # of the tick length
+    timed_out: bool = False
+    error: str = None
+
+    @property
+    def overrun(self) -> float:
+        return max(0.0, self.elapsed - self.budget)
+
+
+@dataclass
+class TickReport:
+    number: int
+    length: float
+    started: float
+    elapsed: float = 0.0
+    lag: float = 0.0 # seconds the tick started late
+    stages: list[StageReport] = field(default_factory=list)
+
+    @property
+    def overrun(self) -> float:
+        return max(0.0, self.lag + self.elapsed - self.length)
+
+    def summary(self) -> dict:
+        return {"tick": self.number, "elapsed": self.elapsed, "lag": self.lag, "overrun": self.overrun,
+                "stages": {s.name: {"elapsed": s.elapsed, "share": s.share, "overrun": s.overrun, "timed_out": s.timed_out, "error": s.error}
+                           for s in self.stages}}
+
+
+class TickScheduler:
+    """Runs the stages of every tick on a fixed schedule of tick_length seconds.
+
+    Without explicit stages, a tick rotates the flags, places them on all teams, runs the
+    ExploitRunners against the new flags and submits what they found to the scoreboard. Ticks are
+    scheduled from the start of the game, a tick that overran its length is followed by the next
+    one right away. Once the schedule is a full tick behind, the missed ticks are skipped and the
+    schedule restarts with the next tick, which would otherwise get deadlines in the past.
+    """
+
+    def __init__(self, game: Gameserver, tick_length: float = 60.0, runners: list[ExploitRunner] = (), stages: list[Stage] = None):
+        self.game = game
+        self.tick_length = tick_length
+        self.runners = list(runners)
+        self.stages = self.default_stages() if stages is None else stages
+        if sum(stage.budget for stage in self.stages) > 1.0: raise ValueError("Stage budgets exceed the tick length!")
+        self.reports: list[TickReport] = []
+        self.ticks = 0
+        self.skipped = 0 # ticks of the schedule dropped after overruns
+        self.running = False
+        self._abandoned: dict[str, Thread] = {} # stage: thread still running after its timeout
+        self._exploiting: dict[str, Thread] = {} # team: thread of its runner
+
+    def default_stages(self) -> list[Stage]:
+        return [Stage("rotate", self.rotate, 0.05), Stage("place", self.place, 0.3),
+                Stage("exploit", self.exploit, 0.5), Stage("submit", self.submit, 0.1)]
+
+    def rotate(self, state: TickState):
+        return self.game.rotate_flags()
+
+    def place(self, state: TickState):
+        return self.game.place_flags(state.results["rotate"], timeout = max(0.0, state.deadline - perf_counter()))
+
+    async def exploit(self, state: TickState) -> dict[str, list[Outcome]]:
+        """Outcomes of every runner that returned in time. Runners get a deadline RESERVE of the
+        stage earlier, so what they found is collected before the stage times out."""
+        reserve, runs = RESERVE * max(0.0, state.deadline - perf_counter()), {}
+        for runner in self.runners:
+            name = runner.team.name
+            if (thread := self._exploiting.get(name)) is not None and thread.is_alive():
+                logger.warning("runner of %s still busy with an earlier tick, skipped in tick %d", name, state.number)
+                continue
+            runs[name], self._exploiting[name] = in_thread(runner.run_tick, -1, state.deadline - reserve)
+        if runs: await asyncio.wait(runs.values(), timeout = max(0.0, state.deadline - reserve / 2 - perf_counter()))
+        outcomes = {}
+        for name, run in runs.items():
+            if not run.done(): logger.warning("runner of %s did not return in tick %d", name, state.number)
+            elif run.exception() is not None: logger.error("runner of %s failed in tick %d: %r", name, state.number, run.exception())
+            else: outcomes[name] = run.result()
+        return outcomes
+
+    def submit(self, state: TickState) -> dict[str, list[FlagInfo]]:
+        """Flags of the runners that were accepted and booked on the scoreboard"""
+        submitted = {}
+        for team, outcomes in state.results.get("exploit", {}).items():
+            flags = list(dict.fromkeys(flag for outcome in outcomes for flag in outcome.flags))
+            submitted[team] = [info for status, info in self.game.submission.submit(team, flags) if status == Status.ACCEPTED]
+        return submitted
+
+    async def _stage(self, stage: Stage, state: TickState, tick_end: float) -> StageReport:
+        start = perf_counter()
+        report = StageReport(stage.name, budget = stage.budget * self.tick_length)
+        state.deadline = min(start + report.budget, tick_end)
+        if (hung := self._abandoned.get(stage.name)) is not None:
+            if hung.is_alive():
+                report.error = "Stage still runs since an earlier tick!"
+                return report
+            del self._abandoned[stage.name]
+        if iscoroutinefunction(stage.run): call, thread = stage.run(state), None
+        else: call, thread = in_thread(stage.run, state)
+        try:
+            state.results[stage.name] = await asyncio.wait_for(asyncio.shield(call) if thread is not None else call, max(0.0, state.deadline - start))
+        except asyncio.TimeoutError:
+            report.timed_out = True
+            if thread is not None: self._abandoned[stage.name] = thread
+        except Exception as e:
+            report.error = f"{type(e).__name__}: {e}"
+            logger.exception("stage %s of tick %d failed", stage.name, state.number)
+        report.elapsed = perf_counter() - start
+        report.share = report.elapsed / self.tick_length
+        metrics.observe(f"tick:{stage.name}", report.elapsed)
+        return report
+
+    async def tick(self, scheduled: float = None) -> TickReport:
+        """Runs all stages of the next tick once"""
+        start = perf_counter()
+        scheduled = start if scheduled is None else scheduled
+        report = TickReport(self.ticks, self.tick_length, start, lag = max(0.0, start - scheduled))
+        state, tick_end = TickState(self.ticks, start), scheduled + self.tick_length
+        for stage in self.stages:
+            report.stages.append(await self._stage(stage, state, tick_end))
+        report.elapsed = perf_counter() - start
+        self.ticks += 1
+        self.reports.append(report)
+        if report.overrun:
+            logger.warning("tick %d overran by %.3fs: %s", report.number, report.overrun,
+                           ", ".join(f"{s.name} {s.share:.0%}" for s in report.stages))
+        return report
+
+    async def run(self, ticks: int = None):
+        """Runs ticks on schedule until `ticks` ticks ran or stop() was called"""
+        self.running, epoch = True, perf_counter()
+        for n in count() if ticks is None else range(ticks):
+            if not self.running: break
+            scheduled = epoch + n * self.tick_length
+            if (wait := scheduled - perf_counter()) > 0: await asyncio.sleep(wait)
+            elif -wait >= self.tick_length:
+                missed = int(-wait // self.tick_length)
+                logger.warning("tick %d is %.3fs behind schedule, skipping %d ticks", self.ticks, -wait, missed)
+                self.skipped += missed
+                epoch, scheduled = epoch - wait, scheduled - wait
+            await self.tick(scheduled)
+        self.running = False
+
+    def stop(self):
+        self.running = False
@@ -0,0 +1,39 @@
+from time import time
+from uuid import uuid4
+
+from src.capture_log import CaptureLog, CaptureLogReader
+from src.server import Message, Server
+from src.shield import ShieldMAN
+
+
+def session(shield: ShieldMAN) -> str:
+    username = uuid4().hex
+    shield.place_flag(username, f"flag{{{uuid4().hex}}}")
+    shield.response(Message("register", {"username": username, "password": "1234"}))
+    cookie = shield.response(Message("login", {"username": username, "password": "1234"}))[22:]
+    shield.response(Message("read", {"cookie": cookie}))
+    return cookie
+
+
+def test_pipelined_captures_are_logged_with_wall_time(tmp_path):
+    path, start = str(tmp_path / "capture.log"), time()
+    with CaptureLog(path) as log:
+        shield = ShieldMAN("flag{[0-9a-f]{32}}", Server(), log = log)
+        shield.start_pipeline()
+        session(shield)
+        shield.stop_pipeline()
+    with CaptureLogReader(path) as reader:
+        assert len(reader) == 3
+        assert all(start <= entry.timestamp <= time() for entry in reader)
+        assert len(list(reader.between(start, time()))) == 3
+
+
+def test_records_are_found_by_session(tmp_path):
+    path = str(tmp_path / "capture.log")
+    with CaptureLog(path) as log:
+        shield = ShieldMAN("flag{[0-9a-f]{32}}", Server(), log = log)
+        first, second = session(shield), session(shield)
+    with CaptureLogReader(path) as reader:
+        assert [entry.message.path for entry in reader.session(first)] == ["read"]
+        assert [entry.message.param for entry in reader.session(second)] == [{"cookie": second}]
+        assert reader.session("unknown") == []
@@ -0,0 +1,39 @@
+from uuid import uuid4
+
+from src.fingerprint import ExploitCache, fingerprint
+from src.server import Message, Server
+from src.shield import ShieldMAN
+
+
+def attack(shield: ShieldMAN, payload: str):
+    username, flag = uuid4().hex, f"flag{{{uuid4().hex}}}"
+    shield.place_flag(username, flag)
+    shield.response(Message("register", {"username": username, "password": "1234"}))
+    cookie = shield.response(Message("login", {"username": username, "password": "1234"}))[22:]
+    shield.response(Message("message", {"cookie": cookie, "message": payload}))
+    shield.end_attack()
+
+
+def test_payloads_differing_in_literals_get_their_own_exploits():
+    shield = ShieldMAN("flag{[0-9a-f]{32}}", Server())
+    published = []
+    shield.subscribe(lambda atk, exploit, flags: published.append(exploit))
+    attack(shield, "hello")
+    attack(shield, "'; DROP TABLE x; --")
+    hello, drop = published
+    assert hello.fingerprint != drop.fingerprint
+    assert '"hello"' in hello.script and "DROP TABLE" not in hello.script
+    assert "DROP TABLE" in drop.script and '"hello"' not in drop.script
+    assert shield.exploits.stats()["hits"] == 0
+
+
+def test_replays_with_other_accounts_share_the_exploit():
+    shield = ShieldMAN("flag{[0-9a-f]{32}}", Server())
+    attack(shield, "hello")
+    attack(shield, "hello")
+    first, second = [atk for atk in shield.attacks if atk.hasFlag]
+    usernames = list(shield.usernames)
+    assert fingerprint(first.resolve(usernames)) == fingerprint(second.resolve(usernames))
+    cache = ExploitCache()
+    assert cache.lookup(first, usernames) is cache.lookup(second, usernames)
+    assert cache.stats()["hits"] == 1
@@ -0,0 +1,92 @@
+from os import urandom
+
+import pytest
+
+from src.flags import FLAG_SIZE, FlagStore, decode_flag
+from src.game import Gameserver
+from src.man import MAN, Team
+from src.server import Server
+from src.submission import Status
+
+
+def add_tick(store: FlagStore):
+    pairs = len(store.names) ** 2
+    return store.add_tick(urandom(pairs * FLAG_SIZE), urandom(pairs * FLAG_SIZE))
+
+
+def team(name: str) -> Team:
+    return Team(name, server := Server(), MAN(server))
+
+
+@pytest.mark.parametrize("window", [None, 0, 0x10000])
+def test_windows_the_tick_header_cannot_tell_apart_are_refused(window):
+    with pytest.raises(ValueError):
+        FlagStore(window)
+
+
+def test_flags_stay_valid_across_the_tick_wraparound():
+    store = FlagStore(5)
+    store.add_team("a"); store.add_team("b")
+    old = decode_flag(add_tick(store).flag(1)) # tick 0, header number 0
+    flags = {}
+    for _ in range(0x10000 + 2):
+        tick = add_tick(store)
+        flags[tick.number] = decode_flag(tick.flag(1))
+    assert [tick.number for tick in store] == [0xFFFE, 0xFFFF, 0x10000, 0x10001, 0x10002]
+    for number in range(0xFFFE, 0x10003):
+        assert store.lookup(flags[number]).tick == number
+    assert store.lookup(flags[0xFFFD]) is None # expired
+    assert store.lookup(old) is None # same header number as tick 0x10000, other flag
+    assert store.lookup(flags[1]) is None
+
+
+def test_flags_expire_at_the_window_edge():
+    store = FlagStore(3)
+    store.add_team("a"); store.add_team("b")
+    flag = decode_flag(add_tick(store).flag(1))
+    for age in range(1, 3):
+        add_tick(store)
+        assert store.lookup(flag) is not None, f"valid at age {age}"
+    add_tick(store)
+    assert store.lookup(flag) is None
+
+
+def test_team_added_mid_game():
+    with Gameserver(submit_rate = None) as game:
+        a, b, c = team("a"), team("b"), team("c")
+        game.add_team(a); game.add_team(b)
+        first = game.rotate_flags()
+        game.add_team(c)
+        second = game.rotate_flags()
+        assert (first.teams, second.teams) == (2, 3)
+        assert game.store.lookup(decode_flag(first.flag(1))).defender == "b" # numbered by the teams of its tick
+        with pytest.raises(KeyError):
+            game.store.flag("a", "c", 0)
+        assert game.usernames(a, c) == [game.usernames(a, c, -1)] # only the tick c was part of
+        assert game.check_flag(c, a, game.flag(c, a)) and game.check_flag(a, c, game.flag(a, c))
+        assert game.check_flag(a, b, game.flag(a, b, first.number))
+
+
+def test_submission_verdicts():
+    with Gameserver(submit_rate = None) as game:
+        a, b, c = team("a"), team("b"), team("c")
+        for t in (a, b, c): game.add_team(t)
+        game.rotate_flags()
+        stolen, own, other = game.flag(a, b), game.flag(a, a), game.flag(c, b)
+        verdicts = game.submission.submit("a", [stolen, stolen, own, other, "flag{nope}", stolen.upper()])
+        assert [status for status, _ in verdicts] == [Status.ACCEPTED, Status.DUPLICATE, Status.OWN, Status.INVALID, Status.INVALID, Status.INVALID]
+        assert verdicts[0][1].defender == "b"
+        assert game.scoreboard.scores["a"].attack == 1.0 and game.scoreboard.scores["b"].defence == -1.0
+        game.rotate_flags()
+        assert game.submission.submit("a", [stolen])[0][0] == Status.DUPLICATE # still in the window, counted once
+        assert game.submission.submit("a", [game.flag(a, b)])[0][0] == Status.ACCEPTED
+
+
+def test_submissions_beyond_the_rate_are_limited():
+    with Gameserver(submit_rate = 1.0, submit_burst = 2) as game:
+        a, b = team("a"), team("b")
+        game.add_team(a); game.add_team(b)
+        game.rotate_flags()
+        game.rotate_flags()
+        flags = [game.flag(a, b, 0), game.flag(a, b, 1), game.flag(a, b, 1)]
+        assert [status for status, _ in game.submission.submit("a", flags)] == [Status.ACCEPTED, Status.ACCEPTED, Status.RATE_LIMITED]
@@ -0,0 +1,106 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import sys
+from threading import Thread
+from time import monotonic, sleep
+from uuid import uuid4
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src")) # imports of the message board are relative to src
+
+grpc = pytest.importorskip("grpc")
+message_board_pb2 = pytest.importorskip("protos.message_board.message_board_pb2", reason = "build the protos first")
+
+from message_board.MessageBoardImpl import AsyncMessageBoardImpl, MessageBoardImpl
+from protos.message_board.message_board_pb2_grpc import add_MessageBoardServicer_to_server
+from src.grpc_shield import GrpcMAN, ShieldInterceptor, flatten, unflatten
+from src.man import Team
+from src.server import Message
+from src.shield import ShieldMAN
+
+SERVICE = message_board_pb2.DESCRIPTOR.services_by_name["MessageBoard"]
+FLAG_REGEX = "flag{[0-9a-f]{32}}"
+
+
+@pytest.fixture(params = [AsyncMessageBoardImpl, MessageBoardImpl], ids = ["async", "thread pool"])
+def service(request):
+    """Message board behind a ShieldInterceptor, served from its own event loop"""
+    shield, loop, started = ShieldMAN(FLAG_REGEX), asyncio.new_event_loop(), []
+    async def start():
+        server = grpc.aio.server(ThreadPoolExecutor(4), interceptors = [ShieldInterceptor(shield)])
+        add_MessageBoardServicer_to_server(request.param(), server)
+        started.append(server.add_insecure_port("127.0.0.1:0"))
+        await server.start()
+        return server
+    thread = Thread(target = loop.run_forever, daemon = True)
+    thread.start()
+    server = asyncio.run_coroutine_threadsafe(start(), loop).result(5)
+    with grpc.insecure_channel(f"127.0.0.1:{started[0]}") as channel:
+        yield shield, GrpcMAN(channel, SERVICE)
+    asyncio.run_coroutine_threadsafe(server.stop(None), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+
+
+class Recording:
+    """Passes messages on to the target and keeps its responses"""
+    def __init__(self, target: GrpcMAN):
+        self.target, self.responses = target, []
+
+    def response(self, msg: Message) -> str:
+        self.responses.append(resp := self.target.response(msg))
+        return resp
+
+
+def steal(target: GrpcMAN, username: str) -> str:
+    """Takes over the account by registering it again and reads its private board"""
+    target.response(Message("register", {"username": username, "password": "1234"}))
+    cookie = target.response(Message("login", {"username": username, "password": "1234"}))
+    return target.response(Message("read_all", {"boardid": username, "cookie": cookie[7:-1]}))
+
+
+def test_requests_flatten_and_unflatten():
+    request = message_board_pb2.BoardCreate(auth = message_board_pb2.BoardAuth(boardid = "board", cookie = "abc"), boardname = "name", public = False)
+    request.public = True
+    params = flatten(request)
+    assert params == {"auth.boardid": "board", "auth.cookie": "abc", "boardname": "name", "public": "True"}
+    assert unflatten(message_board_pb2.BoardCreate, params) == request
+
+
+def test_captured_attacks_replay_through_grpc(service):
+    shield, target = service
+    victim, flag = uuid4().hex, f"flag{{{uuid4().hex}}}"
+    target.place_flag(victim, flag)
+    shield.end_attack()
+    assert flag in steal(target, victim)
+    shield.end_attack()
+
+    atk = next(atk for atk in shield.attacks if atk.hasFlag)
+    assert [rec.path for rec in atk.messages] == ["register", "login", "read_all"]
+    assert atk.flags == [flag]
+    assert dict(atk.messages[2].items())["boardid"] == victim
+
+    other, new = uuid4().hex, f"flag{{{uuid4().hex}}}"
+    target.place_flag(other, new)
+    team = Team("target", None, target)
+    assert new in atk.compile([victim]).run_one(team, other).responses[-1]
+    another, newer = uuid4().hex, f"flag{{{uuid4().hex}}}"
+    target.place_flag(another, newer)
+    scope, recording = {"Message": Message, "Team": Team}, Recording(target)
+    exec(atk.generate_script([victim]), scope)
+    scope["attack"](Team("target", None, recording), another)
+    assert newer in recording.responses[-1]
+
+
+def test_failed_calls_are_captured_with_their_error(service):
+    shield, target = service
+    resp = target.response(Message("read_all", {"boardid": "missing", "cookie": "nobody"}))
+    assert resp.startswith("StatusCode.") # the thread pool servicer reports UNKNOWN for everything
+    deadline, captured = monotonic() + 1.0, []
+    while not captured and monotonic() < deadline: # the status reaches the client before the interceptor records it
+        captured = [rec for atk in shield.attacks for rec in atk.messages if rec.path == "read_all"]
+        sleep(0.01)
+    assert captured and "Cookie is not authenticated!" in captured[0].response
+    if resp.startswith("StatusCode.UNAUTHENTICATED"): assert captured[0].response == resp # aborted, recorded as the client saw it
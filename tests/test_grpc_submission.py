@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+grpc = pytest.importorskip("grpc")
+flag_submission_pb2 = pytest.importorskip("src.protos.flag_submission.flag_submission_pb2", reason = "build the protos first")
+
+from src.game import Gameserver
+from src.grpc_submission import TOKEN_KEY, FlagSubmissionService
+from src.man import MAN, Team
+from src.protos.flag_submission.flag_submission_pb2_grpc import FlagSubmissionStub, add_FlagSubmissionServicer_to_server
+from src.server import Server
+from src.submission import Status
+
+TOKENS = {"secret-a": "a", "secret-b": "b", "secret-late": "late"}
+
+
+def team(name: str) -> Team:
+    return Team(name, server := Server(), MAN(server))
+
+
+async def submit(game: Gameserver, token: str | None, batches: list[list[str]]) -> list[list[tuple[int, str]]]:
+    """Streams the batches with the token to a FlagSubmissionService of the game"""
+    server = grpc.aio.server()
+    add_FlagSubmissionServicer_to_server(FlagSubmissionService(game.submission, TOKENS), server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+    try:
+        async with grpc.aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+            metadata = [(TOKEN_KEY, token)] if token is not None else None
+            call = FlagSubmissionStub(channel).submit(iter([flag_submission_pb2.FlagBatch(flags = flags) for flags in batches]), metadata = metadata)
+            return [[(verdict.status, verdict.defender) for verdict in verdicts.verdicts] async for verdicts in call]
+    finally:
+        await server.stop(None)
+
+
+def test_verdicts_are_streamed_for_the_team_of_the_token():
+    with Gameserver(submit_rate = None) as game:
+        a, b = team("a"), team("b")
+        game.add_team(a); game.add_team(b)
+        game.rotate_flags()
+        stolen = game.flag(a, b)
+        verdicts = asyncio.run(submit(game, "secret-a", [[stolen, "flag{nope}"], [stolen, game.flag(a, a)]]))
+        assert verdicts == [[(Status.ACCEPTED, "b"), (Status.INVALID, "")], [(Status.DUPLICATE, "b"), (Status.OWN, "a")]]
+        assert game.scoreboard.scores["a"].attack == 1.0
+
+
+@pytest.mark.parametrize("token", [None, "guessed"])
+def test_streams_without_a_known_token_are_refused(token):
+    with Gameserver(submit_rate = None) as game:
+        a, b = team("a"), team("b")
+        game.add_team(a); game.add_team(b)
+        game.rotate_flags()
+        with pytest.raises(grpc.aio.AioRpcError) as e:
+            asyncio.run(submit(game, token, [[game.flag(a, b)]]))
+        assert e.value.code() == grpc.StatusCode.UNAUTHENTICATED
+        assert game.submission.counts[Status.ACCEPTED] == 0
+
+
+def test_a_token_of_a_team_not_in_the_game_is_not_found():
+    with Gameserver(submit_rate = None) as game:
+        game.add_team(team("a")); game.add_team(team("b"))
+        game.rotate_flags()
+        with pytest.raises(grpc.aio.AioRpcError) as e:
+            asyncio.run(submit(game, "secret-late", [[]]))
+        assert e.value.code() == grpc.StatusCode.NOT_FOUND
+
+
+def test_rate_limits_follow_the_token():
+    with Gameserver(submit_rate = 0.001, submit_burst = 1) as game:
+        a, b = team("a"), team("b")
+        game.add_team(a); game.add_team(b)
+        game.rotate_flags()
+        game.rotate_flags()
+        first, second = game.flag(a, b, 0), game.flag(a, b, 1)
+        assert asyncio.run(submit(game, "secret-a", [[first, second]])) == [[(Status.ACCEPTED, "b"), (Status.RATE_LIMITED, "")]]
+        assert asyncio.run(submit(game, "secret-b", [[game.flag(b, a)]])) == [[(Status.ACCEPTED, "a")]] # a bucket of its own
+        assert asyncio.run(submit(game, "secret-a", [[second]])) == [[(Status.RATE_LIMITED, "")]]
@@ -0,0 +1,82 @@
+import asyncio
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src")) # imports of the message board are relative to src
+
+grpc = pytest.importorskip("grpc")
+pytest.importorskip("protos.message_board.message_board_pb2", reason = "build the protos first")
+
+from message_board.MessageBoardClient import MessageBoardClient
+from message_board.MessageBoardImpl import AsyncMessageBoardImpl
+from protos.message_board.message_board_pb2_grpc import add_MessageBoardServicer_to_server
+
+
+async def session(test):
+    servicer, server = AsyncMessageBoardImpl(), grpc.aio.server()
+    add_MessageBoardServicer_to_server(servicer, server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+    try:
+        async with grpc.aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+            await test(servicer, channel)
+    finally:
+        await server.stop(None)
+
+
+async def client(channel, username: str) -> MessageBoardClient:
+    user = MessageBoardClient(channel)
+    await user.register(username, "1234")
+    await user.login(username, "1234")
+    return user
+
+
+def test_handlers_answer_over_grpc():
+    async def test(servicer, channel):
+        owner = await client(channel, "owner")
+        await owner.create("board", "name")
+        for text in ("first", "second", "third"):
+            await owner.write("board", text)
+        assert await owner.get_count("board") == 3
+        assert [text async for text in owner.read_all("board")] == ["first", "second", "third"]
+        assert [text async for text in owner.read("board", 1, 1)] == ["second"]
+        assert await owner.get_name("board") == "name"
+        await owner.rename("board", "renamed")
+        assert await owner.get_name("board") == "renamed"
+        assert await owner.exists("board") and not await owner.exists("other")
+        await owner.delete("board")
+        assert not await owner.exists("board")
+        await owner.logout()
+        assert servicer.active == {}
+    asyncio.run(session(test))
+
+
+def test_errors_become_status_codes():
+    async def test(servicer, channel):
+        owner, other = await client(channel, "owner"), await client(channel, "other")
+        await owner.create("board", "name")
+        calls = {grpc.StatusCode.UNAUTHENTICATED: owner.login("owner", "wrong"),
+                 grpc.StatusCode.INVALID_ARGUMENT: owner.write("missing", "text"),
+                 grpc.StatusCode.PERMISSION_DENIED: other.write("board", "text")}
+        for code, call in calls.items():
+            with pytest.raises(grpc.aio.AioRpcError) as error:
+                await call
+            assert error.value.code() == code
+        with pytest.raises(grpc.aio.AioRpcError) as error:
+            [text async for text in other.read_all("missing")]
+        assert error.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+    asyncio.run(session(test))
+
+
+def test_concurrent_writes_are_all_stored():
+    async def test(servicer, channel):
+        owner = await client(channel, "owner")
+        await owner.create("board", "name")
+        writers = [await client(channel, f"user{n}") for n in range(20)]
+        for n in range(20):
+            await owner.add_owner("board", f"user{n}")
+        await asyncio.gather(*(user.write("board", f"{n}:{i}") for n, user in enumerate(writers) for i in range(10)))
+        assert await owner.get_count("board") == 200
+    asyncio.run(session(test))
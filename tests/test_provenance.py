@@ -0,0 +1,62 @@
+from time import perf_counter
+
+from src.provenance import USERNAME, ProvenanceIndex, Slice
+from src.server import Message
+from src.shield import ShieldMAN
+
+
+def test_tokens_are_found_in_the_latest_earlier_response():
+    index = ProvenanceIndex(["Your login cookie is: 0123abcd", "nothing here", "again 0123abcd"])
+    assert index.find("0123abcd", 0) is None
+    assert index.find("0123abcd", 2) == Slice(0, 22, 30)
+    assert index.find("0123abcd", 3) == Slice(2, 6, 14)
+    assert index.occurrences("0123abcd") == ([0, 2], [22, 6])
+
+
+def test_params_of_several_tokens_and_other_characters():
+    index = ProvenanceIndex(["post 1 and post 3 were posted", "{\"id\": 4711}"])
+    assert index.find("post 3", 2) == Slice(0, 11, 17)
+    assert index.find("{\"id\"", 2) == Slice(1, 0, 5)
+    assert index.find("post 4", 2) is None
+
+
+def test_sources():
+    index = ProvenanceIndex(["registered the account alice1234"])
+    assert index.source("alice1234", 1, {"alice1234"}) is USERNAME
+    assert index.source("alice1234", 1, set()) == Slice(0, 23, 32)
+    assert index.source("1234", 1, set()) == "1234" # no whole token of a response
+    assert index.source("abc", 1, set()) == "abc"
+
+
+class Echo:
+    """Answers every message with about 2 KB of tokens"""
+    def response(self, msg: Message) -> str:
+        return f"{'x' * 40} word{msg.param['n']} " * 40
+
+
+def capture_cost(messages: int) -> float:
+    """Mean capture time per message of one session, over its last 100 messages"""
+    shield = ShieldMAN("flag{[0-9a-f]{32}}", Echo())
+    shield.subscribe(lambda atk, exploit, flags: None)
+    for n in range(messages - 100):
+        shield.response(Message("read", {"cookie": "c" * 32, "n": str(n)}))
+    start = perf_counter()
+    for n in range(messages - 100, messages):
+        shield.response(Message("read", {"cookie": "c" * 32, "n": str(n)}))
+    return (perf_counter() - start) / 100
+
+
+def test_capture_cost_per_message_stays_flat_as_the_attack_grows():
+    short, long = min(capture_cost(200) for _ in range(3)), min(capture_cost(1600) for _ in range(3))
+    assert long < 3 * short
+
+
+def test_the_index_counts_against_the_memory_budget():
+    shield = ShieldMAN("flag{[0-9a-f]{32}}", Echo())
+    shield.response(Message("read", {"cookie": "c" * 32, "n": "0"}))
+    records = shield.store.size
+    shield.subscribe(lambda atk, exploit, flags: None)
+    shield.response(Message("read", {"cookie": "c" * 32, "n": "1"}))
+    atk = shield.attacks[-1]
+    assert atk.provenance.size > 0
+    assert shield.store.size >= 2 * records + atk.provenance.size - 1024
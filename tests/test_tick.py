@@ -0,0 +1,67 @@
+import asyncio
+from threading import Event
+
+from src.game import Gameserver
+from src.man import MAN, Team
+from src.runner import ExploitRunner
+from src.server import Message, Server
+from src.shield import ShieldMAN
+from src.tick import TickScheduler
+
+
+class HangingMAN(MAN):
+    """Takes its flags, but never answers an attack until released"""
+    released = None
+
+    def response(self, msg: Message) -> str:
+        self.released.wait()
+        return super().response(msg)
+
+
+def steal(attacker: Team, defender: Team, game: Gameserver):
+    username = game.usernames(attacker, defender, -1)
+    defender.manServer.response(Message("register", {"username": username, "password": "1234"}))
+    cookie = defender.manServer.response(Message("login", {"username": username, "password": "1234"}))[22:]
+    defender.manServer.response(Message("read", {"cookie": cookie}))
+
+
+def game_with_a_hanging_team(released: Event) -> tuple[Gameserver, ExploitRunner]:
+    game = Gameserver()
+    game.add_team(mist := Team("MIST", server := Server(), ShieldMAN(game.flag_regex, server)))
+    game.add_team(faust := Team("FAUST", server := Server(), MAN(server)))
+    game.add_team(Team("SLOW", server := Server(), hanging := HangingMAN(server)))
+    hanging.released = released
+    game.generate_flags()
+    steal(faust, mist, game)
+    return game, ExploitRunner(game, mist, timeout = 5.0)
+
+
+def test_a_hanging_target_does_not_cost_the_flags_of_the_others():
+    released = Event()
+    game, runner = game_with_a_hanging_team(released)
+    try:
+        scheduler = TickScheduler(game, tick_length = 0.4, runners = [runner])
+        asyncio.run(scheduler.run(ticks = 2))
+        first, second = scheduler.reports
+        assert not any(stage.timed_out or stage.error for stage in first.stages)
+        assert game.scoreboard.scores["MIST"].attack == 2.0 # FAUST in both ticks
+        assert game.scoreboard.scores["SLOW"].defence == 0.0
+    finally:
+        released.set()
+        runner.close()
+        game.close()
+
+
+def test_a_runner_still_busy_is_not_started_again():
+    released, started = Event(), []
+    game, runner = game_with_a_hanging_team(released)
+    runner.run_tick = lambda index, deadline: started.append(index) or released.wait() or []
+    try:
+        scheduler = TickScheduler(game, tick_length = 0.2, runners = [runner])
+        asyncio.run(scheduler.run(ticks = 3))
+        assert len(scheduler.reports) == 3
+        assert len(started) == 1
+    finally:
+        released.set()
+        runner.close()
+        game.close()